@@ -0,0 +1,88 @@
+# core/archive.py
+
+import logging
+import os
+import re
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from core.config import RAW_ARCHIVE_DIR, RAW_ARCHIVE_RETENTION_DAYS
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("crl", "i3", "escreen")
+
+# e.g. crl_2025-07-14_063015.parquet
+_SNAPSHOT_RE = re.compile(r"^(?P<source>[a-z0-9]+)_(?P<date>\d{4}-\d{2}-\d{2})_(?P<time>\d{6})\.parquet$")
+
+
+def _source_dir(source: str) -> str:
+    if source not in SOURCES:
+        raise ValueError(f"Unknown source {source!r}; expected one of {SOURCES}")
+    return os.path.join(RAW_ARCHIVE_DIR, source)
+
+
+def archive_export(source: str, df: pd.DataFrame, when: datetime | None = None) -> str:
+    """
+    Save a raw export as a zstd-compressed Parquet snapshot:
+    <RAW_ARCHIVE_DIR>/<source>/<source>_<YYYY-MM-DD>_<HHMMSS>.parquet
+    Categorical columns round-trip as categoricals.
+    """
+    when = when or datetime.now()
+    out_dir = _source_dir(source)
+    os.makedirs(out_dir, exist_ok=True)
+
+    path = os.path.join(out_dir, f"{source}_{when:%Y-%m-%d_%H%M%S}.parquet")
+    df.to_parquet(path, engine="pyarrow", compression="zstd", index=False)
+    logger.info("Archived %d %s rows → %s", len(df), source, path)
+    return path
+
+
+def list_snapshots(source: str) -> list[tuple[datetime, str]]:
+    """All snapshots for a source as (timestamp, path), oldest first."""
+    src_dir = _source_dir(source)
+    if not os.path.isdir(src_dir):
+        return []
+
+    found = []
+    for name in os.listdir(src_dir):
+        m = _SNAPSHOT_RE.match(name)
+        if not m or m["source"] != source:
+            continue
+        ts = datetime.strptime(f"{m['date']} {m['time']}", "%Y-%m-%d %H%M%S")
+        found.append((ts, os.path.join(src_dir, name)))
+    return sorted(found)
+
+
+def find_snapshot(source: str, on: date | None = None) -> str:
+    """Path of the latest snapshot taken on `on` (or the latest overall)."""
+    snaps = list_snapshots(source)
+    if on is not None:
+        snaps = [(ts, p) for ts, p in snaps if ts.date() == on]
+    if not snaps:
+        when = f" for {on.isoformat()}" if on else ""
+        raise FileNotFoundError(f"No archived {source} snapshot{when} in {RAW_ARCHIVE_DIR}")
+    return snaps[-1][1]
+
+
+def load_snapshot(source: str, on: date | None = None) -> pd.DataFrame:
+    """Load an archived raw export back into the frame the scraper returned."""
+    path = find_snapshot(source, on)
+    df = pd.read_parquet(path, engine="pyarrow")
+    logger.info("Loaded %d %s rows from %s", len(df), source, path)
+    return df
+
+
+def prune_archive(keep_days: int = RAW_ARCHIVE_RETENTION_DAYS) -> int:
+    """Delete snapshots older than `keep_days`. Returns how many were removed."""
+    cutoff  = datetime.now() - timedelta(days=keep_days)
+    removed = 0
+    for source in SOURCES:
+        for ts, path in list_snapshots(source):
+            if ts < cutoff:
+                os.remove(path)
+                removed += 1
+    if removed:
+        logger.info("Pruned %d archived snapshots older than %d days", removed, keep_days)
+    return removed
@@ -13,12 +13,52 @@ I3_PASS  = os.getenv("I3_PASS")
 ESCREEN_USERNAME = os.getenv("ESCREEN_USERNAME")
 ESCREEN_PASSWORD = os.getenv("ESCREEN_PASSWORD")
 
+# Direct export endpoints (copied from the portal's network tab). Optional
+# {start}/{end} placeholders are filled with MM/DD/YYYY dates. Unset → the
+# scrapers drive the export through the browser as before.
+CRL_EXPORT_URL = os.getenv("CRL_EXPORT_URL")
+I3_EXPORT_URL  = os.getenv("I3_EXPORT_URL")
+# localStorage key holding a bearer token, for portals that don't auth by cookie
+CRL_TOKEN_KEY  = os.getenv("CRL_TOKEN_KEY")
+I3_TOKEN_KEY   = os.getenv("I3_TOKEN_KEY")
+# Saved browser logins (Playwright storage state), reused until rejected
+SCRAPE_SESSION_DIR = os.getenv(
+    "SCRAPE_SESSION_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "downloads", "sessions"),
+)
+
 # Zoho API Credentials
 ZOHO_CLIENT_ID     = os.getenv("ZOHO_CLIENT_ID")
 ZOHO_CLIENT_SECRET = os.getenv("ZOHO_CLIENT_SECRET")
 ZOHO_REFRESH_TOKEN = os.getenv("ZOHO_REFRESH_TOKEN")
 ZOHO_API_BASE      = os.getenv("ZOHO_API_BASE")
 ZOHO_MODULE        = os.getenv("ZOHO_MODULE")
+# "upsert" (keyed on Name = CCFID, safe to retry) or "insert"
+ZOHO_PUSH_MODE     = os.getenv("ZOHO_PUSH_MODE", "upsert")
+ZOHO_ORG_ID        = os.getenv("ZOHO_ORG_ID")
+ZOHO_CONTENT_BASE  = os.getenv("ZOHO_CONTENT_BASE", "https://content.zohoapis.com")
+# Pushes at least this large go through one Bulk Write job instead of 100-record calls
+ZOHO_BULK_WRITE_THRESHOLD = int(os.getenv("ZOHO_BULK_WRITE_THRESHOLD", "1000"))
+
+# Shared Zoho call budget (token bucket in Postgres, across cron and web workers).
+# Batch calls leave ZOHO_RATE_INTERACTIVE_RESERVE tokens, and the last
+# ZOHO_INTERACTIVE_CREDIT_RESERVE of the day's ZOHO_DAILY_CREDITS (0 = no cap),
+# to interactive sends from the worklist
+ZOHO_RATE_PER_SECOND            = float(os.getenv("ZOHO_RATE_PER_SECOND", "1.5"))
+ZOHO_RATE_BURST                 = float(os.getenv("ZOHO_RATE_BURST", "10"))
+ZOHO_RATE_INTERACTIVE_RESERVE   = float(os.getenv("ZOHO_RATE_INTERACTIVE_RESERVE", "3"))
+ZOHO_DAILY_CREDITS              = int(os.getenv("ZOHO_DAILY_CREDITS", "0"))
+ZOHO_INTERACTIVE_CREDIT_RESERVE = int(os.getenv("ZOHO_INTERACTIVE_CREDIT_RESERVE", "500"))
+
+# Outbox of complete records awaiting Zoho: rows claimed per send, how long a
+# claim is held, and the retry backoff after a failed send (doubling, capped).
+# A row Zoho rejects OUTBOX_MAX_ATTEMPTS times is moved to the worklist for
+# review; failed sends (outage, quota) don't count toward that
+OUTBOX_DRAIN_BATCH         = int(os.getenv("OUTBOX_DRAIN_BATCH", "25000"))
+OUTBOX_LEASE_SECONDS       = int(os.getenv("OUTBOX_LEASE_SECONDS", str(45 * 60)))
+OUTBOX_BACKOFF_SECONDS     = int(os.getenv("OUTBOX_BACKOFF_SECONDS", "60"))
+OUTBOX_MAX_BACKOFF_SECONDS = int(os.getenv("OUTBOX_MAX_BACKOFF_SECONDS", "3600"))
+OUTBOX_MAX_ATTEMPTS        = int(os.getenv("OUTBOX_MAX_ATTEMPTS", "5"))
 
 # Render Database Credentials
 DB_USER     = os.getenv("DB_USER")
@@ -31,4 +71,77 @@ DB_NAME     = os.getenv("DB_NAME")
 DATABASE_URL = (
     f"postgresql://{DB_USER}:{DB_PASSWORD}"
     f"@{DB_HOST}:{DB_PORT}/{DB_NAME}"
-)
\ No newline at end of file
+)
+
+# Raw Export Archive (date-stamped Parquet snapshots of every scrape)
+RAW_ARCHIVE_DIR = os.getenv(
+    "RAW_ARCHIVE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "downloads", "archive"),
+)
+RAW_ARCHIVE_RETENTION_DAYS = int(os.getenv("RAW_ARCHIVE_RETENTION_DAYS", "30"))
+
+# Pipeline checkpoints (per-run stage outputs, so a failed run can resume)
+CHECKPOINT_DIR = os.getenv(
+    "CHECKPOINT_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "downloads", "checkpoints"),
+)
+CHECKPOINT_MAX_AGE_HOURS = int(os.getenv("CHECKPOINT_MAX_AGE_HOURS", "12"))
+
+# A CCFID exported by more than one source is pushed/staged only from the
+# first of these sources that has it: within a cron run (cronjob/run_index.py),
+# and in the outbox whichever process loads it (core/db/outbox.py)
+SOURCE_PRIORITY = [s.strip() for s in os.getenv("SOURCE_PRIORITY", "crl,i3,escreen").split(",") if s.strip()]
+
+# Reviewed/uploaded worklist rows are moved to worklist_archive this many at a time
+STAGING_ARCHIVE_BATCH = int(os.getenv("STAGING_ARCHIVE_BATCH", "5000"))
+
+# Company aliases: fuzzy company→code matches at least this good (0-100) are
+# remembered, so the same raw string resolves without scoring next time
+COMPANY_ALIAS_MIN_SCORE = int(os.getenv("COMPANY_ALIAS_MIN_SCORE", "95"))
+
+# Parallel normalization: exports with at least NORMALIZE_PARALLEL_MIN_ROWS rows
+# are transformed across this many processes (1 = always serial)
+NORMALIZE_WORKERS           = int(os.getenv("NORMALIZE_WORKERS", "1"))
+NORMALIZE_PARALLEL_MIN_ROWS = int(os.getenv("NORMALIZE_PARALLEL_MIN_ROWS", "20000"))
+
+# Backfill scraping (date range split into windows, downloaded in parallel)
+BACKFILL_WORKERS     = int(os.getenv("BACKFILL_WORKERS", "3"))
+BACKFILL_WINDOW_DAYS = int(os.getenv("BACKFILL_WINDOW_DAYS", "7"))
+# Date-range controls the windowed exports fill in. The defaults are
+# unverified guesses (the daily scrape only ever picks "Current Month");
+# check them against each portal before relying on a backfill.
+CRL_CUSTOM_RANGE_OPTION = os.getenv("CRL_CUSTOM_RANGE_OPTION", "Custom")
+CRL_START_DATE_INPUT    = os.getenv("CRL_START_DATE_INPUT", "#start-date")
+CRL_END_DATE_INPUT      = os.getenv("CRL_END_DATE_INPUT", "#end-date")
+I3_FROM_DATE_INPUT      = os.getenv("I3_FROM_DATE_INPUT", "#date_from")
+I3_TO_DATE_INPUT        = os.getenv("I3_TO_DATE_INPUT", "#date_to")
+I3_SEARCH_BUTTON        = os.getenv("I3_SEARCH_BUTTON", "Search")
+
+# Scrapers: "fast" blocks images/fonts/media/analytics and waits on specific
+# elements instead of network idle; per-step timings are appended to a JSONL log.
+# Off by default until the timings log shows its waits are safe on both portals.
+SCRAPE_FAST         = os.getenv("SCRAPE_FAST", "0") == "1"
+# Fast mode: the i3 Completed Results grid, whose rows mean the default search
+# has loaded (unverified against the portal, like the date controls above)
+I3_RESULTS_GRID     = os.getenv("I3_RESULTS_GRID", "table")
+SCRAPE_TIMINGS_PATH = os.getenv(
+    "SCRAPE_TIMINGS_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "downloads", "scrape_timings.jsonl"),
+)
+
+# Live worklist (webapp/live.py): every open /worklist/stream holds a web
+# thread, so each process serves at most LIVE_MAX_STREAMS of them (keep it
+# well under gunicorn's WEB_THREADS) and ends each after LIVE_STREAM_SECONDS;
+# browsers reconnect and pick up from the last event they saw
+LIVE_MAX_STREAMS    = int(os.getenv("LIVE_MAX_STREAMS", "8"))
+LIVE_STREAM_SECONDS = int(os.getenv("LIVE_STREAM_SECONDS", "300"))
+
+# Resident scheduler (cronjob.scheduler): minutes between polls per source,
+# plus random jitter so polls don't line up with the portals' own batch jobs
+SCHEDULE_CRL_MINUTES       = int(os.getenv("SCHEDULE_CRL_MINUTES", "15"))
+SCHEDULE_I3_MINUTES        = int(os.getenv("SCHEDULE_I3_MINUTES", "15"))
+SCHEDULE_ESCREEN_MINUTES   = int(os.getenv("SCHEDULE_ESCREEN_MINUTES", "60"))
+SCHEDULE_REFERENCE_MINUTES = int(os.getenv("SCHEDULE_REFERENCE_MINUTES", "30"))
+SCHEDULE_ARCHIVE_MINUTES   = int(os.getenv("SCHEDULE_ARCHIVE_MINUTES", "60"))
+SCHEDULE_OUTBOX_MINUTES    = int(os.getenv("SCHEDULE_OUTBOX_MINUTES", "5"))
+SCHEDULE_JITTER_SECONDS    = int(os.getenv("SCHEDULE_JITTER_SECONDS", "60"))
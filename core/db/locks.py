@@ -0,0 +1,27 @@
+# core/db/locks.py
+
+from contextlib import contextmanager
+
+from sqlalchemy import text
+
+from core.db.session import engine
+
+
+@contextmanager
+def advisory_lock(name: str):
+    """
+    Try to take a Postgres session-level advisory lock for `name`, held on
+    its own connection until the block exits. Yields whether we got it, so
+    overlapping runs (across processes too) can skip instead of waiting.
+
+    The connection is AUTOCOMMIT, so it sits idle rather than idle in a
+    transaction for the whole run: no idle_in_transaction_session_timeout
+    can kill it (and silently drop the lock), and vacuum isn't held back.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        got = conn.execute(text("SELECT pg_try_advisory_lock(hashtext(:n))"), {"n": name}).scalar()
+        try:
+            yield got
+        finally:
+            if got:
+                conn.execute(text("SELECT pg_advisory_unlock(hashtext(:n))"), {"n": name})
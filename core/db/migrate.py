@@ -0,0 +1,72 @@
+# core/db/migrate.py
+"""
+Plain-SQL schema migrations.
+
+core/db/migrations/NNNN_name.sql files run once each, in order, in one
+transaction, and are recorded in schema_migrations. A fresh database is
+created from the models (which already reflect every migration) and stamped
+as up to date; an existing database gets any tables it lacks from the models
+and then the migrations it hasn't had yet. A transaction-level advisory lock
+keeps the web and cron containers from migrating at the same time.
+"""
+
+import logging
+import os
+import re
+from datetime import datetime
+
+from sqlalchemy import inspect, text
+
+from core.db.models  import Base
+from core.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), "migrations")
+
+_MIGRATION_RE = re.compile(r"^(?P<version>\d{4})_(?P<name>\w+)\.sql$")
+
+
+def migrations() -> list[tuple[str, str, str]]:
+    """(version, name, path) for every migration file, oldest first."""
+    found = []
+    for fname in sorted(os.listdir(MIGRATIONS_DIR)):
+        m = _MIGRATION_RE.match(fname)
+        if m:
+            found.append((m["version"], m["name"], os.path.join(MIGRATIONS_DIR, fname)))
+    return found
+
+
+def migrate() -> list[str]:
+    """Bring the schema up to date; returns the versions applied."""
+    applied_now = []
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('schema_migrations'))"))
+        fresh = not inspect(conn).has_table("worklist_staging")
+
+        conn.execute(text("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version    text PRIMARY KEY,
+                name       text NOT NULL,
+                applied_at timestamp NOT NULL
+            )
+        """))
+        Base.metadata.create_all(conn, checkfirst=True)
+        done = {v for (v,) in conn.execute(text("SELECT version FROM schema_migrations"))}
+
+        for version, name, path in migrations():
+            if version in done:
+                continue
+            if not fresh:
+                with open(path) as f:
+                    conn.exec_driver_sql(f.read())
+                logger.info("Applied migration %s_%s", version, name)
+            conn.execute(
+                text("INSERT INTO schema_migrations (version, name, applied_at) VALUES (:v, :n, :at)"),
+                {"v": version, "n": name, "at": datetime.utcnow()},
+            )
+            applied_now.append(version)
+
+    if fresh:
+        logger.info("Created schema from models; stamped %d migrations", len(applied_now))
+    return applied_now
@@ -0,0 +1,8 @@
+-- Partial indexes for the only rows the worklist ever reads: unreviewed ones.
+-- Queries must filter with `reviewed = false` (filter_by(reviewed=False)),
+-- which the planner matches against `NOT reviewed`.
+CREATE INDEX IF NOT EXISTS ix_worklist_staging_unreviewed
+    ON worklist_staging (ccfid) WHERE NOT reviewed;
+
+CREATE INDEX IF NOT EXISTS ix_worklist_staging_unreviewed_collection_date
+    ON worklist_staging (collection_date) WHERE NOT reviewed;
@@ -0,0 +1,8 @@
+-- uploaded_ccfid.uploaded_timestamp was Text holding str(datetime)
+ALTER TABLE uploaded_ccfid
+    ALTER COLUMN uploaded_timestamp TYPE timestamp
+    USING NULLIF(uploaded_timestamp, '')::timestamp;
+
+-- The review routes already set reviewed_at; give it a column
+ALTER TABLE worklist_staging ADD COLUMN IF NOT EXISTS reviewed_at timestamp;
+ALTER TABLE IF EXISTS worklist_archive ADD COLUMN IF NOT EXISTS reviewed_at timestamp;
@@ -0,0 +1,9 @@
+-- Learned company / cost-center aliases (core/normalize/aliases.py)
+CREATE TABLE IF NOT EXISTS company_alias (
+    alias        text PRIMARY KEY,
+    raw          text,
+    account_code text NOT NULL,
+    source       text NOT NULL,
+    score        integer,
+    updated_at   timestamp
+);
@@ -0,0 +1,15 @@
+-- Shared Zoho rate limiter and credit accounting (core/services/rate_limit.py)
+CREATE TABLE IF NOT EXISTS zoho_rate_bucket (
+    name       text PRIMARY KEY,
+    tokens     double precision NOT NULL,
+    updated_at timestamp NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS zoho_api_usage (
+    day     date    NOT NULL,
+    lane    text    NOT NULL,
+    run_id  text    NOT NULL,
+    calls   integer NOT NULL DEFAULT 0,
+    credits integer NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, lane, run_id)
+);
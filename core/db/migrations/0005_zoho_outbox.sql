@@ -0,0 +1,11 @@
+-- Transactional outbox of complete records awaiting Zoho (core/db/outbox.py)
+CREATE TABLE IF NOT EXISTS zoho_outbox (
+    ccfid           text PRIMARY KEY,
+    payload         jsonb NOT NULL,
+    enqueued_at     timestamp NOT NULL,
+    next_attempt_at timestamp NOT NULL,
+    attempts        integer NOT NULL DEFAULT 0,
+    last_error      text
+);
+
+CREATE INDEX IF NOT EXISTS ix_zoho_outbox_next_attempt_at ON zoho_outbox (next_attempt_at);
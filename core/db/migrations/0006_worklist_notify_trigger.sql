@@ -0,0 +1,13 @@
+-- NOTIFY worklist_changes <ccfid> on every worklist_staging change (webapp/live.py).
+-- Previously created by the web app on its first stream.
+CREATE OR REPLACE FUNCTION notify_worklist_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('worklist_changes', COALESCE(NEW.ccfid, OLD.ccfid));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS worklist_staging_notify ON worklist_staging;
+CREATE TRIGGER worklist_staging_notify
+AFTER INSERT OR UPDATE OR DELETE ON worklist_staging
+FOR EACH ROW EXECUTE FUNCTION notify_worklist_change();
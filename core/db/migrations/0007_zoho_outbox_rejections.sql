@@ -0,0 +1,2 @@
+-- Count Zoho rejections per outbox row, for the OUTBOX_MAX_ATTEMPTS cutoff
+ALTER TABLE zoho_outbox ADD COLUMN IF NOT EXISTS rejections integer NOT NULL DEFAULT 0;
@@ -0,0 +1,2 @@
+-- Source that queued each outbox row, so a lower-priority source can't replace it (SOURCE_PRIORITY)
+ALTER TABLE zoho_outbox ADD COLUMN IF NOT EXISTS source text;
@@ -0,0 +1,6 @@
+-- Source of each staged row and its raw Company value as exported, so reviewer
+-- corrections teach company aliases only from eScreen rows, keyed as matched
+ALTER TABLE worklist_staging ADD COLUMN IF NOT EXISTS source text;
+ALTER TABLE worklist_staging ADD COLUMN IF NOT EXISTS raw_company text;
+ALTER TABLE IF EXISTS worklist_archive ADD COLUMN IF NOT EXISTS source text;
+ALTER TABLE IF EXISTS worklist_archive ADD COLUMN IF NOT EXISTS raw_company text;
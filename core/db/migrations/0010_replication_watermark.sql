@@ -0,0 +1,6 @@
+-- Per-module watermarks for reference replication (core/services/reference.py)
+CREATE TABLE IF NOT EXISTS replication_watermark (
+    module        text PRIMARY KEY,
+    last_modified text,
+    synced_at     timestamp
+);
@@ -0,0 +1,4 @@
+-- create_all ran before 0005/0007 and made both counters NOT NULL with no
+-- default, so those migrations' DEFAULT 0 never reached the table
+ALTER TABLE zoho_outbox ALTER COLUMN attempts   SET DEFAULT 0;
+ALTER TABLE zoho_outbox ALTER COLUMN rejections SET DEFAULT 0;
@@ -1,13 +1,21 @@
 # core/db/models.py
 
-from sqlalchemy import JSON, Boolean, Column, Date, DateTime, Integer, String, Text
+from sqlalchemy import DDL, Boolean, Column, Date, DateTime, Float, Index, Integer, String, Text, event, text
 
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import declarative_base
 
 Base = declarative_base()
 
 class WorklistStaging(Base):
     __tablename__ = "worklist_staging"
+    # Partial indexes: the worklist only ever reads unreviewed rows (migration 0001)
+    __table_args__ = (
+        Index("ix_worklist_staging_unreviewed", "ccfid",
+              postgresql_where=text("NOT reviewed")),
+        Index("ix_worklist_staging_unreviewed_collection_date", "collection_date",
+              postgresql_where=text("NOT reviewed")),
+    )
 
     ccfid = Column(Text, primary_key=True)
     first_name = Column(Text)
@@ -30,13 +38,67 @@ class WorklistStaging(Base):
     collection_date = Column(Date)
     mro_received = Column(Date)
     reviewed = Column(Boolean, default=False)
+    reviewed_at = Column(DateTime)
     uploaded_timestamp = Column(DateTime)
+    source = Column(Text)           # crl / i3 / escreen
+    raw_company = Column(Text)      # Company as exported, before any review edit
+
+# NOTIFY worklist_changes <ccfid> on every change, for the live worklist
+# (webapp/live.py). Created with the table; migration 0006 for existing ones.
+event.listen(WorklistStaging.__table__, "after_create", DDL("""
+CREATE OR REPLACE FUNCTION notify_worklist_change() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('worklist_changes', COALESCE(NEW.ccfid, OLD.ccfid));
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER worklist_staging_notify
+AFTER INSERT OR UPDATE OR DELETE ON worklist_staging
+FOR EACH ROW EXECUTE FUNCTION notify_worklist_change();
+"""))
+
+class WorklistArchive(Base):
+    """
+    Reviewed/uploaded staging rows, moved out of the hot table by
+    core.db.staging.archive_staging. Range-partitioned by archive month
+    (worklist_archive_YYYY_MM); partitions are created as needed.
+    """
+    __tablename__ = "worklist_archive"
+    __table_args__ = {"postgresql_partition_by": "RANGE (archived_at)"}
+
+    ccfid = Column(Text, primary_key=True)
+    first_name = Column(Text)
+    last_name = Column(Text)
+    primary_id = Column(Text)
+    company_code = Column(Text)
+    company_name = Column(Text)
+    collection_site = Column(Text)
+    collection_site_id = Column(Text)
+    laboratory = Column(Text)
+    panel = Column(Text)
+    location = Column(Text)
+    test_reason = Column(Text)
+    test_result = Column(Text)
+    positive_for = Column(Text)
+    test_type = Column(Text)
+    regulation = Column(Text)
+    regulation_body = Column(Text)
+    bat_value = Column(Text)
+    collection_date = Column(Date)
+    mro_received = Column(Date)
+    reviewed = Column(Boolean)
+    reviewed_at = Column(DateTime)
+    uploaded_timestamp = Column(DateTime)
+    source = Column(Text)
+    raw_company = Column(Text)
+    archived_at = Column(DateTime, primary_key=True)    # partition key
 
 class UploadedCCFID(Base):
     __tablename__ = "uploaded_ccfid"
 
     ccfid = Column(Text, primary_key=True)
-    uploaded_timestamp = Column(Text)
+    uploaded_timestamp = Column(DateTime)
 
 
 class CollectionSite(Base):
@@ -56,6 +118,53 @@ class Company(Base):
     account_i3_code = Column(Integer, nullable=True, index=True)
 
 
+class CompanyAlias(Base):
+    """Raw company / cost-center string (normalized) → account_code."""
+    __tablename__ = "company_alias"
+
+    alias = Column(Text, primary_key=True)      # core.normalize.aliases.alias_key(raw)
+    raw = Column(Text)
+    account_code = Column(Text, nullable=False)
+    source = Column(Text, nullable=False)       # "reviewer" or "fuzzy"
+    score = Column(Integer)                     # fuzzy score, if learned from a match
+    updated_at = Column(DateTime)
+
+class ZohoOutbox(Base):
+    """Complete records waiting to be sent to Zoho (core/db/outbox.py)."""
+    __tablename__ = "zoho_outbox"
+    __table_args__ = (
+        Index("ix_zoho_outbox_next_attempt_at", "next_attempt_at"),
+    )
+
+    ccfid = Column(Text, primary_key=True)
+    payload = Column(JSONB, nullable=False)     # the MASTER_COLUMNS row
+    source = Column(Text)                       # crl / i3 / escreen (SOURCE_PRIORITY)
+    enqueued_at = Column(DateTime, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=False)
+    # server_default: create_all builds this table, and _ENQUEUE's raw
+    # INSERT leaves both counters to the database
+    attempts = Column(Integer, nullable=False, default=0, server_default=text("0"))
+    rejections = Column(Integer, nullable=False, default=0, server_default=text("0"))  # attempts Zoho rejected the row
+    last_error = Column(Text)
+
+class ZohoRateBucket(Base):
+    """Shared Zoho token bucket (core/services/rate_limit.py)."""
+    __tablename__ = "zoho_rate_bucket"
+
+    name = Column(Text, primary_key=True)
+    tokens = Column(Float, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+class ZohoApiUsage(Base):
+    """Zoho API calls and estimated credits, per UTC day, lane and run."""
+    __tablename__ = "zoho_api_usage"
+
+    day = Column(Date, primary_key=True)
+    lane = Column(Text, primary_key=True)       # "interactive" or "batch"
+    run_id = Column(Text, primary_key=True)     # cron run ID, or "web"/"adhoc"
+    calls = Column(Integer, nullable=False, default=0)
+    credits = Column(Integer, nullable=False, default=0)
+
 class Laboratory(Base):
     __tablename__ = "laboratories"
 
@@ -66,4 +175,11 @@ class Panel(Base):
     __tablename__ = "panels"
 
     panel_id = Column(Text, primary_key=True)
-    panel_name = Column(Text)
\ No newline at end of file
+    panel_name = Column(Text)
+
+class ReplicationWatermark(Base):
+    __tablename__ = "replication_watermark"
+
+    module = Column(Text, primary_key=True)
+    last_modified = Column(Text)        # Zoho Modified_Time of the newest row seen
+    synced_at = Column(DateTime)
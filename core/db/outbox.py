@@ -0,0 +1,166 @@
+# core/db/outbox.py
+"""
+Transactional outbox for complete records bound for Zoho.
+
+The load stage writes its complete rows here in the same transaction as
+its worklist_staging insert, so once a batch is loaded its pushes survive
+a Zoho outage without a re-scrape. The drainer
+(core.normalize.load.drain_outbox) claims due rows under a lease, sends
+them, deletes what Zoho accepted and backs off the rest; a drainer that
+dies mid-send just lets its lease run out. A row Zoho keeps rejecting is
+taken out after OUTBOX_MAX_ATTEMPTS rejections and staged for review.
+
+Each row remembers the source that queued it. Only a source ahead of it in
+SOURCE_PRIORITY may replace its payload, however the loads are scheduled
+(cron run, resident scheduler, backfill).
+"""
+
+import io
+import logging
+from datetime import datetime, timedelta
+
+import pandas as pd
+from sqlalchemy import text
+
+from core.config     import (
+    OUTBOX_BACKOFF_SECONDS,
+    OUTBOX_DRAIN_BATCH,
+    OUTBOX_LEASE_SECONDS,
+    OUTBOX_MAX_ATTEMPTS,
+    OUTBOX_MAX_BACKOFF_SECONDS,
+    SOURCE_PRIORITY,
+)
+from core.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Position in SOURCE_PRIORITY; unknown (or no) source ranks last
+_RANK = "COALESCE(array_position(CAST(:priority AS text[]), {}), 2147483647)"
+
+# One statement for the whole frame: serialized once, split server-side.
+# A CCFID already queued keeps its payload and schedule unless this source
+# outranks the one that queued it.
+_ENQUEUE = text(f"""
+    INSERT INTO zoho_outbox (ccfid, payload, source, enqueued_at, next_attempt_at, attempts, rejections)
+    SELECT r->>'CCFID', r, :source, :now, :now, 0, 0
+      FROM jsonb_array_elements(CAST(:rows AS jsonb)) AS r
+    ON CONFLICT (ccfid) DO UPDATE SET
+        payload     = EXCLUDED.payload,
+        source      = EXCLUDED.source,
+        enqueued_at = EXCLUDED.enqueued_at,
+        rejections  = 0
+     WHERE {_RANK.format("EXCLUDED.source")} < {_RANK.format("zoho_outbox.source")}
+""")
+
+_CLAIM = text("""
+    WITH due AS (
+        SELECT ccfid
+          FROM zoho_outbox
+         WHERE next_attempt_at <= :now
+         ORDER BY next_attempt_at, enqueued_at
+         LIMIT :limit
+           FOR UPDATE SKIP LOCKED
+    ), claimed AS (
+        UPDATE zoho_outbox AS o
+           SET next_attempt_at = :lease_until
+          FROM due
+         WHERE o.ccfid = due.ccfid
+     RETURNING o.payload
+    )
+    SELECT jsonb_agg(payload)::text FROM claimed
+""")
+
+_RETRY = text("""
+    UPDATE zoho_outbox
+       SET attempts        = attempts + 1,
+           rejections      = rejections + :rejected,
+           last_error      = :error,
+           next_attempt_at = :now + make_interval(secs => LEAST(:max_backoff, :backoff * power(2, attempts)))
+     WHERE ccfid = ANY(:ids)
+""")
+
+_DEAD = text("""
+    DELETE FROM zoho_outbox
+     WHERE rejections >= :max_attempts
+ RETURNING payload, source, last_error
+""")
+
+
+def rank(source: str | None) -> int:
+    """Position of `source` in SOURCE_PRIORITY (lower wins); unknown ranks last."""
+    return SOURCE_PRIORITY.index(source) + 1 if source in SOURCE_PRIORITY else 2147483647
+
+
+def enqueue(conn, frame: pd.DataFrame, source: str | None = None) -> int:
+    """Queue a MASTER_COLUMNS frame's rows from `source` on `conn` (the caller's transaction)."""
+    if frame.empty:
+        return 0
+    # Keyed on the CCFID as Zoho will store it (ZohoClient strips it into Name)
+    frame = frame.assign(CCFID=frame["CCFID"].fillna("").astype(str).str.strip())
+    rows  = frame.to_json(orient="records", date_format="iso", force_ascii=False)
+    conn.execute(_ENQUEUE, {"rows": rows, "source": source, "priority": SOURCE_PRIORITY, "now": datetime.utcnow()})
+    logger.info("Queued %d complete records for Zoho", len(frame))
+    return len(frame)
+
+
+def claim(conn, limit: int = OUTBOX_DRAIN_BATCH) -> pd.DataFrame:
+    """Lease up to `limit` due rows, oldest first; returns them as a frame."""
+    now  = datetime.utcnow()
+    rows = conn.execute(_CLAIM, {
+        "now": now, "limit": limit, "lease_until": now + timedelta(seconds=OUTBOX_LEASE_SECONDS),
+    }).scalar()
+    if not rows:
+        return pd.DataFrame(columns=["CCFID"])
+    # dtype=False: CCFIDs and codes stay strings, however numeric they look
+    return pd.read_json(io.StringIO(rows), orient="records", dtype=False)
+
+
+def ack(conn, ccfids) -> None:
+    """Sent: drop these rows from the outbox."""
+    ids = list(ccfids)
+    if ids:
+        conn.execute(text("DELETE FROM zoho_outbox WHERE ccfid = ANY(:ids)"), {"ids": ids})
+
+
+def retry(conn, ccfids, error: str, rejected: bool = False) -> None:
+    """
+    Not sent: try these rows again after an exponential backoff.
+    `rejected`: Zoho turned these rows down (counts toward OUTBOX_MAX_ATTEMPTS).
+    """
+    ids = list(ccfids)
+    if ids:
+        conn.execute(_RETRY, {
+            "ids": ids, "error": error, "rejected": int(rejected), "now": datetime.utcnow(),
+            "backoff": OUTBOX_BACKOFF_SECONDS, "max_backoff": OUTBOX_MAX_BACKOFF_SECONDS,
+        })
+
+
+def dead_letters(conn) -> pd.DataFrame:
+    """
+    Remove rows rejected OUTBOX_MAX_ATTEMPTS times; returns their payloads,
+    plus a `source` column.
+    """
+    rows = conn.execute(_DEAD, {"max_attempts": OUTBOX_MAX_ATTEMPTS}).all()
+    if not rows:
+        return pd.DataFrame(columns=["CCFID", "source"])
+    for payload, _, error in rows:
+        logger.warning("Giving up on %s after %d Zoho rejections (%s)", payload.get("CCFID"), OUTBOX_MAX_ATTEMPTS, error)
+    return pd.DataFrame.from_records([{**payload, "source": source} for payload, source, _ in rows])
+
+
+def queued(ccfids) -> dict[str, str | None]:
+    """{ccfid: source that queued it} for those of `ccfids` (stripped) already in the outbox."""
+    ids = list({str(c).strip() for c in ccfids if pd.notna(c) and str(c).strip()})
+    if not ids:
+        return {}
+    with engine.connect() as conn:
+        return dict(conn.execute(
+            text("SELECT ccfid, source FROM zoho_outbox WHERE ccfid = ANY(:ids)"), {"ids": ids}
+        ).all())
+
+
+def backlog() -> tuple[int, datetime | None]:
+    """(rows waiting, oldest enqueued_at)."""
+    with engine.connect() as conn:
+        count, oldest = conn.execute(text("SELECT COUNT(*), MIN(enqueued_at) FROM zoho_outbox")).one()
+    return count, oldest
@@ -19,3 +19,12 @@ SessionLocal = sessionmaker(
     bind=engine,
     future=True
 )
+
+
+def dispose_after_fork() -> None:
+    """
+    Call in a forked child (e.g. a preloaded gunicorn worker): forget any
+    pooled connections inherited from the parent without closing them, so
+    the child opens its own and the parent's sockets are left alone.
+    """
+    engine.dispose(close=False)
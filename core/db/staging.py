@@ -0,0 +1,176 @@
+# core/db/staging.py
+
+import logging
+from datetime import date, datetime
+
+from sqlalchemy import text
+
+from core.config     import STAGING_ARCHIVE_BATCH
+from core.db.models  import UploadedCCFID, WorklistArchive, WorklistStaging
+from core.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Fields reviewers may edit, and the Postgres type each VALUES column is cast to
+EDITABLE_FIELDS = {
+    "first_name":         "text",
+    "last_name":          "text",
+    "primary_id":         "text",
+    "company_name":       "text",
+    "company_code":       "text",
+    "collection_site":    "text",
+    "collection_site_id": "text",
+    "laboratory":         "text",
+    "panel":              "text",
+    "location":           "text",
+    "test_reason":        "text",
+    "test_result":        "text",
+    "positive_for":       "text",
+    "test_type":          "text",
+    "regulation":         "text",
+    "regulation_body":    "text",
+    "bat_value":          "text",
+    "collection_date":    "date",
+    "mro_received":       "date",
+}
+
+
+def unreviewed_items(db):
+    """
+    The worklist: unreviewed rows not yet uploaded, by CCFID. Filters with
+    reviewed = false so the ix_worklist_staging_unreviewed partial index applies.
+    """
+    return (
+        db.query(WorklistStaging)
+          .filter_by(reviewed=False)
+          .filter(~WorklistStaging.ccfid.in_(db.query(UploadedCCFID.ccfid)))
+          .order_by(WorklistStaging.ccfid)
+    )
+
+
+def _clean(field: str, value):
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    if EDITABLE_FIELDS[field] == "date":
+        # Accept "2025-07-14" as well as "2025-07-14T00:00:00"
+        return date.fromisoformat(str(value)[:10])
+    if isinstance(value, list):
+        # Multi-selects (Positive_For) are stored semicolon-separated
+        return ";".join(value) or None
+    return str(value).strip()
+
+
+def batch_update_staging(conn, patches: list[dict]) -> list[dict]:
+    """
+    Apply per-row patches — [{"ccfid": ..., <field>: <value>, ...}, ...] —
+    in one UPDATE … FROM (VALUES …) … RETURNING on `conn` (a Session or
+    Connection; the caller commits). Rows may patch different fields: each
+    field gets a "was it sent" flag, and a row keeps its current value for
+    fields it didn't send. Returns the updated rows; unknown CCFIDs are
+    simply absent. Raises ValueError on a bad field, value or duplicate row.
+    """
+    if not patches:
+        return []
+
+    fields, seen = [], set()
+    for p in patches:
+        ccfid = p.get("ccfid")
+        if not ccfid:
+            raise ValueError("every patch needs a ccfid")
+        if ccfid in seen:
+            raise ValueError(f"{ccfid} is patched more than once")
+        seen.add(ccfid)
+        for f in p:
+            if f == "ccfid":
+                continue
+            if f not in EDITABLE_FIELDS:
+                raise ValueError(f"{f!r} is not an editable field")
+            if f not in fields:
+                fields.append(f)
+    if not fields:
+        raise ValueError("patches don't change any fields")
+
+    params, rows = {}, []
+    for i, p in enumerate(patches):
+        cols = [f"CAST(:c{i} AS text)"]
+        params[f"c{i}"] = p["ccfid"]
+        for j, f in enumerate(fields):
+            try:
+                params[f"v{i}_{j}"] = _clean(f, p[f]) if f in p else None
+            except ValueError:
+                raise ValueError(f"{p['ccfid']}: bad {f} {p[f]!r}") from None
+            params[f"s{i}_{j}"] = f in p
+            cols.append(f"CAST(:v{i}_{j} AS {EDITABLE_FIELDS[f]})")
+            cols.append(f"CAST(:s{i}_{j} AS boolean)")
+        rows.append(f"({', '.join(cols)})")
+
+    names = ["ccfid"] + [n for j in range(len(fields)) for n in (f"v{j}", f"s{j}")]
+    sets  = ",\n    ".join(
+        f"{f} = CASE WHEN v.s{j} THEN v.v{j} ELSE t.{f} END" for j, f in enumerate(fields)
+    )
+    sql = f"""
+UPDATE worklist_staging AS t SET
+    {sets}
+FROM (VALUES {', '.join(rows)}) AS v({', '.join(names)})
+WHERE t.ccfid = v.ccfid
+RETURNING t.*
+"""
+    result = conn.execute(text(sql), params)
+    return [dict(r._mapping) for r in result]
+
+
+# --- Hot/cold split ---
+
+def _month_start(d: date, offset: int = 0) -> date:
+    m = d.year * 12 + d.month - 1 + offset
+    return date(m // 12, m % 12 + 1, 1)
+
+
+def ensure_archive_partitions(conn, today: date | None = None) -> None:
+    """Create worklist_archive and this month's and next month's partitions if missing."""
+    WorklistArchive.__table__.create(conn, checkfirst=True)
+    # archived_at is UTC, so partition boundaries are too
+    today = today or datetime.utcnow().date()
+    for offset in (0, 1):
+        lo, hi = _month_start(today, offset), _month_start(today, offset + 1)
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS worklist_archive_{lo:%Y_%m} "
+            f"PARTITION OF worklist_archive FOR VALUES FROM ('{lo}') TO ('{hi}')"
+        ))
+
+
+def archive_staging(batch: int = STAGING_ARCHIVE_BATCH) -> int:
+    """
+    Move reviewed or already-uploaded rows from worklist_staging into
+    worklist_archive, `batch` rows per transaction, so the hot table holds
+    only rows a reviewer still has to act on. Returns rows moved.
+    """
+    cols = ", ".join(c.name for c in WorklistStaging.__table__.columns)
+    move = text(f"""
+        WITH moved AS (
+            DELETE FROM worklist_staging
+            WHERE ccfid IN (
+                SELECT s.ccfid FROM worklist_staging s
+                WHERE s.reviewed
+                   OR EXISTS (SELECT 1 FROM uploaded_ccfid u WHERE u.ccfid = s.ccfid)
+                LIMIT :batch
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING {cols}
+        )
+        INSERT INTO worklist_archive ({cols}, archived_at)
+        SELECT {cols}, :now FROM moved
+    """)
+
+    with engine.begin() as conn:
+        ensure_archive_partitions(conn)
+
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            n = conn.execute(move, {"batch": batch, "now": datetime.utcnow()}).rowcount
+        total += n
+        if n < batch:
+            break
+    logger.info("Archived %d worklist rows", total)
+    return total
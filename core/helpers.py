@@ -6,11 +6,11 @@ import subprocess
 import shutil
 import pandas as pd
 
-from sqlalchemy import text
+from sqlalchemy import inspect, text
 from logging import getLogger
 from core.normalize.common import MASTER_COLUMNS
-from core.db.models    import WorklistStaging, UploadedCCFID
-from core.db.session   import SessionLocal
+from core.db.models    import WorklistArchive, WorklistStaging, UploadedCCFID
+from core.db.session   import SessionLocal, engine
 
 logger = getLogger(__name__)
 
@@ -90,7 +90,7 @@ def should_skip(source: str, args) -> bool:
         "escreen": args.skip_escreen_scrape,
     }.get(source, False)
 
-def parse_args():
+def parse_args(argv=None):
     import argparse
     p = argparse.ArgumentParser(description="Run the import pipeline")
     p.add_argument("--dry-run", action="store_true", help="Run without writing")
@@ -98,7 +98,9 @@ def parse_args():
     p.add_argument("--skip-crl-scrape", action="store_true")
     p.add_argument("--skip-i3-scrape", action="store_true")
     p.add_argument("--skip-escreen-scrape", action="store_true")
-    return p.parse_args()
+    p.add_argument("--run-id", help="Resume this checkpointed run")
+    p.add_argument("--fresh", action="store_true", help="Ignore unfinished runs; start a new one")
+    return p.parse_args(argv)
 
 def is_complete(record: dict) -> bool:
     test_type   = (record.get("Test_Type", "")   or "").strip()
@@ -148,7 +150,64 @@ def is_complete(record: dict) -> bool:
 
     return True
 
-def fetch_existing_ccfids():
+def complete_mask(df: pd.DataFrame) -> pd.Series:
+    """
+    Column-wise version of `is_complete` for a MASTER_COLUMNS frame:
+    same skip rules, evaluated as boolean masks instead of per-row dicts.
+    """
+    def col(name):
+        if name in df.columns:
+            # object, so a categorical column can take the fillna("") below
+            return df[name].astype(object)
+        return pd.Series("", index=df.index, dtype=object)
+
+    def blank(s):
+        return s.astype(str).str.strip().str.lower().isin(["", "none", "nan"])
+
+    test_type   = col("Test_Type").fillna("").astype(str).str.strip()
+    test_result = col("Test_Result").fillna("").astype(str).str.strip()
+    regulation  = col("Regulation").fillna("").astype(str).str.strip()
+
+    # Which columns may be left empty, per row
+    optional = {
+        "Location":        col("Code") != "A1310",
+        "Laboratory":      test_type.isin(["POCT Urine Test", "Alcohol Breath Test"]),
+        "BAT_Value":       test_type != "Alcohol Breath Test",
+        "Positive_For":    ~test_result.isin(["Positive", "Positive-Dilute"]),
+        "Regulation_Body": regulation != "DOT",
+    }
+
+    ok = pd.Series(True, index=df.index)
+    for c in MASTER_COLUMNS:
+        if c in ("Test_Type", "Test_Result", "Regulation"):
+            continue
+        missing = blank(col(c))
+        if c in optional:
+            missing &= ~optional[c]
+        ok &= ~missing
+    return ok
+
+def fetch_existing_ccfids(ccfids=None):
+    """
+    (uploaded, staged) CCFID sets; `staged` includes archived rows. Given
+    `ccfids` (e.g. a batch's CCFID column), only those are looked up, with
+    one `= ANY` index probe per table, instead of loading every CCFID.
+    """
+    if ccfids is not None:
+        ids = list({str(c) for c in ccfids if pd.notna(c) and str(c)})
+        with engine.connect() as conn:
+            def present(table):
+                return {
+                    c for (c,) in conn.execute(
+                        text(f"SELECT ccfid FROM {table} WHERE ccfid = ANY(:ids)"), {"ids": ids}
+                    )
+                }
+            uploaded = present("uploaded_ccfid")
+            staged   = present("worklist_staging")
+            if inspect(conn).has_table("worklist_archive"):
+                staged |= present("worklist_archive")
+        return uploaded, staged
+
     db = SessionLocal()
     try:
         # 1) CCFIDs already pushed
@@ -156,11 +215,16 @@ def fetch_existing_ccfids():
             ccfid
             for (ccfid,) in db.query(UploadedCCFID.ccfid).all()
         }
-        # 2) CCFIDs already staged
+        # 2) CCFIDs already staged (hot or archived)
         staged = {
             ccfid
             for (ccfid,) in db.query(WorklistStaging.ccfid).all()
         }
+        if inspect(db.get_bind()).has_table("worklist_archive"):
+            staged |= {
+                ccfid
+                for (ccfid,) in db.query(WorklistArchive.ccfid).all()
+            }
         return uploaded, staged
     finally:
         db.close()
@@ -0,0 +1,115 @@
+# core/normalize/aliases.py
+"""
+Learned company aliases: raw company / cost-center strings → account codes.
+
+Checked before any fuzzy scoring, so a company seen before resolves with a
+dict lookup. Aliases are learned from reviewers correcting company_code on
+eScreen rows in the worklist (keyed on the exported value), and from fuzzy matches scoring at least COMPANY_ALIAS_MIN_SCORE.
+A reviewer's alias is never overwritten by a fuzzy one, and only codes that
+exist in account_info are accepted.
+"""
+
+import logging
+from datetime import datetime
+from functools import lru_cache
+
+import pandas as pd
+from sqlalchemy import text
+
+from core.config     import COMPANY_ALIAS_MIN_SCORE
+from core.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+# Fuzzy matches made this run, saved by save_learned_aliases()
+_learned: dict[str, tuple[str, str, int]] = {}
+
+_UPSERT = text("""
+    INSERT INTO company_alias (alias, raw, account_code, source, score, updated_at)
+    SELECT :alias, :raw, :code, :source, :score, :now
+    WHERE EXISTS (SELECT 1 FROM account_info WHERE account_code = :code)
+    ON CONFLICT (alias) DO UPDATE SET
+        raw          = EXCLUDED.raw,
+        account_code = EXCLUDED.account_code,
+        source       = EXCLUDED.source,
+        score        = EXCLUDED.score,
+        updated_at   = EXCLUDED.updated_at
+    WHERE company_alias.source = 'fuzzy' OR EXCLUDED.source = 'reviewer'
+""")
+
+
+# Placeholder company / cost-center values: never an alias of anything
+PLACEHOLDERS = {"n/a", "na", "none", "nan", "null", "unknown", "-", "--", "tbd"}
+
+
+def alias_key(raw) -> str:
+    """Case- and whitespace-insensitive lookup key ("" for blanks and placeholders)."""
+    if raw is None or pd.isna(raw):
+        return ""
+    key = " ".join(str(raw).lower().split())
+    return "" if key in PLACEHOLDERS else key
+
+
+@lru_cache(maxsize=1)
+def alias_map() -> dict[str, str]:
+    """{alias key: account code}, loaded on first use; cache_clear() to refresh."""
+    with engine.connect() as conn:
+        return dict(conn.execute(text("SELECT alias, account_code FROM company_alias")).all())
+
+
+def lookup(raw) -> str | None:
+    key = alias_key(raw)
+    return alias_map().get(key) if key else None
+
+
+def remember_match(raw, code: str, score: float) -> None:
+    """Keep a good fuzzy match, for the rest of this run and (once saved) for good."""
+    key = alias_key(raw)
+    if not key or not code or score < COMPANY_ALIAS_MIN_SCORE:
+        return
+    alias_map()[key] = code
+    _learned[key] = (str(raw), code, int(score))
+
+
+def pop_learned() -> dict:
+    """Take this process's unsaved fuzzy matches (for parallel normalization)."""
+    learned = dict(_learned)
+    _learned.clear()
+    return learned
+
+
+def add_learned(learned: dict) -> None:
+    """Adopt fuzzy matches made in a worker process, to be saved from here."""
+    _learned.update(learned)
+
+
+def _write(rows: list[dict]) -> int:
+    now = datetime.utcnow()
+    with engine.begin() as conn:
+        return sum(conn.execute(_UPSERT, {**r, "now": now}).rowcount for r in rows)
+
+
+def save_aliases(pairs, source: str = "reviewer") -> int:
+    """Upsert (raw, code) pairs as `source` aliases; returns rows written."""
+    rows = [
+        {"alias": alias_key(raw), "raw": str(raw), "code": code, "source": source, "score": None}
+        for raw, code in pairs
+        if alias_key(raw) and code
+    ]
+    written = _write(rows) if rows else 0
+    if written:
+        alias_map.cache_clear()
+    return written
+
+
+def save_learned_aliases() -> int:
+    """Persist this run's high-confidence fuzzy matches."""
+    if not _learned:
+        return 0
+    written = _write([
+        {"alias": key, "raw": raw, "code": code, "source": "fuzzy", "score": score}
+        for key, (raw, code, score) in _learned.items()
+    ])
+    logger.info("Learned %d company aliases from fuzzy matches", written)
+    _learned.clear()
+    return written
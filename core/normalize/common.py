@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 
 # --- Shared Constants & Mappings ---
@@ -78,6 +79,48 @@ MASTER_COLUMNS = [
 ]
 
 
+# --- Vectorized Mapping Engine ---
+_type_of = np.frompyfunc(type, 1, 1)
+
+
+def map_values(series: pd.Series, func) -> pd.Series:
+    """
+    Same result as `series.apply(func)`, but `func` runs once per distinct
+    value (NaN/None included) and the results are broadcast back by code.
+    Always returns an object Series, even for categorical input.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Categorical .apply/.map skip NaN (a blank "Regulated" came out ""
+        # instead of "Non-DOT"), so NaN gets its own slot after the categories
+        uniques = [*series.cat.categories, np.nan]
+        codes   = series.cat.codes.to_numpy()
+        codes   = np.where(codes == -1, len(uniques) - 1, codes)
+    else:
+        codes, _ = pd.factorize(series, use_na_sentinel=False)
+        if series.dtype == object and len(series):
+            # factorize treats 1, 1.0 and True (and None/NaN) as one value;
+            # .apply would call func on each, so split the codes by type too
+            types, _ = pd.factorize(_type_of(series.to_numpy()))
+            codes, _ = pd.factorize(codes * (types.max() + 1) + types)
+        # Codes number values in order of first appearance, so the first row
+        # of each code is its representative, boxed the way .apply boxes it
+        _, first = np.unique(codes, return_index=True)
+        uniques  = series.iloc[first].astype(object).tolist()
+    mapped = np.empty(len(uniques), dtype=object)
+    for i, val in enumerate(uniques):
+        mapped[i] = func(val)
+    return pd.Series(mapped[codes], index=series.index, name=series.name)
+
+
+def _zoho_date(val):
+    return to_zoho_date(safe_date_parse(val))
+
+
+def map_dates(series: pd.Series) -> pd.Series:
+    """Raw date column → "YYYY-MM-DD" strings ("" when unparseable)."""
+    return map_values(series, _zoho_date)
+
+
 # --- Shared Helper Functions ---
 def safe_date_parse(val, out_fmt="%m/%d/%Y"):
     if pd.isna(val) or not str(val).strip():
@@ -2,44 +2,50 @@ import logging
 from datetime import datetime
 import pandas as pd
 
-from core.helpers           import is_complete, fetch_existing_ccfids
 from core.normalize.common  import (
     MASTER_COLUMNS,
+    map_dates,
     map_laboratory,
     map_reason,
     map_regulation,
     map_regbody,
     map_result,
+    map_values,
     parse_name,
-    safe_date_parse,
-    to_zoho_date,
 )
-from core.services.zoho     import zoho_client
-from core.db.session        import SessionLocal
-from core.db.models         import UploadedCCFID, WorklistStaging, CollectionSite, Panel
+from core.normalize.load    import LoadSummary, load_batch
+from core.normalize.parallel import parallel_transform
 
 logger = logging.getLogger(__name__)
 
+# Raw columns the CCFID comes from (parallel partitioning key)
+RAW_CCFID_COLUMNS = ("Reference ID", "Authorized ID")
 
-def resolve_reference_id_crl(row):
-    ref = row.get("Reference ID")
-    if pd.notna(ref) and str(ref).strip():
-        return ref
-    svc = str(row.get("Type", "")).strip().upper()
-    aid = str(row.get("Authorized ID", "")).strip()
-    if svc == "A":
-        return f"BAT{aid}"
-    if svc == "PHY":
-        return f"PHY{aid}"
-    return ""
 
+def resolve_reference_ids_crl(df: pd.DataFrame) -> pd.Series:
+    """
+    CCFID per row: the Reference ID when present, otherwise BAT<id> for
+    alcohol ("A") and PHY<id> for physicals, else "".
+    """
+    blank = pd.Series("", index=df.index)
+    ref = df.get("Reference ID", pd.Series(None, index=df.index, dtype=object))
+    svc = df.get("Type", blank).astype(str).str.strip().str.upper()
+    aid = df.get("Authorized ID", blank).astype(str).str.strip()
 
-def normalize(df: pd.DataFrame) -> tuple[list[dict], list[dict]]:
-    # 1) already‐seen CCFIDs
-    uploaded_set, staged_set = fetch_existing_ccfids()
+    out = pd.Series("", index=df.index, dtype=object)
+    out[svc == "A"]   = "BAT" + aid[svc == "A"]
+    out[svc == "PHY"] = "PHY" + aid[svc == "PHY"]
+
+    has_ref = ref.notna() & (ref.astype(str).str.strip() != "")
+    out[has_ref] = ref[has_ref]
+    return out
+
+
+def transform_crl(df: pd.DataFrame) -> pd.DataFrame:
+    """Map a raw CRL export onto MASTER_COLUMNS. Pure: no DB or Zoho access."""
     df = df.copy()
 
-    # 2) initial filtering & cleaning
+    # 1) initial filtering & cleaning
     drop_list = {
         "pending laboratory testing",
         "pending collection",
@@ -49,8 +55,8 @@ def normalize(df: pd.DataFrame) -> tuple[list[dict], list[dict]]:
     df = df[~df["Status"].str.lower().isin(drop_list)].copy()
 
     # names & IDs
-    df["First_Name"], df["Last_Name"] = zip(*df["Name"].apply(parse_name))
-    df["CCFID"]      = df.apply(resolve_reference_id_crl, axis=1)
+    df["First_Name"], df["Last_Name"] = zip(*map_values(df["Name"], parse_name))
+    df["CCFID"]      = resolve_reference_ids_crl(df)
     df["Primary_ID"] = df.get("CCF Donor ID", "")
 
     # company / code
@@ -59,11 +65,7 @@ def normalize(df: pd.DataFrame) -> tuple[list[dict], list[dict]]:
 
     # collection date → ISO → drop before-cutoff
     df["Collection_Date_raw"] = df.get("Collection Date", "")
-    df["Collection_Date"] = (
-        df["Collection_Date_raw"]
-        .apply(safe_date_parse)
-        .apply(to_zoho_date)
-    )
+    df["Collection_Date"] = map_dates(df["Collection_Date_raw"])
     df = df[df["Collection_Date"] != ""]
     cutoff = pd.to_datetime("2025-01-01")
     df["Collection_Date_dt"] = pd.to_datetime(df["Collection_Date"], errors="coerce")
@@ -71,27 +73,23 @@ def normalize(df: pd.DataFrame) -> tuple[list[dict], list[dict]]:
     df.drop(columns=["Collection_Date_raw", "Collection_Date_dt"], inplace=True)
 
     # initial MRO_Received mapping
-    df["MRO_Received"] = (
-        df.get("Reviewed Date", "")
-        .apply(safe_date_parse)
-        .apply(to_zoho_date)
-    )
+    df["MRO_Received"] = map_dates(df.get("Reviewed Date", ""))
 
     # basic field maps
-    df["Test_Result"]      = df.get("MRO Result", "").apply(map_result)
+    df["Test_Result"]      = map_values(df.get("MRO Result", ""), map_result)
     df["Positive_For"] = ""
-    df["Regulation"]       = df.get("Regulated", "").apply(map_regulation)
-    df["Regulation_Body"]  = df.get("Regulatory Mode", "").apply(map_regbody)
+    df["Regulation"]       = map_values(df.get("Regulated", ""), map_regulation)
+    df["Regulation_Body"]  = map_values(df.get("Regulatory Mode", ""), map_regbody)
     df["BAT_Value"]        = df.get("Alcohol Screen value", "")
-    df["Test_Type"]        = df.get("Service", "")
+    df["Test_Type"]        = df.get("Service", pd.Series("", index=df.index)).astype(object)
     df.loc[df["Type"].astype(str).str.upper() == "PHY", "Test_Type"] = "Physical"
     df["Test_Reason"]      = (
-        df.get("Reason", "Other").apply(map_reason)
+        map_values(df["Reason"], map_reason)
         if "Reason" in df.columns else "Other"
     )
     df["Panel"]        = df.get("Lab Panel", "")
     df["Laboratory"]       = (
-        df.get("Lab Code", "").apply(map_laboratory)
+        map_values(df["Lab Code"], map_laboratory)
         if "Lab Code" in df.columns else ""
     )
     # override: POCT or alcohol → no lab
@@ -132,103 +130,17 @@ def normalize(df: pd.DataFrame) -> tuple[list[dict], list[dict]]:
 
     # ────────────────────────────────────
 
-    # 3) reorder & initial dedupe
-    result = df.reindex(columns=MASTER_COLUMNS, fill_value="").fillna("")
-
-    # # include all records, even those already uploaded (for testing)
-    # batch = result.copy()
-
-    # drop already uploaded
-    batch = result.loc[~result["CCFID"].isin(uploaded_set)]
-    before = len(batch)
-    batch = batch.drop_duplicates(subset=["CCFID"]).reset_index(drop=True)
-    logger.info("Deduplication Yield: %d records", len(batch))
-
-    # 4) complete vs incomplete
-    mask = batch.apply(is_complete, axis=1)
-    complete_df = batch[mask]
-    staging_df  = batch[~mask]
-    logger.info("%d complete, %d incomplete records", len(complete_df), len(staging_df))
-
-    # 5) new staging only
-    staging_new_df = staging_df.loc[~staging_df["CCFID"].isin(staged_set)]
-
-    # 6) sync collection sites
-    db = SessionLocal()
-    existing_sites = {sid for (sid,) in db.query(CollectionSite.Collection_Site_ID).all()}
-    db.close()
-
-    site_df      = batch[["Collection_Site", "Collection_Site_ID"]].drop_duplicates()
-    full_site_map = zoho_client.sync_collection_sites(site_df)
-    created       = set(full_site_map) - existing_sites
-    logger.info("Created %d new collection sites", len(created))
-
-    # 7) push complete_df to Zoho & record UploadedCCFID
-    if not complete_df.empty:
-        records   = complete_df.to_dict(orient="records")
-        successes = zoho_client.push_records(records)
-        logger.info("Zoho accepted %d/%d complete records", len(successes), len(records))
-
-        db = SessionLocal()
-        now = datetime.utcnow()
-        for c in successes:
-            db.merge(UploadedCCFID(ccfid=c, uploaded_timestamp=now))
-        db.commit()
-        db.close()
-
-    # 8) insert staging_new_df into WorklistStaging
-    if not staging_new_df.empty:
-        FIELD_MAP = {
-            "CCFID":           "ccfid",
-            "First_Name":      "first_name",
-            "Last_Name":       "last_name",
-            "Primary_ID":      "primary_id",
-            "Company":         "company_name",
-            "Code":            "company_code",
-            "Collection_Date": "collection_date",
-            "MRO_Received":    "mro_received",
-            "Collection_Site_ID":"collection_site_id",
-            "Collection_Site": "collection_site",
-            "Laboratory":      "laboratory",
-            "Location":        "location",
-            "Test_Reason":     "test_reason",
-            "Test_Result":     "test_result",
-            "Test_Type":       "test_type",
-            "Panel":           "panel",
-            "Regulation":      "regulation",
-            "Regulation_Body": "regulation_body",
-            "BAT_Value":       "bat_value",
-        }
-        now    = datetime.utcnow()
-        mapped = []
-        for rec in staging_new_df.to_dict(orient="records"):
-            row = {}
-            for src, tgt in FIELD_MAP.items():
-                val = rec.get(src)
-                if tgt in ("collection_date", "mro_received"):
-                    if isinstance(val, str) and val.strip():
-                        parsed = None
-                        for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
-                            try:
-                                parsed = datetime.strptime(val, fmt).date()
-                                break
-                            except ValueError:
-                                continue
-                        row[tgt] = parsed
-                    else:
-                        row[tgt] = None
-                else:
-                    row[tgt] = "" if pd.isna(val) else str(val)
-            row["reviewed"]           = False
-            row["uploaded_timestamp"] = now
-            mapped.append(row)
-
-        db = SessionLocal() 
-        db.bulk_insert_mappings(WorklistStaging, mapped)
-        db.commit()
-        db.close()
-
-    return (
-        complete_df.to_dict(orient="records"),
-        staging_new_df.to_dict(orient="records"),
-    )
+    # 2) reorder to the master schema
+    return df.reindex(columns=MASTER_COLUMNS, fill_value="").fillna("")
+
+
+def normalize(
+    df: pd.DataFrame, dry_run: bool = False, lean: bool = False
+) -> tuple[list[dict], list[dict]] | LoadSummary:
+    """
+    Transform a raw CRL export, then run the shared load stage
+    (dedupe, split, site sync, staging insert, Zoho push).
+    Returns (complete_records, new_staging_records), or a LoadSummary of
+    counts with lean=True.
+    """
+    return load_batch(parallel_transform(transform_crl, df, RAW_CCFID_COLUMNS), dry_run=dry_run, lean=lean, source="crl")
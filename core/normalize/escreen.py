@@ -3,29 +3,33 @@ import os
 import shutil
 import subprocess
 import platform
-from datetime import datetime
+from functools import lru_cache
 from typing import Union
 
 import pandas as pd
 from rapidfuzz import fuzz, process
 
-from core.db.session       import engine, SessionLocal
-from core.db.models        import CollectionSite, UploadedCCFID, WorklistStaging
+from core.db.session       import engine
+from core.normalize        import aliases
 from core.normalize.common import (
     MASTER_COLUMNS,
     parse_name,
-    safe_date_parse,
-    to_zoho_date,
+    map_dates,
+    map_values,
     map_reason,
     map_result,
     map_regulation,
     map_laboratory,
 )
-from core.services.zoho    import zoho_client
-from core.helpers          import is_complete, fetch_existing_ccfids
+from core.normalize.schemas import ESCREEN_SCHEMA, read_export
+from core.normalize.load   import STAGING_FIELD_MAP, LoadSummary, load_batch
+from core.normalize.parallel import parallel_transform
 
 logger = logging.getLogger(__name__)
 
+# Raw columns the CCFID comes from (parallel partitioning key)
+RAW_CCFID_COLUMNS = ("COC", "CCFID", "Test Number")
+
 def find_soffice():
     if platform.system() == "Windows":
         # try both 64- and 32-bit program files
@@ -76,17 +80,27 @@ def load_crm_reference() -> pd.DataFrame:
     """
     return pd.read_sql(query, con=engine)
 
-crm_df    = load_crm_reference()
-crm_names = crm_df["company"].astype(str).tolist()
-crm_codes = crm_df["code"].astype(str).tolist()
+@lru_cache(maxsize=1)
+def crm_reference() -> tuple[list[str], list[str]]:
+    """(company names, codes), loaded on first use; cache_clear() to refresh."""
+    crm_df = load_crm_reference()
+    return crm_df["company"].astype(str).tolist(), crm_df["code"].astype(str).tolist()
 
 def fuzzy_code(company: str) -> str:
     if pd.isna(company) or not str(company).strip():
         return ""
+    # Learned alias (reviewer correction or earlier confident match) first
+    code = aliases.lookup(company)
+    if code:
+        return code
+    crm_names, crm_codes = crm_reference()
     match, score, idx = process.extractOne(
         company, crm_names, scorer=fuzz.token_sort_ratio
     )
-    return crm_codes[idx] if score > 70 else ""
+    if score <= 70:
+        return ""
+    aliases.remember_match(company, crm_codes[idx], score)
+    return crm_codes[idx]
 
 def find_col(possible: list[str], cols: pd.Index) -> str:
     for cand in possible:
@@ -95,26 +109,21 @@ def find_col(possible: list[str], cols: pd.Index) -> str:
                 return col
     raise KeyError(f"None of {possible} in {list(cols)}")
 
-def normalize_escreen(
-    source: Union[str, pd.DataFrame],
-    download_dir: str = "."
-) -> tuple[list[dict], list[dict]]:
-    """
-    source: either a pandas DataFrame (for tests) or an XLSX file path.
-    download_dir: where eScreen drops its XLSX and where we convert→CSV.
-    Returns: (complete_records, new_staging_records)
-    """
-    # 1) Load raw DF
-    if isinstance(source, str):
-        xlsx = source
-        csvp = convert_xlsx_to_csv(xlsx, download_dir)
-        hdr  = find_escreen_header_row(csvp)
-        df   = pd.read_csv(csvp, dtype=str, header=hdr)
-    else:
-        df = source.copy()
+def load_escreen_export(xlsx: str, download_dir: str = ".") -> pd.DataFrame:
+    """Convert the eScreen XLSX → CSV and load it with the eScreen schema."""
+    csvp = convert_xlsx_to_csv(xlsx, download_dir)
+    hdr  = find_escreen_header_row(csvp)
+    return read_export(csvp, ESCREEN_SCHEMA, header=hdr)
 
-    # 2) Already-seen sets
-    uploaded_set, staged_set = fetch_existing_ccfids()
+# eScreen has no regulation body or BAT value to stage
+ESCREEN_STAGING_FIELDS = {
+    src: tgt for src, tgt in STAGING_FIELD_MAP.items()
+    if src not in ("Regulation_Body", "BAT_Value")
+}
+
+def transform_escreen(df: pd.DataFrame) -> pd.DataFrame:
+    """Map a raw eScreen export onto MASTER_COLUMNS (no writes)."""
+    df = df.copy()
 
     cols = df.columns
     donor_col       = find_col(["Donor Name","DonorName"], cols)
@@ -131,27 +140,28 @@ def normalize_escreen(
     ba_quant_col    = find_col(["BA Quant","baValue"], cols)
 
     # 3) Names & IDs
-    df["First_Name"], df["Last_Name"] = zip(*df[donor_col].map(parse_name))
+    df["First_Name"], df["Last_Name"] = zip(*map_values(df[donor_col], parse_name))
     df["CCFID"]      = df[coc_col].fillna("")
     df["Primary_ID"] = df[ssn_col].fillna("")
 
-    # 4) Company & Code
-    def choose_company(r):
-        cc = r.get(cost_center_col,"")
-        if pd.notna(cc) and str(cc).strip().upper() not in ("","N/A","NONE","NAN"):
-            return str(cc).strip()
-        return str(r.get(client_col,"")).strip()
-    df["Company"] = df.apply(choose_company, axis=1)
-    df["Code"]    = df["Company"].apply(fuzzy_code)
+    # 4) Company & Code: cost center wins unless it's blank/placeholder
+    cost_center = df[cost_center_col].astype(str).str.strip()
+    use_cc      = df[cost_center_col].notna() & ~cost_center.str.upper().isin(
+        ["","N/A","NONE","NAN"]
+    )
+    df["Company"] = cost_center.where(use_cc, df[client_col].astype(str).str.strip())
+    # Reviewers add aliases between runs
+    aliases.alias_map.cache_clear()
+    df["Code"]    = map_values(df["Company"], fuzzy_code)
 
     # 5) Dates & result/reason/regulation
-    df["Collection_Date"] = df[coll_date_col].apply(safe_date_parse).apply(to_zoho_date)
-    df["MRO_Received"]    = df[mro_date_col].apply(safe_date_parse).apply(to_zoho_date)
-    df["Test_Result"]     = df[result_col].apply(map_result)
+    df["Collection_Date"] = map_dates(df[coll_date_col])
+    df["MRO_Received"]    = map_dates(df[mro_date_col])
+    df["Test_Result"]     = map_values(df[result_col], map_result)
     df = df[df["Test_Result"] != ""].copy()
     df["Positive_For"] = ""
-    df["Test_Reason"]     = df[reason_col].apply(map_reason)
-    df["Regulation"]      = df[regulation_col].apply(map_regulation)
+    df["Test_Reason"]     = map_values(df[reason_col], map_reason)
+    df["Regulation"]      = map_values(df[regulation_col], map_regulation)
 
     # BA Quant override
     if ba_quant_col in df:
@@ -163,7 +173,7 @@ def normalize_escreen(
         s = str(v).lower()
         if "ecup" in s:                 return "eCup"
         return None
-    df["Panel"]  = df[type_col].apply(panel)
+    df["Panel"]  = map_values(df[type_col], panel)
 
     # 6) Test_Type & Laboratory
     def escreen_type(v):
@@ -173,8 +183,8 @@ def normalize_escreen(
         if "omega" in s:                return "Lab Based Hair Test"
         if "ebt" in s or "breath" in s: return "Alcohol Breath Test"
         return "Other"
-    df["Test_Type"]  = df[type_col].apply(escreen_type)
-    df["Laboratory"] = df[type_col].apply(map_laboratory)
+    df["Test_Type"]  = map_values(df[type_col], escreen_type)
+    df["Laboratory"] = map_values(df[type_col], map_laboratory)
     df.loc[df["Test_Type"].isin(
         ["Alcohol Breath Test","POCT Urine Test"]
     ), "Laboratory"] = ""
@@ -186,95 +196,26 @@ def normalize_escreen(
     df.loc[df["Code"]=="A1310", ["Location","Collection_Site","Collection_Site_ID"]] = ""
 
     # 8) Master‐schema reorder
-    result = df.reindex(columns=MASTER_COLUMNS, fill_value="").fillna("")
-
-    # # include all records, even those already uploaded (for testing)
-    # batch = result.copy()
-
-    # 9) Exclude already‐uploaded & in‐batch dedupe
-    batch = result[~result["CCFID"].isin(uploaded_set)]
-    before = len(batch)
-    batch = batch.drop_duplicates(subset=["CCFID"]).reset_index(drop=True)
-    logger.info("Deduplication Yield: %d records", len(batch))
-
-    # 10) Split complete vs incomplete
-    mask         = batch.apply(is_complete, axis=1)
-    complete_df  = batch[mask]
-    staging_df   = batch[~mask]
-    new_staging  = staging_df[~staging_df["CCFID"].isin(staged_set)]
-    logger.info("%d complete, %d incomplete", len(complete_df), len(staging_df))
+    return df.reindex(columns=MASTER_COLUMNS, fill_value="").fillna("")
 
-    # 11) Sync collection sites
-    db = SessionLocal()
-    existing = {sid for (sid,) in db.query(CollectionSite.Collection_Site_ID).all()}
-    db.close()
-    site_df      = batch[["Collection_Site","Collection_Site_ID"]].drop_duplicates()
-    full_map     = zoho_client.sync_collection_sites(site_df)
-    created      = set(full_map) - existing
-    logger.info("Created %d new collection sites", len(created))
-
-    # 12) Push complete → Zoho + record uploads
-    if not complete_df.empty:
-        recs      = complete_df.to_dict(orient="records")
-        successes = zoho_client.push_records(recs)
-        logger.info("Zoho accepted %d/%d complete records", len(successes), len(recs))
-
-        db = SessionLocal()
-        now = datetime.utcnow()
-        for c in successes:
-            db.merge(UploadedCCFID(ccfid=c, uploaded_timestamp=now))
-        db.commit()
-        db.close()
-
-    # 13) Stage new incomplete rows
-    if not new_staging.empty:
-        FIELD_MAP = {
-            "CCFID":              "ccfid",
-            "First_Name":         "first_name",
-            "Last_Name":          "last_name",
-            "Primary_ID":         "primary_id",
-            "Company":            "company_name",
-            "Code":               "company_code",
-            "Collection_Date":    "collection_date",
-            "MRO_Received":       "mro_received",
-            "Collection_Site":    "collection_site",
-            "Collection_Site_ID": "collection_site_id",
-            "Laboratory":         "laboratory",
-            "Location":           "location",
-            "Test_Reason":        "test_reason",
-            "Test_Result":        "test_result",
-            "Test_Type":          "test_type",
-            "Regulation":         "regulation",
-            "Panel":              "panel",
-        }
-        now    = datetime.utcnow()
-        mapped = []
-        for rec in new_staging.to_dict(orient="records"):
-            row = {}
-            for src, tgt in FIELD_MAP.items():
-                v = rec.get(src)
-                if tgt in ("collection_date","mro_received"):
-                    parsed = None
-                    if isinstance(v, str) and v.strip():
-                        for fmt in ("%Y-%m-%d","%m/%d/%Y"):
-                            try:
-                                parsed = datetime.strptime(v, fmt).date()
-                                break
-                            except ValueError:
-                                continue
-                    row[tgt] = parsed
-                else:
-                    row[tgt] = "" if pd.isna(v) else str(v)
-            row["reviewed"]           = False
-            row["uploaded_timestamp"] = now
-            mapped.append(row)
-
-        db = SessionLocal()
-        db.bulk_insert_mappings(WorklistStaging, mapped)
-        db.commit()
-        db.close()
-
-    return (
-        complete_df.to_dict(orient="records"),
-        new_staging.to_dict(orient="records"),
-    )
+def normalize_escreen(
+    source: Union[str, pd.DataFrame],
+    download_dir: str = ".",
+    dry_run: bool = False,
+    lean: bool = False,
+) -> tuple[list[dict], list[dict]] | LoadSummary:
+    """
+    source: either a raw eScreen DataFrame or an XLSX file path.
+    download_dir: where eScreen drops its XLSX and where we convert→CSV.
+    dry_run: map & split only; skip site sync, Zoho push and staging insert.
+    lean: return a LoadSummary of counts instead of record lists.
+    Returns: (complete_records, new_staging_records)
+    """
+    if isinstance(source, str):
+        df = load_escreen_export(source, download_dir)
+    else:
+        df = source
+    normalized = parallel_transform(transform_escreen, df, RAW_CCFID_COLUMNS)
+    if not dry_run:
+        aliases.save_learned_aliases()
+    return load_batch(normalized, ESCREEN_STAGING_FIELDS, dry_run=dry_run, lean=lean, source="escreen")
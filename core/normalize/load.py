@@ -0,0 +1,268 @@
+# core/normalize/load.py
+"""
+Load stage shared by all three normalizers: takes a MASTER_COLUMNS frame
+from a source's transform step and dedupes it, splits complete/incomplete,
+syncs collection sites, stages incompletes and queues completes in the
+Zoho outbox (one transaction), then drains the outbox to Zoho.
+"""
+
+import logging
+from datetime import datetime
+from typing   import NamedTuple
+
+import pandas as pd
+
+from core.config           import ZOHO_BULK_WRITE_THRESHOLD
+from core.db               import outbox
+from core.db.models        import WorklistStaging
+from core.db.session       import SessionLocal, engine
+from core.helpers          import complete_mask, fetch_existing_ccfids
+from core.services.zoho    import zoho_client
+
+logger = logging.getLogger(__name__)
+
+# MASTER_COLUMNS name → worklist_staging column
+STAGING_FIELD_MAP = {
+    "CCFID":              "ccfid",
+    "First_Name":         "first_name",
+    "Last_Name":          "last_name",
+    "Primary_ID":         "primary_id",
+    "Company":            "company_name",
+    "Code":               "company_code",
+    "Collection_Date":    "collection_date",
+    "MRO_Received":       "mro_received",
+    "Collection_Site":    "collection_site",
+    "Collection_Site_ID": "collection_site_id",
+    "Laboratory":         "laboratory",
+    "Panel":              "panel",
+    "Location":           "location",
+    "Test_Reason":        "test_reason",
+    "Test_Result":        "test_result",
+    "Test_Type":          "test_type",
+    "Regulation":         "regulation",
+    "Regulation_Body":    "regulation_body",
+    "BAT_Value":          "bat_value",
+}
+
+
+class LoadSummary(NamedTuple):
+    """What `load_batch(lean=True)` returns instead of record lists."""
+    complete: int
+    staged:   int
+    pushed:   int     # sent from the outbox by this call, earlier backlog included
+
+
+def split_batch(
+    result: pd.DataFrame,
+    uploaded_set: set | None = None,
+    staged_set: set | None = None,
+    queued: dict | None = None,
+    source: str | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    """
+    Drop CCFIDs already uploaded, or waiting in the outbox from a source
+    `source` doesn't outrank; dedupe in-batch and split.
+    Returns (batch, complete_df, staging_new_df).
+    """
+    # Zoho (so uploaded_ccfid) and the outbox hold the CCFID stripped;
+    # staging holds it as exported, so look both forms up
+    key = result["CCFID"].fillna("").astype(str).str.strip()
+    if uploaded_set is None or staged_set is None:
+        uploaded_set, staged_set = fetch_existing_ccfids(pd.concat([result["CCFID"], key]))
+    if queued is None:
+        queued = outbox.queued(key)
+    held = {c for c, owner in queued.items() if outbox.rank(source) >= outbox.rank(owner)}
+
+    # # include all records, even those already uploaded (for testing)
+    # batch = result.copy()
+
+    batch = result.loc[~key.isin(uploaded_set | held)]
+    batch = batch.drop_duplicates(subset=["CCFID"]).reset_index(drop=True)
+    logger.info("Deduplication Yield: %d records", len(batch))
+
+    mask        = complete_mask(batch)
+    complete_df = batch[mask]
+    staging_df  = batch[~mask]
+    logger.info("%d complete, %d incomplete records", len(complete_df), len(staging_df))
+
+    staging_new_df = staging_df.loc[~staging_df["CCFID"].isin(staged_set)]
+    return batch, complete_df, staging_new_df
+
+
+def sync_sites(batch: pd.DataFrame) -> None:
+    """Create any collection sites in the batch that Zoho doesn't have yet."""
+    site_df = batch[["Collection_Site", "Collection_Site_ID"]]
+    created = zoho_client.sync_collection_sites(site_df)
+    logger.info("Created %d new collection sites", len(created))
+
+
+def _parse_staging_date(val):
+    if isinstance(val, str) and val.strip():
+        for fmt in ("%Y-%m-%d", "%m/%d/%Y"):
+            try:
+                return datetime.strptime(val, fmt).date()
+            except ValueError:
+                continue
+    return None
+
+
+def stage_records(
+    staging_new_df: pd.DataFrame,
+    field_map: dict = STAGING_FIELD_MAP,
+    db=None,
+    source: str | None = None,
+) -> int:
+    """
+    Bulk-insert new incomplete rows from `source` into worklist_staging.
+    Given a session `db`, the rows join its transaction and the caller commits.
+    """
+    if staging_new_df.empty:
+        return 0
+
+    now    = datetime.utcnow()
+    mapped = []
+    for rec in staging_new_df.to_dict(orient="records"):
+        row = {}
+        for src, tgt in field_map.items():
+            val = rec.get(src)
+            if tgt in ("collection_date", "mro_received"):
+                row[tgt] = _parse_staging_date(val)
+            else:
+                row[tgt] = "" if pd.isna(val) else str(val)
+        row["reviewed"]           = False
+        row["uploaded_timestamp"] = now
+        row["source"]             = source
+        row["raw_company"]        = None if pd.isna(rec.get("Company")) else str(rec.get("Company"))
+        mapped.append(row)
+
+    if db is not None:
+        db.bulk_insert_mappings(WorklistStaging, mapped)
+        return len(mapped)
+
+    db = SessionLocal()
+    db.bulk_insert_mappings(WorklistStaging, mapped)
+    db.commit()
+    db.close()
+    return len(mapped)
+
+
+def push_complete(complete_df: pd.DataFrame) -> pd.Series:
+    """
+    Push complete rows to Zoho (successes are recorded in uploaded_ccfid).
+    The frame goes to the client as-is and is serialized once per request.
+    Batches of ZOHO_BULK_WRITE_THRESHOLD or more go through one Bulk Write
+    job instead of dozens of 100-record calls. Returns, aligned with
+    `complete_df`, whether Zoho now holds each row.
+    """
+    if complete_df.empty:
+        return pd.Series(False, index=complete_df.index)
+    if len(complete_df) >= ZOHO_BULK_WRITE_THRESHOLD:
+        outcome = zoho_client.send_frame_bulk(complete_df)
+    else:
+        outcome = zoho_client.send_frame(complete_df)
+    accepted = pd.Series([k != "failed" for k in outcome["kinds"]], index=complete_df.index)
+    logger.info("Zoho accepted %d/%d complete records", int(accepted.sum()), len(complete_df))
+    return accepted
+
+
+def drain_outbox(max_batches: int | None = None) -> list[str]:
+    """
+    Send due outbox rows to Zoho, OUTBOX_DRAIN_BATCH at a time (so a
+    backlog goes out as Bulk Write jobs), until none are due. Accepted rows
+    leave the outbox; rejected ones, and a whole batch Zoho couldn't take
+    (outage, quota), are retried after a backoff. A row rejected
+    OUTBOX_MAX_ATTEMPTS times moves to worklist_staging for a reviewer to
+    fix and send. Returns the CCFIDs sent.
+    """
+    sent, batches = [], 0
+    while max_batches is None or batches < max_batches:
+        with engine.begin() as conn:
+            claimed = outbox.claim(conn)
+        if claimed.empty:
+            break
+        batches += 1
+
+        # Sent by an earlier drain whose ack never landed, or by hand
+        uploaded, _ = fetch_existing_ccfids(claimed["CCFID"])
+        done = claimed["CCFID"].isin(uploaded)
+        try:
+            # By position, not by CCFID: what Zoho echoes back as Name is
+            # normalized and needn't match the stored key
+            accepted = push_complete(claimed.loc[~done])
+        except Exception as exc:
+            logger.exception("Zoho push of %d outbox records failed; backing off", int((~done).sum()))
+            with engine.begin() as conn:
+                outbox.ack(conn, claimed.loc[done, "CCFID"])
+                outbox.retry(conn, claimed.loc[~done, "CCFID"], repr(exc))
+            break
+
+        ok = done | accepted.reindex(claimed.index, fill_value=False)
+        with SessionLocal() as db:
+            conn = db.connection()
+            outbox.ack(conn, claimed.loc[ok, "CCFID"])
+            outbox.retry(conn, claimed.loc[~ok, "CCFID"], "rejected by Zoho", rejected=True)
+            # Given up on: staged in the same transaction that drops them
+            dead = outbox.dead_letters(conn)
+            if not dead.empty:
+                _, staged = fetch_existing_ccfids(dead["CCFID"])
+                dead = dead.loc[~dead["CCFID"].isin(staged)]
+                n = sum(
+                    stage_records(rows, STAGING_FIELD_MAP, db, source or None)
+                    for source, rows in dead.groupby(dead["source"].fillna(""))
+                )
+                logger.warning("Moved %d records Zoho keeps rejecting to the worklist", n)
+            db.commit()
+        sent.extend(claimed.loc[ok, "CCFID"])
+
+    waiting, oldest = outbox.backlog()
+    if waiting:
+        logger.warning("%d complete records still in the Zoho outbox (oldest queued %s)", waiting, oldest)
+    return sent
+
+
+def stage_batch(
+    result: pd.DataFrame,
+    field_map: dict = STAGING_FIELD_MAP,
+    dry_run: bool = False,
+    source: str | None = None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Everything in the load stage except the Zoho push: split, sync sites,
+    stage incompletes and queue completes in the outbox. Returns
+    (complete_df, staging_new_df); complete_df is the pending push set.
+    `source` (crl/i3/escreen) decides which queued rows it may replace.
+    """
+    batch, complete_df, staging_new_df = split_batch(result, source=source)
+    if dry_run:
+        logger.info("Dry run: skipping site sync, Zoho push and staging insert")
+        return complete_df, staging_new_df
+
+    sync_sites(batch)
+    # Staged rows and queued completes commit together: from here on the
+    # completes reach Zoho through the outbox, whatever happens to this run
+    with SessionLocal() as db:
+        stage_records(staging_new_df, field_map, db, source)
+        outbox.enqueue(db.connection(), complete_df, source)
+        db.commit()
+    return complete_df, staging_new_df
+
+
+def load_batch(
+    result: pd.DataFrame,
+    field_map: dict = STAGING_FIELD_MAP,
+    dry_run: bool = False,
+    lean: bool = False,
+    source: str | None = None,
+) -> tuple[list[dict], list[dict]] | LoadSummary:
+    """
+    Full load stage. Returns (complete_records, new_staging_records), or
+    with lean=True just the counts, skipping the per-record dicts.
+    """
+    complete_df, staging_new_df = stage_batch(result, field_map, dry_run, source)
+    pushed = [] if dry_run else drain_outbox()
+    if lean:
+        return LoadSummary(len(complete_df), len(staging_new_df), len(pushed))
+    return (
+        complete_df.to_dict(orient="records"),
+        staging_new_df.to_dict(orient="records"),
+    )
@@ -0,0 +1,79 @@
+# core/normalize/parallel.py
+"""
+Run a source's pure transform across a process pool.
+
+The raw frame is hash-partitioned on its CCFID column(s), so every row for
+a CCFID lands in the same partition, and each partition goes through the
+transform in its own process. The transforms are row-wise, so concatenating
+the partitions and putting rows back in their original order gives the same
+frame the serial transform would. Small frames (and NORMALIZE_WORKERS=1)
+just run serially.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from core.config         import NORMALIZE_PARALLEL_MIN_ROWS, NORMALIZE_WORKERS
+from core.normalize      import aliases
+
+logger = logging.getLogger(__name__)
+
+
+def partition_labels(raw: pd.DataFrame, key_columns, n: int) -> np.ndarray:
+    """Partition number per row, from the first non-blank of `key_columns`."""
+    key = None
+    for col in key_columns:
+        if col in raw.columns:
+            vals = raw[col].astype(object).where(raw[col].notna() & (raw[col].astype(str).str.strip() != ""))
+            key  = vals if key is None else key.combine_first(vals)
+    if key is None:
+        logger.warning("No CCFID column among %s; partitioning by row", list(key_columns))
+        return np.arange(len(raw)) % n
+    hashes = pd.util.hash_pandas_object(key.fillna("").astype(str), index=False).to_numpy()
+    return (hashes % n).astype(int)
+
+
+def _run_partition(transform, part: pd.DataFrame):
+    # Fuzzy matches learned in this process go back to the parent to be saved
+    out = transform(part)
+    return out, aliases.pop_learned()
+
+
+def parallel_transform(
+    transform,
+    raw: pd.DataFrame,
+    key_columns=(),
+    workers: int = NORMALIZE_WORKERS,
+    min_rows: int = NORMALIZE_PARALLEL_MIN_ROWS,
+) -> pd.DataFrame:
+    """
+    `transform(raw)`, split over `workers` processes when `raw` has at least
+    `min_rows` rows. `transform` must be a module-level (picklable) function.
+    """
+    if workers <= 1 or len(raw) < min_rows:
+        return transform(raw)
+
+    orig_index = raw.index
+    raw        = raw.reset_index(drop=True)
+    labels     = partition_labels(raw, key_columns, workers)
+    parts      = [raw[labels == i] for i in range(workers)]
+    parts      = [p for p in parts if not p.empty]
+    logger.info(
+        "%s: %d rows over %d processes (%s)", transform.__name__, len(raw), len(parts),
+        ", ".join(str(len(p)) for p in parts),
+    )
+
+    # spawn, not fork: the parent may hold DB connections and browser threads
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=len(parts), mp_context=ctx) as pool:
+        results = list(pool.map(_run_partition, [transform] * len(parts), parts))
+
+    for _, learned in results:
+        aliases.add_learned(learned)
+    out = pd.concat([frame for frame, _ in results]).sort_index(kind="stable")
+    out.index = orig_index[out.index]
+    return out
@@ -0,0 +1,195 @@
+# core/normalize/schemas.py
+
+import csv
+import logging
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# --- Column kinds ---
+# CATEGORY: low-cardinality labels, loaded as pandas categoricals
+# STRING:   free text / IDs / dates, always kept as raw text (never inferred)
+# INFER:    let the reader infer a numeric type
+CATEGORY = "category"
+STRING   = "string"
+INFER    = None
+
+# Same NA markers pandas' default C reader uses, so both engines agree
+NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+
+# --- Per-source schemas: only the columns each normalizer reads ---
+CRL_SCHEMA = {
+    "Status":               CATEGORY,
+    "Name":                 STRING,
+    "Reference ID":         STRING,
+    "Type":                 CATEGORY,
+    "Authorized ID":        STRING,
+    "CCF Donor ID":         STRING,
+    "Company Name":         STRING,
+    "Company":              STRING,
+    "Company Code":         STRING,
+    "Collection Date":      STRING,
+    "Reviewed Date":        STRING,
+    "MRO Result":           CATEGORY,
+    "Regulated":            CATEGORY,
+    "Regulatory Mode":      CATEGORY,
+    "Alcohol Screen value": INFER,
+    "Service":              CATEGORY,
+    "Reason":               CATEGORY,
+    "Lab Panel":            STRING,
+    "Lab Code":             CATEGORY,
+    "Site Name":            STRING,
+    "Site ID":              STRING,
+}
+
+I3_SCHEMA = {
+    "CCF / Test Number":    STRING,
+    "First Name":           STRING,
+    "Last Name":            STRING,
+    "SSN/EID":              STRING,
+    "Customer":             STRING,
+    "Org ID":               INFER,
+    "Collection Date/Time": STRING,
+    "Report Date":          STRING,
+    "Reason For Test":      CATEGORY,
+    "MRO Result":           CATEGORY,
+    "Specimen Type":        CATEGORY,
+    "Lab":                  CATEGORY,
+    "Panel":                STRING,
+    "Program Description":  CATEGORY,
+    "Agency":               CATEGORY,
+    "Collection Site":      STRING,
+    "Collection Site ID":   STRING,
+    "Location":             STRING,
+}
+
+# eScreen headers vary between exports, so every alias find_col accepts is listed
+ESCREEN_SCHEMA = {
+    "Donor Name":                   STRING,
+    "DonorName":                    STRING,
+    "Client":                       STRING,
+    "Company":                      STRING,
+    "Employer":                     STRING,
+    "Cost Center":                  STRING,
+    "CostCenter":                   STRING,
+    "COC":                          STRING,
+    "CCFID":                        STRING,
+    "Test Number":                  STRING,
+    "SSN":                          STRING,
+    "Donor SSN":                    STRING,
+    "Reason":                       CATEGORY,
+    "Result":                       CATEGORY,
+    "Regulation":                   CATEGORY,
+    "Test Type":                    CATEGORY,
+    "Collection Date/Time":         STRING,
+    "Collection Date":              STRING,
+    "Final Verification Date/Time": STRING,
+    "MRO_Received":                 STRING,
+    "BA Quant":                     STRING,
+    "baValue":                      STRING,
+}
+
+
+def _read_header(path: str, header: int) -> tuple[list[str], int]:
+    """
+    The header row (row `header` as csv.reader counts, blank lines included)
+    and how many physical lines come before it. Both readers skip by that
+    line count, since pandas' header= would count only non-blank lines.
+    """
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        reader = csv.reader(f)
+        before = 0
+        for i, row in enumerate(reader):
+            if i == header:
+                return row, before
+            before = reader.line_num
+    return [], before
+
+
+def _resolve_columns(header: list[str], schema: dict) -> dict[str, str | None]:
+    """Map the file's actual header names → schema kind (case/space-insensitive)."""
+    wanted = {name.strip().lower(): kind for name, kind in schema.items()}
+    return {
+        col: wanted[col.strip().lower()]
+        for col in header
+        if col.strip().lower() in wanted
+    }
+
+
+def _read_arrow(path: str, skip: int, columns: dict) -> pd.DataFrame:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    types = {}
+    for col, kind in columns.items():
+        if kind == CATEGORY:
+            types[col] = pa.dictionary(pa.int32(), pa.string())
+        elif kind == STRING:
+            types[col] = pa.string()
+
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(skip_rows=skip),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=list(columns),
+            column_types=types,
+            null_values=NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+    df = table.to_pandas()
+
+    # Arrow hands back None for missing text; the rest of the pipeline expects NaN
+    for col, kind in columns.items():
+        if kind == STRING:
+            df[col] = df[col].where(df[col].notna(), np.nan)
+    return df
+
+
+def _read_pandas(path: str, skip: int, columns: dict) -> pd.DataFrame:
+    dtype = {
+        col: (str if kind == STRING else kind)
+        for col, kind in columns.items()
+        if kind is not None
+    }
+    return pd.read_csv(path, skiprows=skip, header=0, usecols=list(columns), dtype=dtype)
+
+
+def read_export(path: str, schema: dict, header: int = 0) -> pd.DataFrame:
+    """
+    Load a source export with the given column schema.
+    Only the schema's columns are read; low-cardinality ones come back as
+    categoricals. Uses the Arrow CSV reader, falling back to pandas' C reader
+    if pyarrow is missing or can't parse the file (e.g. ragged footer rows).
+    `header` is the header's row index as csv.reader counts it (what
+    find_escreen_header_row returns), blank lines above it included.
+
+    ID columns (CCFIDs, company codes, site IDs) are STRING, not inferred:
+    "00123" stays "00123" and a column with blanks never turns into floats
+    ("123.0"), so values compare and join as the source wrote them.
+    """
+    header_row, skip = _read_header(path, header)
+    columns = _resolve_columns(header_row, schema)
+    if not columns:
+        raise KeyError(f"None of the expected columns found in {path}")
+
+    try:
+        df = _read_arrow(path, skip, columns)
+    except ImportError:
+        df = _read_pandas(path, skip, columns)
+    except Exception as e:
+        logger.warning("Arrow CSV reader failed on %s (%s); using pandas", path, e)
+        df = _read_pandas(path, skip, columns)
+
+    logger.info(
+        "Loaded %d rows × %d columns from %s (%.1f KiB)",
+        len(df), len(df.columns), path,
+        df.memory_usage(deep=True).sum() / 1024,
+    )
+    return df
@@ -0,0 +1,150 @@
+# core/scrapers/backfill.py
+"""
+Backfill scraping: split a date range into windows and download them in
+parallel.
+
+Each worker thread runs its own Playwright instance, browser and context
+(the sync API can't be shared across threads), logs in once and then takes
+windows off a shared queue. Frames are handed back through a result queue,
+so the caller can normalize each window while the others are still
+downloading.
+"""
+
+import logging
+import os
+import queue
+import threading
+from datetime import date, timedelta
+
+from playwright.sync_api import sync_playwright
+
+from core.config import BACKFILL_WINDOW_DAYS, BACKFILL_WORKERS
+from core.normalize.schemas import CRL_SCHEMA, I3_SCHEMA, read_export
+from core.scrapers import crl, i3
+from core.scrapers.browser import StepTimer, new_context
+
+logger = logging.getLogger(__name__)
+
+# source → (log in & open report, export one window, schema)
+BACKFILL_SOURCES = {
+    "crl": (crl.open_summary_report,    crl.export_summary_report,    CRL_SCHEMA),
+    "i3":  (i3.open_completed_results,  i3.export_completed_results,  I3_SCHEMA),
+}
+
+BACKFILL_DIR = os.path.join(os.path.dirname(__file__), os.pardir, "downloads", "backfill")
+
+_DONE = object()
+
+
+def date_windows(start: date, end: date, days: int = BACKFILL_WINDOW_DAYS) -> list[tuple[date, date]]:
+    """Inclusive, non-overlapping (start, end) windows covering start..end."""
+    windows = []
+    while start <= end:
+        stop = min(start + timedelta(days=days - 1), end)
+        windows.append((start, stop))
+        start = stop + timedelta(days=1)
+    return windows
+
+
+def _worker(source: str, todo: queue.Queue, results: queue.Queue) -> None:
+    open_report, export_window, schema = BACKFILL_SOURCES[source]
+    try:
+        with sync_playwright() as pw:
+            timer   = StepTimer(f"{source} backfill")
+            browser = pw.chromium.launch(headless=True)
+            context = new_context(browser)
+            page    = context.new_page()
+            open_report(page, timer)
+
+            while True:
+                try:
+                    window = todo.get_nowait()
+                except queue.Empty:
+                    break
+                start, end = window
+                dest = os.path.join(BACKFILL_DIR, f"{source}_{start:%Y%m%d}_{end:%Y%m%d}.csv")
+                reported = False
+                try:
+                    for attempt in (1, 2):
+                        try:
+                            export_window(page, dest, window, timer)
+                            results.put((window, read_export(dest, schema)))
+                            reported = True
+                            break
+                        except Exception as exc:
+                            logger.exception("[%s] window %s – %s failed (attempt %d)", source, start, end, attempt)
+                            if attempt == 2:
+                                results.put((window, exc))
+                                reported = True
+                            # Retry / carry on from a clean report page
+                            open_report(page, timer)
+                except Exception:
+                    # Couldn't get back to the report page, so this worker is done.
+                    # Hand its window back: another worker takes it, or backfill()
+                    # reports it failed once every worker has exited
+                    if not reported:
+                        todo.put(window)
+                    raise
+
+            context.close()
+            browser.close()
+            timer.report()
+    except Exception:
+        logger.exception("[%s] backfill worker died", source)
+    finally:
+        results.put(_DONE)
+
+
+def backfill(
+    source: str,
+    start: date,
+    end: date,
+    window_days: int = BACKFILL_WINDOW_DAYS,
+    workers: int = BACKFILL_WORKERS,
+):
+    """
+    Download `source` for start..end in parallel windows and yield
+    ((start, end), raw_df) in completion order. A window that fails is
+    retried once from a fresh report page; any still missing at the end
+    raise RuntimeError after everything else has been yielded.
+    """
+    if source not in BACKFILL_SOURCES:
+        raise ValueError(f"Backfill not supported for {source!r}; expected one of {tuple(BACKFILL_SOURCES)}")
+    os.makedirs(BACKFILL_DIR, exist_ok=True)
+
+    windows = date_windows(start, end, window_days)
+    todo    = queue.Queue()
+    for w in windows:
+        todo.put(w)
+    results = queue.Queue()
+
+    workers = max(1, min(workers, len(windows)))
+    logger.info("[%s] Backfilling %s – %s: %d windows over %d workers", source, start, end, len(windows), workers)
+    threads = [
+        threading.Thread(target=_worker, args=(source, todo, results), name=f"backfill-{source}-{i}", daemon=True)
+        for i in range(workers)
+    ]
+    for t in threads:
+        t.start()
+
+    done, failed = 0, []
+    while done < len(threads):
+        item = results.get()
+        if item is _DONE:
+            done += 1
+            continue
+        window, frame = item
+        if isinstance(frame, Exception):
+            failed.append(window)
+            continue
+        logger.info("[%s] window %s – %s: %d rows", source, *window, len(frame))
+        yield window, frame
+
+    # Anything still queued was never picked up (all workers died)
+    while not todo.empty():
+        failed.append(todo.get_nowait())
+    if failed:
+        raise RuntimeError(
+            f"{source} backfill incomplete; failed windows: "
+            + ", ".join(f"{s} – {e}" for s, e in sorted(failed))
+        )
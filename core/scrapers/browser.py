@@ -0,0 +1,151 @@
+# core/scrapers/browser.py
+"""
+Shared Playwright plumbing for the portal scrapers.
+
+Fast mode (SCRAPE_FAST) routes away images, fonts, media and analytics
+beacons, and `settle` waits for the element or URL the next step needs
+instead of network idle. StepTimer records how long each portal step takes
+and appends one line per scrape to SCRAPE_TIMINGS_PATH.
+"""
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from playwright.sync_api import sync_playwright
+
+from core.config import SCRAPE_FAST, SCRAPE_TIMINGS_PATH
+
+logger = logging.getLogger(__name__)
+
+BLOCKED_RESOURCE_TYPES = {"image", "font", "media"}
+BLOCKED_URL_PARTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "hotjar.com",
+    "facebook.net",
+    "nr-data.net",
+    "newrelic.com",
+)
+
+
+def _block_unneeded(route):
+    req = route.request
+    if req.resource_type in BLOCKED_RESOURCE_TYPES or any(p in req.url for p in BLOCKED_URL_PARTS):
+        return route.abort()
+    return route.continue_()
+
+
+def new_context(browser, fast: bool = SCRAPE_FAST):
+    """Download-enabled context; in fast mode, unneeded resources are blocked."""
+    context = browser.new_context(accept_downloads=True)
+    if fast:
+        context.route("**/*", _block_unneeded)
+    return context
+
+
+@contextmanager
+def browser_session(browser=None):
+    """Yield `browser` if given (e.g. a WarmBrowser's), else launch one for this block."""
+    if browser is not None:
+        yield browser
+        return
+    with sync_playwright() as pw:
+        browser = pw.chromium.launch(headless=True)
+        try:
+            yield browser
+        finally:
+            browser.close()
+
+
+class WarmBrowser:
+    """
+    One Chromium kept running between scrapes, for long-lived processes.
+    Playwright's sync API is thread-bound: use it from a single thread.
+    """
+    def __init__(self):
+        self._pw      = None
+        self._browser = None
+
+    def get(self):
+        """The running browser, relaunched if it has died."""
+        if self._browser is None or not self._browser.is_connected():
+            self.close()
+            self._pw      = sync_playwright().start()
+            self._browser = self._pw.chromium.launch(headless=True)
+            logger.info("Launched warm browser")
+        return self._browser
+
+    def close(self) -> None:
+        if self._browser is not None:
+            try:
+                self._browser.close()
+            except Exception:
+                pass
+        if self._pw is not None:
+            self._pw.stop()
+        self._pw, self._browser = None, None
+
+
+def settle(page, fast: bool = SCRAPE_FAST, locator=None, url: str | None = None, timeout: int = 30000) -> None:
+    """
+    Wait for the page to be ready for the next step: network idle in normal
+    mode; in fast mode, just the `url` and/or `locator` that step needs.
+    """
+    if not fast or (locator is None and url is None):
+        page.wait_for_load_state("networkidle", timeout=timeout)
+        return
+    if url is not None:
+        page.wait_for_url(url, timeout=timeout)
+    if locator is not None:
+        locator.first.wait_for(state="visible", timeout=timeout)
+
+
+class StepTimer:
+    def __init__(self, source: str, fast: bool = SCRAPE_FAST):
+        self.source = source
+        self.fast   = fast
+        self.steps  = []        # (label, seconds)
+        self._t0    = time.perf_counter()
+
+    @contextmanager
+    def step(self, label: str):
+        t0 = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.steps.append((label, time.perf_counter() - t0))
+
+    @property
+    def total(self) -> float:
+        return time.perf_counter() - self._t0
+
+    def report(self, path: str | None = SCRAPE_TIMINGS_PATH) -> None:
+        """Log the breakdown (slowest step first) and append it to `path`."""
+        total = self.total
+        mode  = "fast" if self.fast else "normal"
+
+        # Repeated steps (e.g. one export per backfill window) are summed
+        by_label = {}
+        for label, secs in self.steps:
+            by_label[label] = by_label.get(label, 0.0) + secs
+        ranked = sorted(by_label.items(), key=lambda s: s[1], reverse=True)
+        logger.info(
+            "%s scrape (%s) took %.1fs: %s", self.source, mode, total,
+            ", ".join(f"{label} {secs:.1f}s" for label, secs in ranked),
+        )
+        if not path:
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps({
+                "source": self.source,
+                "mode":   mode,
+                "at":     datetime.now().isoformat(timespec="seconds"),
+                "total":  round(total, 2),
+                "steps":  {label: round(secs, 2) for label, secs in by_label.items()},
+            }) + "\n")
@@ -1,10 +1,21 @@
 import logging
 import os
+from contextlib import ExitStack
+from datetime import date
 
 import pandas as pd
-from playwright.sync_api import sync_playwright
 
-from core.config import CRL_PASS, CRL_USER
+from core.config import (
+    CRL_CUSTOM_RANGE_OPTION,
+    CRL_END_DATE_INPUT,
+    CRL_PASS,
+    CRL_START_DATE_INPUT,
+    CRL_USER,
+    SCRAPE_FAST,
+)
+from core.normalize.schemas import CRL_SCHEMA, read_export
+from core.scrapers import http_export
+from core.scrapers.browser import StepTimer, browser_session, new_context, settle
 
 logger = logging.getLogger(__name__)
 
@@ -13,29 +24,35 @@ os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 CRL_CSV_PATH = os.path.join(DOWNLOAD_DIR, "crl_summary_report.csv")
 
 
-def scrape_crl() -> pd.DataFrame:
-    
-    logger.info("Starting CRL scrape...")
+# Custom range controls on the Summary Report, for windowed exports. Not
+# confirmed against the portal yet: override them in the environment.
+CUSTOM_RANGE_OPTION = CRL_CUSTOM_RANGE_OPTION
+START_DATE_INPUT    = CRL_START_DATE_INPUT
+END_DATE_INPUT      = CRL_END_DATE_INPUT
 
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=True)
-        context = browser.new_context(accept_downloads=True)
-        page = context.new_page()
 
-        # Navigate to login page
-        logger.info("Navigating to CRL login page...")
+def login(page, timer: StepTimer | None = None, fast: bool = SCRAPE_FAST) -> None:
+    """Log in; leaves the page on Orders."""
+    timer = timer or StepTimer("crl", fast)
+
+    # Navigate to login page
+    logger.info("Navigating to CRL login page...")
+    with timer.step("login page"):
         page.goto(
-            "https://fortiersubstabusetstng.workforce.crlcorp.com/clinicportal/ng/#/"
+            "https://fortiersubstabusetstng.workforce.crlcorp.com/clinicportal/ng/#/",
+            wait_until="domcontentloaded" if fast else "load",
         )
 
-        # Perform login
-        logger.info("Filling in credentials for %s", CRL_USER)
+    # Perform login
+    logger.info("Filling in credentials for %s", CRL_USER)
+    with timer.step("login"):
         page.locator("#formBasicEmail").fill(CRL_USER)
         page.locator("#formBasicPassword").fill(CRL_PASS)
 
-        # Debug buttons
-        buttons = page.locator("button").all_inner_texts()
-        logger.info("Login page buttons: %s", buttons)
+        if not fast:
+            # Debug buttons
+            buttons = page.locator("button").all_inner_texts()
+            logger.info("Login page buttons: %s", buttons)
 
         # Now click the actual login button
         page.get_by_role("button", name="Log In", exact=True).click()
@@ -44,46 +61,104 @@ def scrape_crl() -> pd.DataFrame:
         logger.info("Waiting for dashboard to load...")
         page.wait_for_url("**/clinicportal/ng/#/orders", timeout=30000)
 
-        # Navigate to Orders
-        logger.info("Navigating to Orders page...")
-        page.goto(
-            "https://fortiersubstabusetstng.workforce.crlcorp.com/clinicportal/ng/#/orders"
-        )
 
-        # Open the Reports menu
-        logger.info("Clicking 'Reports'...")
+def open_summary_report(page, timer: StepTimer | None = None, fast: bool = SCRAPE_FAST) -> None:
+    """Log in and land on the Summary Report form."""
+    timer = timer or StepTimer("crl", fast)
+    login(page, timer, fast)
+
+    if not fast:
+        # Navigate to Orders (login already lands there)
+        logger.info("Navigating to Orders page...")
+        with timer.step("orders page"):
+            page.goto(
+                "https://fortiersubstabusetstng.workforce.crlcorp.com/clinicportal/ng/#/orders"
+            )
+
+    # Open the Reports menu
+    logger.info("Clicking 'Reports'...")
+    with timer.step("reports menu"):
         page.get_by_role("button", name="Reports").click()
-        page.wait_for_load_state("networkidle")
+        settle(page, fast, locator=page.get_by_role("link", name="Summary Report", exact=True))
 
-        # Select Summary Report
-        logger.info("Clicking 'Summary Report'...")
+    # Select Summary Report
+    logger.info("Clicking 'Summary Report'...")
+    with timer.step("summary report"):
         page.get_by_role("link", name="Summary Report", exact=True).click()
-        page.wait_for_load_state("networkidle")
-
-        # Apply filters
-        logger.info("Selecting Event Date and Current Month filters...")
+        settle(page, fast, locator=page.locator("#date-type"))
+
+
+def export_summary_report(
+    page,
+    dest: str,
+    window: tuple[date, date] | None = None,
+    timer: StepTimer | None = None,
+) -> str:
+    """
+    Export the Summary Report by Event Date to `dest`: the current month,
+    or the inclusive (start, end) `window`. The window's range controls
+    are unverified settings (CRL_CUSTOM_RANGE_OPTION and friends).
+    """
+    timer = timer or StepTimer("crl")
+
+    logger.info("Selecting Event Date and %s filters...", "custom range" if window else "Current Month")
+    with timer.step("filters"):
         page.locator("#date-type").select_option("Event Date")
-        page.locator("#date-range").select_option("Current Month")
-
-        # Trigger CSV download
-        logger.info("Exporting CSV and waiting for download…")
+        if window is None:
+            page.locator("#date-range").select_option("Current Month")
+        else:
+            start, end = window
+            page.locator("#date-range").select_option(CUSTOM_RANGE_OPTION)
+            page.locator(START_DATE_INPUT).fill(start.strftime("%m/%d/%Y"))
+            page.locator(END_DATE_INPUT).fill(end.strftime("%m/%d/%Y"))
+
+    # Trigger CSV download
+    logger.info("Exporting CSV and waiting for download…")
+    with timer.step("export"):
         with page.expect_download() as dl_info:
             page.get_by_role("button", name="Export CSV").click()
         download = dl_info.value
 
         # **Save to the full-file path**, not the directory
-        download.save_as(CRL_CSV_PATH)
-        logger.info("Download complete: %s", CRL_CSV_PATH)
+        download.save_as(dest)
+    logger.info("Download complete: %s", dest)
+    return dest
 
-        context.close()
-        browser.close()
 
+def _load(timer: StepTimer) -> pd.DataFrame:
     logger.info("Loading CSV into DataFrame…")
-    df = pd.read_csv(CRL_CSV_PATH)
+    with timer.step("parse"):
+        df = read_export(CRL_CSV_PATH, CRL_SCHEMA)
     logger.info("CRL DataFrame contains %d rows", len(df))
+    timer.report()
     return df
 
 
+def scrape_crl(fast: bool = SCRAPE_FAST, browser=None) -> pd.DataFrame:
+    
+    logger.info("Starting CRL scrape...")
+    timer = StepTimer("crl", fast)
+
+    if http_export.available("crl"):
+        try:
+            http_export.fetch_export("crl", CRL_CSV_PATH, login, timer=timer, browser=browser)
+            return _load(timer)
+        except Exception:
+            logger.exception("Direct CRL export failed; falling back to the browser")
+
+    with ExitStack() as stack:
+        with timer.step("launch"):
+            browser = stack.enter_context(browser_session(browser))
+            context = new_context(browser, fast)
+            stack.callback(context.close)
+            page = context.new_page()
+
+        open_summary_report(page, timer, fast)
+        export_summary_report(page, CRL_CSV_PATH, timer=timer)
+
+    return _load(timer)
+
+
 if __name__ == "__main__":
     # Quick standalone test
     logging.basicConfig(level=logging.INFO)
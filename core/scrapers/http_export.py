@@ -0,0 +1,143 @@
+# core/scrapers/http_export.py
+"""
+Fetch portal exports over plain HTTP instead of clicking through menus.
+
+The browser is used only to log in. Its storage state (cookies, plus
+localStorage for token-based portals) is saved under SCRAPE_SESSION_DIR and
+turned into a pooled requests.Session, which calls the export endpoint
+directly and streams the CSV to disk. While the saved login is accepted, no
+browser is launched at all; when the portal rejects it, we log in again
+once and retry.
+"""
+
+import json
+import logging
+import os
+from contextlib import ExitStack
+from datetime import date
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from core.config import (
+    CRL_EXPORT_URL,
+    CRL_TOKEN_KEY,
+    I3_EXPORT_URL,
+    I3_TOKEN_KEY,
+    SCRAPE_SESSION_DIR,
+)
+from core.scrapers.browser import StepTimer, browser_session, new_context
+
+logger = logging.getLogger(__name__)
+
+# source → (export URL template, localStorage token key)
+EXPORTS = {
+    "crl": (CRL_EXPORT_URL, CRL_TOKEN_KEY),
+    "i3":  (I3_EXPORT_URL,  I3_TOKEN_KEY),
+}
+
+_sessions: dict[str, requests.Session] = {}
+
+
+class SessionExpired(Exception):
+    pass
+
+
+def available(source: str) -> bool:
+    return bool(EXPORTS.get(source, (None,))[0])
+
+
+def _state_path(source: str) -> str:
+    return os.path.join(SCRAPE_SESSION_DIR, f"{source}.json")
+
+
+def _browser_login(source: str, login, timer: StepTimer, browser=None) -> None:
+    """Log in with Playwright and save the context's storage state."""
+    os.makedirs(SCRAPE_SESSION_DIR, exist_ok=True)
+    with ExitStack() as stack:
+        with timer.step("launch"):
+            browser = stack.enter_context(browser_session(browser))
+            context = new_context(browser)
+            stack.callback(context.close)
+            page    = context.new_page()
+        login(page, timer)
+        context.storage_state(path=_state_path(source))
+    _sessions.pop(source, None)
+    logger.info("[%s] Saved browser login to %s", source, _state_path(source))
+
+
+def _session(source: str) -> requests.Session | None:
+    """Pooled session built from the saved login, or None if there isn't one."""
+    if source in _sessions:
+        return _sessions[source]
+    path = _state_path(source)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        state = json.load(f)
+
+    session = requests.Session()
+    session.mount("https://", HTTPAdapter(pool_connections=2, pool_maxsize=4, max_retries=2))
+    for c in state.get("cookies", []):
+        session.cookies.set(c["name"], c["value"], domain=c["domain"], path=c.get("path", "/"))
+
+    _, token_key = EXPORTS[source]
+    if token_key:
+        for origin in state.get("origins", []):
+            for item in origin.get("localStorage", []):
+                if item["name"] == token_key:
+                    session.headers["Authorization"] = f"Bearer {item['value'].strip(chr(34))}"
+
+    _sessions[source] = session
+    return session
+
+
+def _download(source: str, session: requests.Session, url: str, dest: str) -> str:
+    with session.get(url, stream=True, timeout=(10, 300)) as resp:
+        if resp.status_code in (401, 403) or "text/html" in resp.headers.get("Content-Type", ""):
+            # Expired logins bounce to the portal's HTML login page
+            raise SessionExpired(f"{source} export returned {resp.status_code} {resp.headers.get('Content-Type')}")
+        resp.raise_for_status()
+        tmp = dest + ".part"
+        with open(tmp, "wb") as f:
+            for chunk in resp.iter_content(chunk_size=1 << 16):
+                f.write(chunk)
+    os.replace(tmp, dest)
+    return dest
+
+
+def fetch_export(
+    source: str,
+    dest: str,
+    login,
+    window: tuple[date, date] | None = None,
+    timer: StepTimer | None = None,
+    browser=None,
+) -> str:
+    """
+    Download `source`'s export to `dest` over HTTP, calling the scraper's
+    `login(page, timer)` only if there's no accepted saved login. `window`
+    fills the URL's {start}/{end} placeholders; by default they cover the
+    current month, like the scrapers' "Current Month" filter.
+    """
+    template, _ = EXPORTS[source]
+    if not template:
+        raise RuntimeError(f"No export URL configured for {source}")
+    timer = timer or StepTimer(source)
+
+    if window is None:
+        today  = date.today()
+        window = (today.replace(day=1), today)
+    url = template.format(start=window[0].strftime("%m/%d/%Y"), end=window[1].strftime("%m/%d/%Y"))
+
+    session = _session(source)
+    if session is not None:
+        try:
+            with timer.step("export (http)"):
+                return _download(source, session, url, dest)
+        except SessionExpired as exc:
+            logger.info("[%s] Saved login rejected (%s); logging in again", source, exc)
+
+    _browser_login(source, login, timer, browser)
+    with timer.step("export (http)"):
+        return _download(source, _session(source), url, dest)
@@ -1,10 +1,22 @@
 import logging
 import os
+from contextlib import ExitStack
+from datetime import date
 
 import pandas as pd
-from playwright.sync_api import sync_playwright
 
-from core.config import I3_PASS, I3_USER
+from core.config import (
+    I3_FROM_DATE_INPUT,
+    I3_PASS,
+    I3_RESULTS_GRID,
+    I3_SEARCH_BUTTON,
+    I3_TO_DATE_INPUT,
+    I3_USER,
+    SCRAPE_FAST,
+)
+from core.normalize.schemas import I3_SCHEMA, read_export
+from core.scrapers import http_export
+from core.scrapers.browser import StepTimer, browser_session, new_context, settle
 
 logger = logging.getLogger(__name__)
 
@@ -13,60 +25,124 @@ os.makedirs(DOWNLOAD_DIR, exist_ok=True)
 I3_CSV_PATH = os.path.join(DOWNLOAD_DIR, "i3screen_export.csv")
 
 
-def scrape_i3() -> pd.DataFrame:
+# Date filter on the Completed Results search, for windowed exports. Not
+# confirmed against the portal yet: override them in the environment.
+FROM_DATE_INPUT = I3_FROM_DATE_INPUT
+TO_DATE_INPUT   = I3_TO_DATE_INPUT
+SEARCH_BUTTON   = I3_SEARCH_BUTTON
 
-    logger.info("Starting i3Screen scrape...")
 
-    with sync_playwright() as pw:
-        browser = pw.chromium.launch(headless=True)
-        context = browser.new_context(accept_downloads=True)
-        page = context.new_page()
+def login(page, timer: StepTimer | None = None, fast: bool = SCRAPE_FAST):
+    """Log in; returns the Occupational Health Screening menu item."""
+    timer = timer or StepTimer("i3", fast)
 
-        # Navigate to login page
-        logger.info("Navigating to i3Screen login page...")
-        page.goto("https://i3screen.net/login/")
+    # Navigate to login page
+    logger.info("Navigating to i3Screen login page...")
+    with timer.step("login page"):
+        page.goto("https://i3screen.net/login/", wait_until="domcontentloaded" if fast else "load")
 
-        # Perform login
-        logger.info("Filling in credentials for %s", I3_USER)
+    # Perform login
+    logger.info("Filling in credentials for %s", I3_USER)
+    with timer.step("login"):
         page.get_by_role("textbox", name="Username").fill(I3_USER)
         page.get_by_role("textbox", name="Password").fill(I3_PASS)
         page.get_by_role("button", name="Log In").click()
 
         # Wait for dashboard to load
         logger.info("Waiting for dashboard to load...")
-        page.wait_for_load_state("networkidle")
+        ohs_menu = page.get_by_role("listitem").filter(has_text="Occupational Health Screening")
+        settle(page, fast, locator=ohs_menu)
+    return ohs_menu
 
-        # Navigate to Occupational Health Screening
-        logger.info("Opening Occupational Health Screening section...")
-        page.get_by_role("listitem").filter(
-            has_text="Occupational Health Screening"
-        ).get_by_role("img").first.click()
 
-        # Go to Completed Results
-        logger.info("Clicking 'Completed Results'...")
-        page.get_by_role("link", name="Completed Results").click()
-        page.wait_for_load_state("networkidle")
+def open_completed_results(page, timer: StepTimer | None = None, fast: bool = SCRAPE_FAST) -> None:
+    """Log in and land on the Completed Results search."""
+    timer    = timer or StepTimer("i3", fast)
+    ohs_menu = login(page, timer, fast)
 
-        # Export CSV
-        logger.info("Triggering export...")
+    # Navigate to Occupational Health Screening
+    logger.info("Opening Occupational Health Screening section...")
+    with timer.step("screening menu"):
+        ohs_menu.get_by_role("img").first.click()
+
+    # Go to Completed Results
+    logger.info("Clicking 'Completed Results'...")
+    with timer.step("completed results"):
+        page.get_by_role("link", name="Completed Results").click()
+        # The results grid, not just the Export button: exporting before the
+        # default search has loaded would export an empty search
+        settle(page, fast, locator=page.locator(I3_RESULTS_GRID))
+
+
+def export_completed_results(
+    page,
+    dest: str,
+    window: tuple[date, date] | None = None,
+    timer: StepTimer | None = None,
+) -> str:
+    """
+    Export the current search to `dest`, first narrowing it to the
+    inclusive (start, end) `window` if one is given. The search controls
+    are unverified settings (I3_FROM_DATE_INPUT and friends).
+    """
+    timer = timer or StepTimer("i3")
+
+    if window is not None:
+        start, end = window
+        logger.info("Searching %s – %s...", start, end)
+        with timer.step("search"):
+            page.locator(FROM_DATE_INPUT).fill(start.strftime("%m/%d/%Y"))
+            page.locator(TO_DATE_INPUT).fill(end.strftime("%m/%d/%Y"))
+            page.get_by_role("button", name=SEARCH_BUTTON).click()
+            # No element marks "results refreshed", so this one stays on network idle
+            settle(page)
+
+    # Export CSV
+    logger.info("Triggering export...")
+    with timer.step("export"):
         page.get_by_role("button", name="Export").click()
         with page.expect_download() as download_info:
             page.get_by_role("link", name="Export Current Search").click()
         download = download_info.value
-        download.save_as(I3_CSV_PATH)
-        logger.info("Download complete: %s", I3_CSV_PATH)
+        download.save_as(dest)
+    logger.info("Download complete: %s", dest)
+    return dest
 
-        # Clean up
-        context.close()
-        browser.close()
 
-    # Load CSV into DataFrame
+def _load(timer: StepTimer) -> pd.DataFrame:
     logger.info("Loading CSV into DataFrame...")
-    df = pd.read_csv(I3_CSV_PATH)
+    with timer.step("parse"):
+        df = read_export(I3_CSV_PATH, I3_SCHEMA)
     logger.info("i3Screen DataFrame contains %d rows", len(df))
+    timer.report()
     return df
 
 
+def scrape_i3(fast: bool = SCRAPE_FAST, browser=None) -> pd.DataFrame:
+
+    logger.info("Starting i3Screen scrape...")
+    timer = StepTimer("i3", fast)
+
+    if http_export.available("i3"):
+        try:
+            http_export.fetch_export("i3", I3_CSV_PATH, login, timer=timer, browser=browser)
+            return _load(timer)
+        except Exception:
+            logger.exception("Direct i3Screen export failed; falling back to the browser")
+
+    with ExitStack() as stack:
+        with timer.step("launch"):
+            browser = stack.enter_context(browser_session(browser))
+            context = new_context(browser, fast)
+            stack.callback(context.close)
+            page = context.new_page()
+
+        open_completed_results(page, timer, fast)
+        export_completed_results(page, I3_CSV_PATH, timer=timer)
+
+    return _load(timer)
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     data = scrape_i3()
@@ -0,0 +1,20 @@
+"""
+Move reviewed and already-uploaded rows out of worklist_staging into the
+month-partitioned worklist_archive. The scheduler does this every
+SCHEDULE_ARCHIVE_MINUTES; use this to run it by hand.
+"""
+import argparse
+import logging
+
+from core.config     import STAGING_ARCHIVE_BATCH
+from core.db.staging import archive_staging
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--batch", type=int, default=STAGING_ARCHIVE_BATCH,
+                   help=f"rows moved per transaction (default {STAGING_ARCHIVE_BATCH})")
+    args = p.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    print(f"{archive_staging(args.batch)} rows archived")
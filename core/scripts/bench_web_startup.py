@@ -0,0 +1,54 @@
+"""
+Measure how long a fresh process takes to import the web app, and check
+that it boots without pandas or the normalizer stack. This is what a cold
+worker pays on boot (a preloaded gunicorn master pays it once; forked
+workers don't). Exits 1 if a heavy module is imported at boot, or if the
+median is over --budget.
+
+    python -m core.scripts.bench_web_startup --runs 10 --budget 1.0
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# Must not be imported just to boot the web app
+HEAVY = ("pandas", "numpy", "pyarrow", "rapidfuzz", "playwright", "core.normalize", "core.services.zoho")
+
+_PROBE = f"""
+import json, sys, time
+start = time.perf_counter()
+from webapp.wsgi import app
+seconds = time.perf_counter() - start
+heavy = sorted(m for m in sys.modules if m.split(".")[0] in {HEAVY!r} or m.startswith({HEAVY!r}))
+print(json.dumps({{"seconds": seconds, "heavy": heavy}}))
+"""
+
+
+def probe() -> dict:
+    out = subprocess.run([sys.executable, "-c", _PROBE], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--runs", type=int, default=5, help="fresh processes to time (default 5)")
+    p.add_argument("--budget", type=float, default=None, help="fail if the median is over this many seconds")
+    args = p.parse_args()
+
+    results = [probe() for _ in range(args.runs)]
+    times   = [r["seconds"] for r in results]
+    heavy   = sorted({m for r in results for m in r["heavy"]})
+
+    print(f"webapp import over {args.runs} runs: "
+          f"min {min(times):.3f}s, median {statistics.median(times):.3f}s, max {max(times):.3f}s")
+
+    failed = False
+    if heavy:
+        print(f"FAIL: heavy modules imported at boot: {', '.join(heavy)}")
+        failed = True
+    if args.budget is not None and statistics.median(times) > args.budget:
+        print(f"FAIL: median over the {args.budget:.3f}s budget")
+        failed = True
+    sys.exit(1 if failed else 0)
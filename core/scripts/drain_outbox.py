@@ -0,0 +1,22 @@
+"""
+Send the complete records waiting in the Zoho outbox. The scheduler does
+this every SCHEDULE_OUTBOX_MINUTES and every pipeline run drains it after
+loading; use this to push a backlog by hand once Zoho is back.
+"""
+import argparse
+import logging
+
+from core.db.outbox      import backlog
+from core.normalize.load import drain_outbox
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--max-batches", type=int, default=None,
+                   help="stop after this many OUTBOX_DRAIN_BATCH-row sends (default: until empty)")
+    args = p.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    sent = drain_outbox(args.max_batches)
+    waiting, oldest = backlog()
+    print(f"{len(sent)} records sent; {waiting} still queued" + (f" (oldest {oldest})" if waiting else ""))
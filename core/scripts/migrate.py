@@ -0,0 +1,14 @@
+"""
+Apply pending schema migrations (core/db/migrations). Run before starting
+the web app or scheduler after an upgrade; docker compose does this in its
+one-shot `migrate` service.
+"""
+import logging
+
+from core.db.migrate import migrate
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    applied = migrate()
+    print(f"Applied {len(applied)} migrations" + (f": {', '.join(applied)}" if applied else ""))
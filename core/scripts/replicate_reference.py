@@ -0,0 +1,26 @@
+"""
+Pull Accounts, Laboratories, Panels and Collection_Sites changes from Zoho
+into the local reference tables. The cron pipeline does this at the start
+of every run; use this to catch up by hand or, with --full, to rebuild
+from scratch (ignores the stored watermarks).
+"""
+import argparse
+import logging
+
+from core.services.reference import REFERENCE_MODULES, replicate_reference
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("modules", nargs="*", metavar="MODULE",
+                   help=f"any of {', '.join(REFERENCE_MODULES)} (default: all)")
+    p.add_argument("--full", action="store_true", help="Ignore watermarks; re-pull everything")
+    args = p.parse_args()
+    unknown = set(args.modules) - set(REFERENCE_MODULES)
+    if unknown:
+        p.error(f"unknown module(s): {', '.join(sorted(unknown))}")
+
+    logging.basicConfig(level=logging.INFO)
+    changed = replicate_reference(args.modules or None, full=args.full)
+    for module, n in changed.items():
+        print(f"{module}: {n} rows changed")
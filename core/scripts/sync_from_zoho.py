@@ -1,31 +1,56 @@
-from sqlalchemy import text
+"""
+Rebuild uploaded_ccfid from a full Zoho export.
 
-from core.db.session        import SessionLocal
+Only needed with ZOHO_PUSH_MODE=insert, where duplicate prevention relies
+on uploaded_ccfid being complete. In the default upsert mode pushes are
+keyed on Name (the CCFID) in Zoho itself, so drift in this table costs at
+most a redundant update and no pre-sync is required.
+
+Uses Zoho Bulk Read: one export job per 200k records, and each result CSV
+is COPYed straight into a temp table, then merged with ON CONFLICT DO
+NOTHING. CCFIDs never pass through Python.
+"""
+import csv
+import logging
+
+from core.db.session        import engine
 from core.services.zoho    import zoho_client
 
+logger = logging.getLogger(__name__)
 
-def sync_uploaded_ccfids():
-    db = SessionLocal()
-    # 1. Get all ccfids from Zoho
-    zoho_ccfids = set(
-        zoho_client.fetch_uploaded_ccfids()
-    )  # Should return a list or set of ccfid strings
-    # 2. Get all ccfids from your DB
-    db_ccfids = set(
-        r[0] for r in db.execute(text("SELECT ccfid FROM uploaded_ccfid")).all()
+
+def copy_page(cur, stream) -> int:
+    """COPY one Bulk Read result CSV into uploaded_ccfid; returns rows added."""
+    header   = next(csv.reader([stream.readline().decode("utf-8-sig")]))
+    columns  = ", ".join(f"c{i} text" for i in range(len(header)))
+    name_col = f"c{header.index('Name')}"
+
+    cur.execute(f"CREATE TEMP TABLE zoho_export ({columns}) ON COMMIT DROP")
+    cur.copy_expert("COPY zoho_export FROM STDIN WITH (FORMAT csv)", stream)
+    cur.execute(
+        f"""
+        INSERT INTO uploaded_ccfid (ccfid, uploaded_timestamp)
+        SELECT DISTINCT {name_col}, now() FROM zoho_export
+        WHERE {name_col} <> ''
+        ON CONFLICT (ccfid) DO NOTHING
+        """
     )
-    # 3. Find missing
-    missing = zoho_ccfids - db_ccfids
-    for ccfid in missing:
-        db.execute(
-            text(
-                "INSERT INTO uploaded_ccfid (ccfid, uploaded_timestamp) VALUES (:ccfid, now())"
-            ),
-            {"ccfid": ccfid},
-        )
-    db.commit()
-    print(f"Added {len(missing)} missing CCFIDs to the DB.")
+    return cur.rowcount
+
+
+def sync_uploaded_ccfids():
+    conn  = engine.raw_connection()
+    added = 0
+    try:
+        cur = conn.cursor()
+        for stream in zoho_client.iter_bulk_read(["Name"]):
+            added += copy_page(cur, stream)
+            conn.commit()
+    finally:
+        conn.close()
+    print(f"Added {added} missing CCFIDs to the DB.")
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     sync_uploaded_ccfids()
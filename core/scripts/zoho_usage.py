@@ -0,0 +1,32 @@
+"""
+Zoho API calls and estimated credits per day, lane and run, from the
+shared rate limiter's accounting (zoho_api_usage).
+"""
+import argparse
+
+from sqlalchemy import text
+
+from core.config     import ZOHO_DAILY_CREDITS
+from core.db.session import engine
+
+
+if __name__ == "__main__":
+    p = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    p.add_argument("--days", type=int, default=7, help="how many days back (default 7)")
+    args = p.parse_args()
+
+    with engine.connect() as conn:
+        rows = conn.execute(text("""
+            SELECT day, lane, run_id, calls, credits
+              FROM zoho_api_usage
+             WHERE day > (now() AT TIME ZONE 'UTC')::date - :days
+             ORDER BY day DESC, credits DESC
+        """), {"days": args.days}).all()
+
+    totals = {}
+    for day, lane, run_id, calls, credits in rows:
+        totals[day] = totals.get(day, 0) + credits
+        print(f"{day}  {lane:<11}  {run_id:<24}  {calls:>7} calls  {credits:>8} credits")
+    for day, credits in totals.items():
+        cap = f" of {ZOHO_DAILY_CREDITS}" if ZOHO_DAILY_CREDITS else ""
+        print(f"{day}: {credits} credits{cap}")
@@ -0,0 +1,166 @@
+# core/services/rate_limit.py
+"""
+Zoho call budget shared by every process (cron, scheduler, gunicorn workers).
+
+One token-bucket row in Postgres refills at ZOHO_RATE_PER_SECOND up to
+ZOHO_RATE_BURST, and every ZohoClient call takes a token under that row's
+lock, so the limit holds however many processes are calling. Calls run in
+one of two lanes: "interactive" (reviewer sends from the worklist) may
+drain the bucket, "batch" (cron pushes, backfills, replication) always
+leaves ZOHO_RATE_INTERACTIVE_RESERVE tokens, so a big push never starves
+an interactive send. The same holds for the day's credit budget.
+
+Each call's estimated credits are recorded in zoho_api_usage per UTC day,
+lane and run, in the same transaction that takes the token.
+"""
+
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from sqlalchemy import text
+
+from core.config     import (
+    ZOHO_DAILY_CREDITS,
+    ZOHO_INTERACTIVE_CREDIT_RESERVE,
+    ZOHO_RATE_BURST,
+    ZOHO_RATE_INTERACTIVE_RESERVE,
+    ZOHO_RATE_PER_SECOND,
+)
+from core.db.session import engine
+
+logger = logging.getLogger(__name__)
+
+BUCKET = "zoho"
+LANES  = ("interactive", "batch")
+
+# Estimated credits per call, from Zoho's API credit table (1 for anything else)
+RECORDS_PER_CREDIT = 10      # insert/update/upsert
+BULK_WRITE_CREDITS = 500
+BULK_READ_CREDITS  = 50
+
+# Process-wide defaults (set by the entry point), overridable per thread/task
+_defaults = {"lane": "batch", "run_id": "adhoc"}
+_lane     = ContextVar("zoho_lane", default=None)
+
+_bucket_ready = False
+
+_NOW_UTC = "(clock_timestamp() AT TIME ZONE 'UTC')"
+
+_INIT = text(f"""
+    INSERT INTO zoho_rate_bucket (name, tokens, updated_at)
+    VALUES (:name, :burst, {_NOW_UTC})
+    ON CONFLICT (name) DO NOTHING
+""")
+
+_LOCK = text(f"""
+    SELECT tokens,
+           EXTRACT(EPOCH FROM {_NOW_UTC} - updated_at),
+           {_NOW_UTC}::date
+      FROM zoho_rate_bucket
+     WHERE name = :name
+       FOR UPDATE
+""")
+
+_TAKE = text(f"UPDATE zoho_rate_bucket SET tokens = :tokens, updated_at = {_NOW_UTC} WHERE name = :name")
+
+_USED_TODAY = text("SELECT COALESCE(SUM(credits), 0) FROM zoho_api_usage WHERE day = :day")
+
+_RECORD = text("""
+    INSERT INTO zoho_api_usage (day, lane, run_id, calls, credits)
+    VALUES (:day, :lane, :run_id, 1, :credits)
+    ON CONFLICT (day, lane, run_id) DO UPDATE SET
+        calls   = zoho_api_usage.calls + 1,
+        credits = zoho_api_usage.credits + EXCLUDED.credits
+""")
+
+
+class ZohoQuotaExceeded(RuntimeError):
+    """The day's Zoho credit budget for this lane is used up."""
+
+
+def configure(lane: str | None = None, run_id: str | None = None) -> None:
+    """Set this process's default lane and the run its calls are billed to."""
+    if lane is not None:
+        if lane not in LANES:
+            raise ValueError(f"Unknown Zoho lane {lane!r}")
+        _defaults["lane"] = lane
+    if run_id is not None:
+        _defaults["run_id"] = run_id
+
+
+@contextmanager
+def lane(name: str):
+    """Run the calls inside the block in lane `name`."""
+    if name not in LANES:
+        raise ValueError(f"Unknown Zoho lane {name!r}")
+    token = _lane.set(name)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+def current_lane() -> str:
+    return _lane.get() or _defaults["lane"]
+
+
+def record_credits(n_records: int) -> int:
+    """Credits for writing `n_records` in one insert/update/upsert call."""
+    return max(1, -(-n_records // RECORDS_PER_CREDIT))
+
+
+def acquire(credits: int = 1) -> None:
+    """
+    Block until the shared bucket has a token for this lane, take it and
+    record the call's credits. Raises ZohoQuotaExceeded if the call would
+    overrun the day's credits (less the interactive reserve, for batch).
+    """
+    global _bucket_ready
+    lane_name = current_lane()
+    floor     = 0.0 if lane_name == "interactive" else ZOHO_RATE_INTERACTIVE_RESERVE
+    waited    = 0.0
+
+    if not _bucket_ready:
+        with engine.begin() as conn:
+            conn.execute(_INIT, {"name": BUCKET, "burst": ZOHO_RATE_BURST})
+        _bucket_ready = True
+
+    while True:
+        with engine.begin() as conn:
+            tokens, elapsed, day = conn.execute(_LOCK, {"name": BUCKET}).one()
+            tokens = min(ZOHO_RATE_BURST, tokens + float(elapsed) * ZOHO_RATE_PER_SECOND)
+
+            if ZOHO_DAILY_CREDITS:
+                limit = ZOHO_DAILY_CREDITS - (0 if lane_name == "interactive" else ZOHO_INTERACTIVE_CREDIT_RESERVE)
+                used  = conn.execute(_USED_TODAY, {"day": day}).scalar()
+                if used + credits > limit:
+                    raise ZohoQuotaExceeded(
+                        f"Zoho {lane_name} credits for {day} used up ({used}/{limit})"
+                    )
+
+            if tokens - 1 >= floor:
+                conn.execute(_TAKE, {"name": BUCKET, "tokens": tokens - 1})
+                conn.execute(_RECORD, {
+                    "day": day, "lane": lane_name, "run_id": _defaults["run_id"], "credits": credits,
+                })
+                break
+            wait = (floor + 1 - tokens) / ZOHO_RATE_PER_SECOND
+
+        # Lock released; sleep until the bucket should have refilled enough
+        time.sleep(wait)
+        waited += wait
+
+    if waited >= 1:
+        logger.debug("Zoho %s call waited %.1fs for the rate limiter", lane_name, waited)
+
+
+def run_usage(run_id: str) -> dict[str, tuple[int, int]]:
+    """{lane: (calls, credits)} billed to `run_id` so far."""
+    with engine.connect() as conn:
+        rows = conn.execute(
+            text("SELECT lane, SUM(calls), SUM(credits) FROM zoho_api_usage WHERE run_id = :r GROUP BY lane"),
+            {"r": run_id},
+        ).all()
+    return {lane_name: (int(calls), int(credits)) for lane_name, calls, credits in rows}
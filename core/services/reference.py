@@ -0,0 +1,154 @@
+# core/services/reference.py
+"""
+Incremental replication of the Zoho reference modules behind every lookup:
+Accounts → account_info, Laboratories → laboratories, Panels → panels,
+Collection_Sites → collection_sites.
+
+Each module keeps a watermark (the newest Modified_Time seen) in
+replication_watermark. A run asks Zoho only for records modified since then
+(If-Modified-Since, sorted by Modified_Time), upserts each page with one
+INSERT … ON CONFLICT, applies deletions, and advances the watermark.
+"""
+
+import logging
+from datetime import datetime
+
+from sqlalchemy import delete
+from sqlalchemy.dialects.postgresql import insert
+
+from core.db.models  import (
+    CollectionSite, Company, Laboratory, Panel, ReplicationWatermark,
+)
+from core.db.session import SessionLocal, engine
+from core.services.zoho import zoho_client
+
+logger = logging.getLogger(__name__)
+
+PAGE_SIZE = 200
+
+# Zoho module → (model, primary-key column, {Zoho field API name: column})
+REFERENCE_MODULES = {
+    "Accounts": (Company, "account_id", {
+        "Account_Code": "account_code",
+        "Account_Name": "account_name",
+        "i3_Code":      "account_i3_code",
+    }),
+    "Laboratories": (Laboratory, "Record_id", {
+        "Name": "Laboratory",
+    }),
+    "Panels": (Panel, "panel_id", {
+        "Name": "panel_name",
+    }),
+    "Collection_Sites": (CollectionSite, "Record_id", {
+        "Name":               "Collection_Site",
+        "Collection_Site_ID": "Collection_Site_ID",
+    }),
+}
+
+
+def _record_id(zoho_id) -> str:
+    # Same "zcrm_<id>" form as the CRM export these tables were seeded from
+    return f"zcrm_{zoho_id}"
+
+
+def _get(path: str, since: str | None, params: dict) -> list[dict]:
+    """One list call; 204 (no rows) and 304 (nothing modified) → []."""
+    headers = {"If-Modified-Since": since} if since else {}
+    resp = zoho_client._request("GET", path, headers=headers, params=params)
+    if resp.status_code in (204, 304):
+        return []
+    return resp.json().get("data", [])
+
+
+def _upsert(model, pk: str, fields: dict, rows: list[dict]) -> int:
+    values = []
+    for rec in rows:
+        row = {pk: _record_id(rec["id"])}
+        for field, col in fields.items():
+            val = rec.get(field)
+            row[col] = val.get("name") if isinstance(val, dict) else val
+        if "account_i3_code" in row:
+            row["account_i3_code"] = str(row["account_i3_code"] or "").strip() or None
+        values.append(row)
+
+    table = model.__table__
+    stmt  = insert(table).values(values)
+    stmt  = stmt.on_conflict_do_update(
+        index_elements=[pk],
+        set_={col: stmt.excluded[col] for col in fields.values()},
+    )
+    with engine.begin() as conn:
+        # Rows written outside the export (e.g. the site registry) carry the bare id
+        conn.execute(delete(table).where(table.c[pk].in_([str(r["id"]) for r in rows])))
+        conn.execute(stmt)
+    return len(values)
+
+
+def _apply_deletions(module: str, model, pk: str, since: str) -> int:
+    """Delete the rows Zoho deleted since `since`, a page of the deleted list at a time."""
+    table = model.__table__
+    removed, page = 0, 1
+    while True:
+        deleted = _get(f"/crm/v2/{module}/deleted", since, {"type": "all", "per_page": PAGE_SIZE, "page": page})
+        if not deleted:
+            break
+        ids = [str(d["id"]) for d in deleted] + [_record_id(d["id"]) for d in deleted]
+        with engine.begin() as conn:
+            removed += conn.execute(delete(table).where(table.c[pk].in_(ids))).rowcount
+        if len(deleted) < PAGE_SIZE:
+            break
+        page += 1
+    return removed
+
+
+def replicate_module(module: str, full: bool = False) -> int:
+    """
+    Pull one module's changes since its watermark (everything if `full`)
+    into its table. Returns the number of rows upserted or deleted.
+    """
+    model, pk, fields = REFERENCE_MODULES[module]
+
+    with SessionLocal() as db:
+        mark  = db.get(ReplicationWatermark, module)
+        since = None if full or mark is None else mark.last_modified
+
+    params = {
+        "fields":     ",".join([*fields, "Modified_Time"]),
+        "sort_by":    "Modified_Time",
+        "sort_order": "asc",
+        "per_page":   PAGE_SIZE,
+    }
+    upserted, newest, page = 0, since, 1
+    while True:
+        rows = _get(f"/crm/v2/{module}", since, {**params, "page": page})
+        if not rows:
+            break
+        upserted += _upsert(model, pk, fields, rows)
+        newest    = max(newest or "", *(r["Modified_Time"] for r in rows))
+        if len(rows) < PAGE_SIZE:
+            break
+        page += 1
+
+    removed = _apply_deletions(module, model, pk, since) if since else 0
+
+    with SessionLocal() as db:
+        db.merge(ReplicationWatermark(
+            module        = module,
+            last_modified = newest,
+            synced_at     = datetime.utcnow(),
+        ))
+        db.commit()
+
+    logger.info(
+        "%s: %d upserted, %d deleted (since %s)",
+        module, upserted, removed, since or "the beginning",
+    )
+    return upserted + removed
+
+
+def replicate_reference(modules=None, full: bool = False) -> dict[str, int]:
+    """
+    Bring the reference tables up to date. Returns {module: rows changed};
+    callers holding in-memory copies should refresh them if any changed.
+    """
+    return {m: replicate_module(m, full) for m in (modules or REFERENCE_MODULES)}
@@ -0,0 +1,153 @@
+# core/services/sites.py
+"""
+In-memory registry of collection sites (Collection_Site_ID → Zoho Record_id).
+
+Loaded from collection_sites once per process; new IDs are found with a
+vectorized set difference against the cached index, searched for in Zoho
+(another process may have created them since we loaded), and only the ones
+Zoho really doesn't have are created. A batch with no new sites costs no
+DB or API round trips.
+"""
+
+import logging
+import threading
+
+import pandas as pd
+
+from core.db.models  import CollectionSite
+from core.db.session import SessionLocal
+from core.services    import rate_limit
+
+logger = logging.getLogger(__name__)
+
+SITES_MODULE = "Collection_Sites"
+
+# Zoho search accepts at most 10 criteria per call
+_SEARCH_CHUNK = 10
+_CREATE_CHUNK = 100
+
+
+def _escape(value: str) -> str:
+    """Escape Zoho search criteria metacharacters."""
+    return value.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)").replace(",", "\\,")
+
+
+class CollectionSiteRegistry:
+    def __init__(self, client):
+        self.client = client
+        self._ids   = None      # pd.Index of known Collection_Site_IDs
+        self._map   = {}        # Collection_Site_ID → Record_id
+        self._lock  = threading.Lock()
+
+    def _ensure_loaded(self) -> None:
+        if self._ids is not None:
+            return
+        with SessionLocal() as db:
+            rows = db.query(CollectionSite.Collection_Site_ID, CollectionSite.Record_id).all()
+        self._map = {sid: rid for sid, rid in rows}
+        self._ids = pd.Index(list(self._map))
+        logger.info("Loaded %d collection sites", len(self._map))
+
+    def refresh(self) -> None:
+        """Drop the cache; the next call reloads from collection_sites."""
+        with self._lock:
+            self._ids = None
+
+    def record_ids(self, wanted=()) -> dict[str, str]:
+        """
+        Full Collection_Site_ID → Record_id map (cached). If any of `wanted`
+        is unknown, reload once in case another process has added it.
+        """
+        with self._lock:
+            self._ensure_loaded()
+            if any(isinstance(sid, str) and sid and sid not in self._map for sid in wanted):
+                self._ids = None
+                self._ensure_loaded()
+            return dict(self._map)
+
+    # --- Zoho ---
+
+    def _search(self, site_ids: list[str]) -> dict[str, str]:
+        """Which of these IDs already exist in Zoho → {site_id: record_id}."""
+        found = {}
+        for i in range(0, len(site_ids), _SEARCH_CHUNK):
+            chunk    = site_ids[i : i + _SEARCH_CHUNK]
+            criteria = "or".join(f"(Collection_Site_ID:equals:{_escape(s)})" for s in chunk)
+            if len(chunk) > 1:
+                # Zoho wants a compound criteria wrapped as a whole: ((a)or(b))
+                criteria = f"({criteria})"
+            resp = self.client._request(
+                "GET", f"/crm/v2/{SITES_MODULE}/search", params={"criteria": criteria}
+            )
+            if resp.status_code == 204:     # no matches
+                continue
+            for rec in resp.json().get("data", []):
+                found[rec["Collection_Site_ID"]] = str(rec["id"])
+        return found
+
+    def _create(self, new_df: pd.DataFrame) -> dict[str, str]:
+        """Create sites in Zoho → {site_id: record_id} for the ones that took."""
+        created = {}
+        records = new_df.to_dict(orient="records")
+        for i in range(0, len(records), _CREATE_CHUNK):
+            chunk = records[i : i + _CREATE_CHUNK]
+            body  = {
+                "data": [
+                    {"Name": r["Collection_Site"], "Collection_Site_ID": r["Collection_Site_ID"]}
+                    for r in chunk
+                ]
+            }
+            data = self.client._request(
+                "POST", f"/crm/v2/{SITES_MODULE}", json=body,
+                credits=rate_limit.record_credits(len(chunk)),
+            ).json().get("data", [])
+            for req, res in zip(chunk, data):
+                rid = res.get("details", {}).get("id")
+                if res.get("status") == "success" and rid:
+                    created[req["Collection_Site_ID"]] = str(rid)
+                else:
+                    logger.warning("Zoho rejected collection site %r → %r", req, res)
+        return created
+
+    # --- sync ---
+
+    def _merge(self, delta: dict[str, str], names: pd.Series) -> None:
+        """Persist new sites locally and fold them into the cache."""
+        with SessionLocal() as db:
+            for sid, rid in delta.items():
+                db.merge(CollectionSite(
+                    Record_id          = rid,
+                    Collection_Site    = names.get(sid),
+                    Collection_Site_ID = sid,
+                ))
+            db.commit()
+        self._map.update(delta)
+        self._ids = self._ids.append(pd.Index(list(delta)))
+
+    def sync(self, site_df: pd.DataFrame) -> dict[str, str]:
+        """
+        Make sure every (Collection_Site, Collection_Site_ID) in `site_df`
+        exists in Zoho and locally. Returns only the delta: sites that were
+        new to this registry, {site_id: record_id}.
+        """
+        with self._lock:
+            self._ensure_loaded()
+
+            ids     = site_df["Collection_Site_ID"]
+            blank   = ids.isna() | (ids.astype(str).str.strip() == "")
+            new_df  = site_df.loc[~blank & ~ids.isin(self._ids)]
+            new_df  = new_df.drop_duplicates(subset=["Collection_Site_ID"])
+            if new_df.empty:
+                return {}
+
+            names = new_df.set_index("Collection_Site_ID")["Collection_Site"]
+            delta = self._search(new_df["Collection_Site_ID"].tolist())
+            if delta:
+                logger.info("%d collection sites already in Zoho; linking locally", len(delta))
+
+            to_create = new_df.loc[~new_df["Collection_Site_ID"].isin(list(delta))]
+            if not to_create.empty:
+                delta.update(self._create(to_create))
+
+            self._merge(delta, names)
+            return delta
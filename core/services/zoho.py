@@ -1,6 +1,11 @@
 # core/services/zoho.py
 
+import csv
+import io
 import logging
+import tempfile
+import time
+import zipfile
 from datetime import datetime, timedelta
 
 
@@ -14,13 +19,26 @@ from core.config     import (
     ZOHO_CLIENT_SECRET,
     ZOHO_REFRESH_TOKEN,
     ZOHO_MODULE,
+    ZOHO_PUSH_MODE,
+    ZOHO_ORG_ID,
+    ZOHO_CONTENT_BASE,
 )
-from core.db.models  import CollectionSite, UploadedCCFID, Panel
+from core.db.models  import UploadedCCFID, Panel
 from core.db.session import SessionLocal
-from core.normalize.common import to_zoho_date
+from core.services    import rate_limit
+from core.services.sites import CollectionSiteRegistry
+from core.normalize.common import map_values, to_zoho_date
 
 logger = logging.getLogger(__name__)
 
+# Zoho's per-call record limit for insert/upsert
+ZOHO_BATCH_SIZE = 100
+
+# Bulk Write: rows per job, and how we wait on it
+ZOHO_BULK_MAX_ROWS     = 25000
+ZOHO_BULK_POLL_SECONDS = 10
+ZOHO_BULK_TIMEOUT      = 30 * 60
+
 # In‐memory cache for the OAuth token
 _token_cache = {"access_token": None, "expires_at": datetime.utcnow()}
 
@@ -33,7 +51,7 @@ class ZohoClient:
         self.client_id     = ZOHO_CLIENT_ID
         self.client_secret = ZOHO_CLIENT_SECRET
         self.session       = requests.Session()
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.sites         = CollectionSiteRegistry(self)
 
     def _get_access_token(self) -> str:
         """
@@ -55,10 +73,15 @@ class ZohoClient:
             "grant_type":    "refresh_token",
         }
 
-        resp = requests.post(auth_url, data=payload)
-        if resp.status_code != 200:
-            logger.error("Zoho token refresh failed (%d): %s", resp.status_code, resp.text)
-            resp.raise_for_status()
+        # Rate-limited and billed like any call, but in the interactive lane:
+        # a refresh is what every queued call is waiting on, so it must not
+        # sit behind the batch lane's reserve
+        try:
+            with rate_limit.lane("interactive"):
+                resp = self._request("POST", auth_url, auth=False, data=payload)
+        except requests.HTTPError as e:
+            logger.error("Zoho token refresh failed (%d): %s", e.response.status_code, e.response.text)
+            raise
 
         data   = resp.json()
         token  = data["access_token"]
@@ -68,233 +91,433 @@ class ZohoClient:
         logger.info("Refreshed Zoho access token; expires at %s", expires)
         return token
 
-    def _attach_lookup_ids(self, records, crm_map, site_map, lab_map, panel_map):
+    @staticmethod
+    def _attach_lookup_ids(frame: pd.DataFrame, crm_map, site_map, lab_map, panel_map) -> pd.DataFrame:
         """
-        Replace staging keys with Zoho {"id":...} lookups.
-        Mirrors old `_attach_lookup_ids`.
+        Replace staging keys with Zoho {"id":...} lookups, column by column.
+        Values with no match keep their text, as before.
         """
-        def strip_zcrm(val: str) -> str:
-            return val[len("zcrm_"):] if val.startswith("zcrm_") else val
-
-        out = []
-        for rec in records:
-            r = rec.copy()
-
-            # 0) Name ← CCFID
-            raw_ccfid = r.get("CCFID", "").strip()
-            if raw_ccfid:
-                r["Name"] = raw_ccfid
-            r.pop("CCFID", None)
-
-            # 1) Company lookup
-            raw_code = r.pop("Code", "").strip()
-            if raw_code:
-                acct_str = crm_map.get(raw_code)
-                if acct_str:
-                    r["Company"] = {"id": int(strip_zcrm(acct_str))}
-
-            # 2) Collection Site lookup
-            raw_site = r.pop("Collection_Site_ID", "").strip()
-            if raw_site:
-                site_str = site_map.get(raw_site)
-                if site_str:
-                    r["Collection_Site"] = {"id": int(strip_zcrm(site_str))}
-
-            # 3) Laboratory lookup
-            raw_lab = r.get("Laboratory", "")
-            if isinstance(raw_lab, str) and raw_lab.strip():
-                lab_str = raw_lab.strip()
-                zoho_lab = lab_map.get(lab_str)
-                if zoho_lab:
-                    r["Laboratory"] = {"id": int(strip_zcrm(zoho_lab))}
-
-            # 4) Panel lookup
-            raw_panel = r.get("Panel", "").strip()
-            if raw_panel:
-                panel_str = panel_map.get(raw_panel)
-                if panel_str:
-                    r["Panel"] = {"id": int(strip_zcrm(panel_str))}
-
-            out.append(r)
+        out = frame.copy()
+        out.columns = out.columns.astype(object)
+
+        def keys(col: str, pop: bool = False) -> pd.Series:
+            vals = out.pop(col) if pop else out[col]
+            return vals.fillna("").astype(str).str.strip()
+
+        def attach(dst: str, raw: pd.Series, mapping: dict) -> None:
+            ids  = raw.map(mapping)
+            hit  = ids.notna()
+            if not hit.any():
+                return
+            if dst not in out:
+                out[dst] = None
+            out[dst] = out[dst].astype(object)
+            out.loc[hit, dst] = ids[hit].map(lambda v: {"id": int(str(v).removeprefix("zcrm_"))})
+
+        # 0) Name ← CCFID
+        if "CCFID" in out:
+            ccfid = keys("CCFID", pop=True)
+            out["Name"] = ccfid.where(ccfid != "", out["Name"] if "Name" in out else None)
+
+        # 1-4) Company, Collection Site, Laboratory, Panel lookups
+        if "Code" in out:
+            attach("Company", keys("Code", pop=True), crm_map)
+        if "Collection_Site_ID" in out:
+            attach("Collection_Site", keys("Collection_Site_ID", pop=True), site_map)
+        if "Laboratory" in out:
+            attach("Laboratory", keys("Laboratory"), lab_map)
+        if "Panel" in out:
+            attach("Panel", keys("Panel"), panel_map)
         return out
 
-    def push_records(self, records: list[dict]) -> list[str]:
-            """
-            Attach lookup IDs, convert dates to strings, POST to Zoho,
-            return list of CCFIDs that succeeded, and record each one locally.
-            """
-            if not records:
-                return []
-
-            # 1) Build our lookup maps
-            with SessionLocal() as db:
-                crm_map = {
-                    code: rid.replace("zcrm_", "")
-                    for code, rid in db.execute(
-                        text("SELECT account_code, account_id FROM account_info")
-                    ).all()
-                }
-                site_map = {
-                    cs.Collection_Site_ID: cs.Record_id
-                    for cs in db.query(CollectionSite).all()
-                }
-                lab_map = {
-                    lab.strip(): rid.replace("zcrm_", "")
-                    for rid, lab in db.execute(
-                        text('SELECT "Record_id","Laboratory" FROM laboratories')
-                    ).all()
-                }
-                panel_map = {
-                    p.panel_name: p.panel_id.replace("zcrm_", "")
-                    for p in db.query(Panel).all()
-                }
-            # 2) Attach lookup IDs
-            batch = self._attach_lookup_ids(records, crm_map, site_map, lab_map, panel_map)
-
-            # 2b) ISO‑format any dates so JSON serialization will work
-            for r in batch:
-                r["Collection_Date"] = to_zoho_date(r.get("Collection_Date"))
-                r["MRO_Received"]    = to_zoho_date(r.get("MRO_Received"))
-
-            # 3) Send to Zoho
-            token   = self._get_access_token()
-            url     = f"{self.base_url}/crm/v2/{self.module}"
-            headers = {"Authorization": f"Zoho-oauthtoken {token}"}
-
-            logger.info("Pushing %d records to Zoho…", len(batch))
-            resp = requests.post(url, json={"data": batch}, headers=headers)
-            resp.raise_for_status()
-            data = resp.json().get("data", [])
+    def _request(self, method: str, url: str, credits: int = 1, auth: bool = True, **kwargs) -> requests.Response:
+        """
+        Authenticated call through the pooled session; raises on HTTP errors.
+        Waits its turn in the shared rate limiter, billed `credits`.
+        auth=False: no access token (the token refresh itself).
+        """
+        # Token first: a refresh takes its own turn, never nested in this one
+        headers = {"Authorization": f"Zoho-oauthtoken {self._get_access_token()}"} if auth else {}
+        rate_limit.acquire(credits)
+        headers.update(kwargs.pop("headers", None) or {})
+        if not url.startswith("http"):
+            url = f"{self.base_url}{url}"
+        resp = self.session.request(method, url, headers=headers, **kwargs)
+        resp.raise_for_status()
+        return resp
+
+    def _load_lookup_maps(self, site_ids=()):
+        """(crm_map, site_map, lab_map, panel_map) from the local reference tables."""
+        with SessionLocal() as db:
+            crm_map = {
+                code: rid.replace("zcrm_", "")
+                for code, rid in db.execute(
+                    text("SELECT account_code, account_id FROM account_info")
+                ).all()
+            }
+            lab_map = {
+                lab.strip(): rid.replace("zcrm_", "")
+                for rid, lab in db.execute(
+                    text('SELECT "Record_id","Laboratory" FROM laboratories')
+                ).all()
+            }
+            panel_map = {
+                p.panel_name: p.panel_id.replace("zcrm_", "")
+                for p in db.query(Panel).all()
+            }
+        site_map = self.sites.record_ids(site_ids)
+        return crm_map, site_map, lab_map, panel_map
+
+    def _build_payload(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Attach lookup IDs and ISO-format dates; one payload row per input row."""
+        site_ids = set(frame["Collection_Site_ID"].dropna()) if "Collection_Site_ID" in frame else set()
+        batch    = self._attach_lookup_ids(frame, *self._load_lookup_maps(site_ids))
+        for col in ("Collection_Date", "MRO_Received"):
+            batch[col] = map_values(batch[col], to_zoho_date) if col in batch else ""
+        return batch
+
+    @staticmethod
+    def _caller_keys(frame: pd.DataFrame) -> list:
+        """
+        Each row's key as the caller holds it: Name, else CCFID, unstripped.
+        The outcome lists carry these (staging looks rows up by them), while
+        uploaded_ccfid records the stripped Name Zoho stores.
+        """
+        keys = pd.Series([None] * len(frame), index=frame.index, dtype=object)
+        for col in ("CCFID", "Name"):
+            if col in frame:
+                keys = frame[col].where(frame[col].notna() & (frame[col].astype(str) != ""), keys)
+        return keys.tolist()
+
+    @staticmethod
+    def _classify(result: dict) -> str:
+        """
+        One Zoho per-record result → created / updated / duplicate / failed.
+        Upsert results carry `action` ("insert" | "update"); DUPLICATE_DATA
+        means the CCFID already exists in Zoho.
+        """
+        if result.get("status") == "success":
+            return "updated" if result.get("action") == "update" else "created"
+        if result.get("code") == "DUPLICATE_DATA":
+            return "duplicate"
+        return "failed"
+
+    def _record_uploaded(self, ccfids: list[str]) -> None:
+        if not ccfids:
+            return
+        with SessionLocal() as db:
+            now = datetime.utcnow()
+            for ccfid in ccfids:
+                db.merge(UploadedCCFID(ccfid=ccfid, uploaded_timestamp=now))
+            db.commit()
 
-            # 4) Collect successes & failures
-            successes: list[str] = []
-            failures: list[tuple[dict, dict]] = []
-            for orig, result in zip(records, data):
-                if result.get("status") == "success":
-                    identity = orig.get("Name") or orig.get("CCFID")
-                    successes.append(identity)
+    def send_frame(self, frame: pd.DataFrame, mode: str | None = None) -> dict[str, list[str]]:
+        """
+        POST a MASTER_COLUMNS-style frame to Zoho in 100-record chunks and
+        classify every result. Each chunk is serialized to JSON once,
+        straight from the columns.
+
+        mode="insert": plain inserts (duplicates are rejected by Zoho).
+        mode="upsert": /upsert keyed on Name (the CCFID), so resending a
+                       record updates it instead of creating a copy.
+
+        Returns {"created": [...], "updated": [...], "duplicate": [...],
+        "failed": [...]} of the caller's keys (Name, else CCFID, as given),
+        plus "kinds": each input row's outcome by position. Everything except
+        "failed" is recorded in uploaded_ccfid as soon as its chunk comes
+        back, so a later chunk raising loses nothing.
+        """
+        mode = mode or ZOHO_PUSH_MODE
+        if mode not in ("insert", "upsert"):
+            raise ValueError(f"Unknown Zoho push mode {mode!r}")
+
+        outcome = {"created": [], "updated": [], "duplicate": [], "failed": [], "kinds": []}
+        if frame.empty:
+            return outcome
+
+        frame = frame.reset_index(drop=True)
+        keys  = self._caller_keys(frame)
+        batch = self._build_payload(frame)
+        names = batch["Name"].tolist() if "Name" in batch else [None] * len(batch)
+        url   = f"/crm/v2/{self.module}" + ("/upsert" if mode == "upsert" else "")
+        extra = ', "duplicate_check_fields": ["Name"]' if mode == "upsert" else ""
+
+        # A row Zoho returns no result for counts as failed
+        kinds = outcome["kinds"] = ["failed"] * len(batch)
+
+        logger.info("Pushing %d records to Zoho (%s)…", len(batch), mode)
+        for i in range(0, len(batch), ZOHO_BATCH_SIZE):
+            chunk = batch.iloc[i : i + ZOHO_BATCH_SIZE]
+            body  = f'{{"data": {chunk.to_json(orient="records", date_format="iso", force_ascii=False)}{extra}}}'
+
+            data = self._request(
+                "POST", url, data=body.encode("utf-8"),
+                headers={"Content-Type": "application/json"},
+                credits=rate_limit.record_credits(len(chunk)),
+            ).json().get("data", [])
+            held = []
+            for j, result in enumerate(data):
+                kind = self._classify(result)
+                kinds[i + j] = kind
+                outcome[kind].append(keys[i + j])
+                if kind == "failed":
+                    logger.warning("Zoho rejected: %r → %r", chunk.iloc[j].to_dict(), result)
                 else:
-                    failures.append((orig, result))
-                    logger.warning("Zoho rejected: %r → %r", orig, result)
-
-            logger.info("Zoho accepted %d/%d", len(successes), len(records))
-            if failures:
-                logger.error("Zoho rejected %d records; none marked uploaded", len(failures))
-
-            # 5) Record successes locally
-            if successes:
-                with SessionLocal() as db2:
-                    now = datetime.utcnow()
-                    for ccfid in successes:
-                        db2.merge(UploadedCCFID(
-                            ccfid=ccfid,
-                            uploaded_timestamp=now
-                        ))
-                    db2.commit()
-
-            # 6) Return just the list of CCFIDs
-            return successes
-
-    def _add_collection_sites_to_db(self, new_sites: list[dict]) -> None:
-        """Upsert a list of collection-site dicts into the local DB."""
-        db = SessionLocal()
-        try:
-            for s in new_sites:
-                db.merge(
-                    CollectionSite(
-                        Record_id          = s["Record_id"],
-                        Collection_Site    = s["Collection_Site"],
-                        Collection_Site_ID = s["Collection_Site_ID"],
-                    )
-                )
-            db.commit()
-        finally:
-            db.close()
+                    held.append(names[i + j])
+            # Recorded per chunk, so a later chunk failing can't lose these
+            self._record_uploaded(held)
+
+        logger.info(
+            "Zoho: %d created, %d updated, %d duplicate, %d failed",
+            *(len(outcome[k]) for k in ("created", "updated", "duplicate", "failed")),
+        )
+        if outcome["failed"]:
+            logger.error("Zoho rejected %d records; none marked uploaded", len(outcome["failed"]))
+        return outcome
+
+    def send_records(self, records: list[dict], mode: str | None = None) -> dict[str, list[str]]:
+        """`send_frame` for a list of record dicts (the web app's single/bulk sends)."""
+        return self.send_frame(pd.DataFrame.from_records(records), mode)
+
+    def push_frame(self, frame: pd.DataFrame, mode: str | None = None) -> list[str]:
+        """Send a frame; return the CCFIDs Zoho now holds (each recorded locally)."""
+        outcome = self.send_frame(frame, mode)
+        return outcome["created"] + outcome["updated"] + outcome["duplicate"]
+
+    def push_records(self, records: list[dict], mode: str | None = None) -> list[str]:
+        """
+        Attach lookup IDs, convert dates to strings, send to Zoho,
+        return list of CCFIDs that Zoho now holds, and record each one locally.
+        """
+        return self.push_frame(pd.DataFrame.from_records(records), mode)
 
-    def sync_collection_sites(self, site_df: pd.DataFrame) -> dict[str, str]:
+    # --- Bulk Write (large backfills) ---
+
+    @staticmethod
+    def _bulk_csv_value(val):
+        """Payload value → CSV cell: lookups by id, multi-selects ;-joined."""
+        if isinstance(val, dict):
+            return val.get("id", "")
+        if isinstance(val, (list, tuple)):
+            return ";".join(str(v) for v in val)
+        return "" if val is None else val
+
+    def _bulk_upload(self, batch: pd.DataFrame) -> tuple[str, list[dict]]:
         """
-        Sync new sites to Zoho, merge locally, return full ID map.
-        Mirrors old `sync_collection_sites_to_crm`.
+        Zip the payload as one CSV and upload it to Zoho's file store.
+        Returns (file_id, field_mappings).
         """
-        db = SessionLocal()
-        try:
-            # 1) What we already have
-            existing = {
-                cs.Collection_Site_ID: cs.Record_id
-                for cs in db.query(CollectionSite).all()
+        # Only object columns can hold lookups or multi-selects
+        objects = batch.select_dtypes(include="object").columns
+        lookups = {c for c in objects if batch[c].map(lambda v: isinstance(v, dict)).any()}
+        cells   = batch.copy()
+        for c in objects:
+            cells[c] = cells[c].map(self._bulk_csv_value)
+
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w", zipfile.ZIP_DEFLATED) as zf:
+            zf.writestr(f"{self.module}.csv", cells.to_csv(index=False))
+        archive.seek(0)
+
+        resp = self._request(
+            "POST", f"{ZOHO_CONTENT_BASE.rstrip('/')}/crm/v2/upload",
+            headers={"feature": "bulk-write", "X-CRM-ORG": ZOHO_ORG_ID},
+            files={"file": (f"{self.module}.zip", archive, "application/zip")},
+        )
+        file_id = resp.json()["details"]["file_id"]
+
+        # Lookup columns that carried {"id": ...} are matched by record id
+        mappings = [
+            {"api_name": c, "index": i, **({"find_by": "id"} if c in lookups else {})}
+            for i, c in enumerate(batch.columns)
+        ]
+        return file_id, mappings
+
+    def _bulk_wait(self, job_id: str) -> dict:
+        """Poll a bulk job until it leaves the queue; returns the final job."""
+        deadline = time.monotonic() + ZOHO_BULK_TIMEOUT
+        while True:
+            job = self._request("GET", f"/crm/bulk/v2/write/{job_id}").json()
+            status = job.get("status")
+            if status == "COMPLETED":
+                return job
+            if status == "FAILED":
+                raise RuntimeError(f"Zoho bulk write job {job_id} failed: {job}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Zoho bulk write job {job_id} still {status} after {ZOHO_BULK_TIMEOUT}s")
+            time.sleep(ZOHO_BULK_POLL_SECONDS)
+
+    def _bulk_results(self, job: dict) -> list[dict]:
+        """Download the job's result zip → rows with Name, STATUS, ERRORS."""
+        url  = job["result"]["download_url"]
+        resp = self._request("GET", url)
+        with zipfile.ZipFile(io.BytesIO(resp.content)) as zf:
+            with zf.open(zf.namelist()[0]) as f:
+                return list(csv.DictReader(io.TextIOWrapper(f, encoding="utf-8-sig")))
+
+    def send_frame_bulk(self, frame: pd.DataFrame, mode: str | None = None) -> dict[str, list[str]]:
+        """
+        Same contract as `send_frame`, but as one Bulk Write job: the
+        payload is uploaded as a zipped CSV, the job is polled to completion,
+        and its result file is classified per CCFID. A handful of API calls
+        regardless of batch size (Zoho caps a job at 25k rows).
+        """
+        mode = mode or ZOHO_PUSH_MODE
+        outcome = {"created": [], "updated": [], "duplicate": [], "failed": [], "kinds": []}
+        if frame.empty:
+            return outcome
+
+        frame = frame.reset_index(drop=True)
+        keys  = self._caller_keys(frame)
+        batch = self._build_payload(frame)
+        kinds = outcome["kinds"] = ["failed"] * len(batch)
+
+        for i in range(0, len(batch), ZOHO_BULK_MAX_ROWS):
+            chunk = batch.iloc[i : i + ZOHO_BULK_MAX_ROWS]
+            file_id, mappings = self._bulk_upload(chunk)
+
+            resource = {
+                "type":           "data",
+                "module":         self.module,
+                "file_id":        file_id,
+                "field_mappings": mappings,
             }
+            if mode == "upsert":
+                resource["find_by"] = "Name"
+            body = {"operation": mode, "ignore_empty": True, "resource": [resource]}
+
+            job_id = self._request(
+                "POST", "/crm/bulk/v2/write", json=body, credits=rate_limit.BULK_WRITE_CREDITS,
+            ).json()["details"]["id"]
+            logger.info("Zoho bulk write job %s started for %d records (%s)", job_id, len(chunk), mode)
+
+            results = self._bulk_results(self._bulk_wait(job_id))
+            # The result file is the uploaded CSV plus STATUS/ERRORS, row for
+            # row; if it somehow isn't, fall back to matching on Name
+            names = chunk["Name"].fillna("").astype(str).str.strip().tolist() if "Name" in chunk else [""] * len(chunk)
+            by_pos = len(results) == len(chunk)
+            by_name, held = {}, []
+            for k, row in enumerate(results):
+                status = (row.get("STATUS") or "").upper()
+                if status == "ADDED":
+                    kind = "created"
+                elif status == "UPDATED":
+                    kind = "updated"
+                elif "DUPLICATE_DATA" in (row.get("ERRORS") or ""):
+                    kind = "duplicate"
+                else:
+                    kind = "failed"
+                    logger.warning("Zoho bulk write rejected %s: %s", row.get("Name"), row.get("ERRORS"))
+                if by_pos:
+                    kinds[i + k] = kind
+                else:
+                    by_name[(row.get("Name") or "").strip()] = kind
+            if not by_pos:
+                for k, name in enumerate(names):
+                    kinds[i + k] = by_name.get(name, "failed")
+            # Reported under the caller's keys, recorded under Zoho's Name
+            for k, name in enumerate(names):
+                kind = kinds[i + k]
+                outcome[kind].append(keys[i + k])
+                if kind != "failed":
+                    held.append(name)
+            # Recorded per job, so a later job failing can't lose these
+            self._record_uploaded(held)
+
+        logger.info(
+            "Zoho bulk: %d created, %d updated, %d duplicate, %d failed",
+            *(len(outcome[k]) for k in ("created", "updated", "duplicate", "failed")),
+        )
+        return outcome
+
+    def send_records_bulk(self, records: list[dict], mode: str | None = None) -> dict[str, list[str]]:
+        """`send_frame_bulk` for a list of record dicts."""
+        return self.send_frame_bulk(pd.DataFrame.from_records(records), mode)
+
+    def bulk_write_frame(self, frame: pd.DataFrame, mode: str | None = None) -> list[str]:
+        """Bulk Write counterpart of `push_frame`: CCFIDs Zoho now holds."""
+        outcome = self.send_frame_bulk(frame, mode)
+        return outcome["created"] + outcome["updated"] + outcome["duplicate"]
+
+    def bulk_write_records(self, records: list[dict], mode: str | None = None) -> list[str]:
+        """Bulk Write counterpart of `push_records`: CCFIDs Zoho now holds."""
+        return self.bulk_write_frame(pd.DataFrame.from_records(records), mode)
+
+    # --- Bulk Read (reconciliation) ---
+
+    def _bulk_read_job(self, fields: list[str], page: int) -> dict:
+        """Start a Bulk Read export of one page (≤200k rows) and wait for it."""
+        body = {"query": {"module": self.module, "fields": fields, "page": page}}
+        job_id = self._request(
+            "POST", "/crm/bulk/v2/read", json=body, credits=rate_limit.BULK_READ_CREDITS,
+        ).json()["data"][0]["details"]["id"]
+        logger.info("Zoho bulk read job %s started (page %d)", job_id, page)
+
+        deadline = time.monotonic() + ZOHO_BULK_TIMEOUT
+        while True:
+            job   = self._request("GET", f"/crm/bulk/v2/read/{job_id}").json()["data"][0]
+            state = job.get("state")
+            if state == "COMPLETED":
+                return job
+            if state in ("FAILED", "FAILURE"):
+                raise RuntimeError(f"Zoho bulk read job {job_id} failed: {job}")
+            if time.monotonic() > deadline:
+                raise TimeoutError(f"Zoho bulk read job {job_id} still {state} after {ZOHO_BULK_TIMEOUT}s")
+            time.sleep(ZOHO_BULK_POLL_SECONDS)
+
+    def iter_bulk_read(self, fields: list[str] = ("Name",)):
+        """
+        Export the module via Bulk Read and yield each page's result CSV as
+        a binary stream (header row first, then Id plus `fields`). The zip is
+        spooled to a temp file, so nothing is held in memory; each stream is
+        only valid until the next one is requested.
+        """
+        page = 1
+        while True:
+            job  = self._bulk_read_job(list(fields), page)
+            resp = self._request("GET", f"/crm/bulk/v2/read/{job['id']}/result", stream=True)
+            with tempfile.TemporaryFile() as tmp:
+                for chunk in resp.iter_content(chunk_size=1 << 20):
+                    tmp.write(chunk)
+                tmp.seek(0)
+                with zipfile.ZipFile(tmp) as zf, zf.open(zf.namelist()[0]) as f:
+                    yield f
+
+            result = job.get("result") or {}
+            logger.info("Zoho bulk read page %d: %s records", page, result.get("count"))
+            if not result.get("more_records"):
+                return
+            page += 1
+
+    def sync_collection_sites(self, site_df: pd.DataFrame) -> dict[str, str]:
+        """
+        Create any sites in `site_df` that Zoho doesn't have yet (searching
+        Zoho first) and return only those, {Collection_Site_ID: Record_id}.
+        See `CollectionSiteRegistry.sync`.
+        """
+        return self.sites.sync(site_df)
 
-            # 2) Which IDs are brand-new?
-            batch_ids = set(site_df["Collection_Site_ID"])
-            new_ids   = batch_ids - set(existing.keys())
-
-            # 3) Prep them for Zoho
-            to_create = [
-                {
-                    "Collection_Site":    r["Collection_Site"],
-                    "Collection_Site_ID": r["Collection_Site_ID"],
-                }
-                for _, r in site_df.iterrows()
-                if r["Collection_Site_ID"] in new_ids
-            ]
-
-            created = []
-            if to_create:
-                token   = self._get_access_token()
-                headers = {
-                    "Authorization": f"Zoho-oauthtoken {token}",
-                    "Content-Type":  "application/json",
-                }
-                url = f"{self.base_url}/crm/v2/Collection_Sites"
-
-                # 4) Send in 100-record batches
-                for i in range(0, len(to_create), 100):
-                    batch = to_create[i : i + 100]
-                    payload = {
-                        "data": [
-                            {
-                                "Name":                x["Collection_Site"],
-                                "Collection_Site_ID":  x["Collection_Site_ID"],
-                            }
-                            for x in batch
-                        ]
-                    }
-                    resp = requests.post(url, headers=headers, json=payload)
-                    resp.raise_for_status()
-
-                    for req, zoho_rec in zip(batch, resp.json().get("data", [])):
-                        # Zoho returns the new record’s ID here
-                        req["Record_id"] = str(
-                            zoho_rec.get("details", {}).get("id", "")
-                        )
-                        created.append(req)
-
-                # 5) Merge those new ones into our local DB
-                self._add_collection_sites_to_db(created)
-
-            # 6) Finally, re-query to get the full up-to-date map
-            all_sites = db.query(CollectionSite).all()
-            return {s.Collection_Site_ID: s.Record_id for s in all_sites}
-
-        finally:
-            db.close()
+    def sync_collection_site(self, name: str, site_id: str) -> dict[str, str]:
+        """`sync_collection_sites` for a single site (the web app's detail save)."""
+        return self.sync_collection_sites(pd.DataFrame([{
+            "Collection_Site":    name,
+            "Collection_Site_ID": site_id,
+        }]))
 
     def fetch_uploaded_ccfids(self) -> list[str]:
         """
         Paginate through Zoho to fetch all CCFIDs (Name field).
-        Mirrors old `fetch_uploaded_ccfids`.
+        Mirrors old `fetch_uploaded_ccfids`; one GET per 200 records, so
+        full reconciliations should use `iter_bulk_read` instead.
         """
-        token = self._get_access_token()
-        url   = f"{self.base_url}/crm/v2/{self.module}"
-        headers = {"Authorization": f"Zoho-oauthtoken {token}"}
-
         all_ccfids, page, per_page = [], 1, 200
         while True:
-            resp = requests.get(
-                url, headers=headers,
-                params={"page": page, "per_page": per_page, "fields": "Name"}
+            resp = self._request(
+                "GET", f"/crm/v2/{self.module}",
+                params={"page": page, "per_page": per_page, "fields": "Name"},
             )
-            resp.raise_for_status()
+            if resp.status_code == 204:     # no records
+                break
             data = resp.json().get("data", [])
             if not data:
                 break
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Backfill a date range: scrape it in parallel windows and run each window
+through transform → stage → push as soon as it lands.
+
+    python -m cronjob.backfill crl --start 2025-04-01 --end 2025-06-30
+    python -m cronjob.backfill i3 --start 2025-04-01 --end 2025-06-30 --window-days 14 --workers 4
+    python -m cronjob.backfill crl --start 2025-06-01 --end 2025-06-30 --dry-run
+    python -m cronjob.backfill crl --start 2025-01-01 --end 2025-06-30 --window-days 60 --normalize-workers 8
+
+eScreen exports come from the Node scraper and aren't windowed; backfill
+covers CRL and i3Screen. The date-range controls it fills in are unverified
+settings (CRL_START_DATE_INPUT, I3_FROM_DATE_INPUT, ...): confirm them
+against each portal first.
+"""
+import argparse
+import logging
+import sys
+from datetime import date
+
+from core.config            import BACKFILL_WINDOW_DAYS, BACKFILL_WORKERS, NORMALIZE_WORKERS
+from core.db.locks          import advisory_lock
+from core.normalize         import crl, i3screen
+from core.normalize.load    import STAGING_FIELD_MAP, drain_outbox, stage_batch
+from core.normalize.parallel import parallel_transform
+from core.scrapers.backfill import BACKFILL_SOURCES, backfill
+from core.services         import rate_limit
+
+logger = logging.getLogger("cronjob.backfill")
+
+# source → (transform, raw CCFID columns)
+TRANSFORMS = {
+    "crl": (crl.transform_crl,           crl.RAW_CCFID_COLUMNS),
+    "i3":  (i3screen.transform_i3screen, i3screen.RAW_CCFID_COLUMNS),
+}
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Backfill a date range from CRL or i3Screen")
+    p.add_argument("source", choices=tuple(BACKFILL_SOURCES))
+    p.add_argument("--start", type=date.fromisoformat, required=True, help="First day (YYYY-MM-DD)")
+    p.add_argument("--end", type=date.fromisoformat, default=date.today(), help="Last day, inclusive; default today")
+    p.add_argument("--window-days", type=int, default=BACKFILL_WINDOW_DAYS)
+    p.add_argument("--workers", type=int, default=BACKFILL_WORKERS)
+    p.add_argument("--normalize-workers", type=int, default=NORMALIZE_WORKERS,
+                   help="Processes for normalizing large windows (1 = serial)")
+    p.add_argument("--dry-run", action="store_true", help="Scrape & normalize only; no Zoho or DB writes")
+    return p.parse_args(argv)
+
+
+def run_backfill(args) -> bool:
+    """
+    Load every window of the range. Holds the source's pipeline lock (as
+    cronjob.main and the scheduler do) so no other load stages the same
+    CCFIDs alongside it; returns False, having done nothing, if another
+    process holds it.
+    """
+    with advisory_lock(f"pipeline:{args.source}") as got:
+        if not got:
+            logger.warning("%s pipeline already running elsewhere; not backfilling", args.source)
+            return False
+
+        rate_limit.configure(run_id=f"backfill-{args.source}-{args.start}")
+        complete = staged = 0
+        for (start, end), raw in backfill(args.source, args.start, args.end, args.window_days, args.workers):
+            transform, key_columns = TRANSFORMS[args.source]
+            normalized = parallel_transform(transform, raw, key_columns, workers=args.normalize_workers)
+            pending, new_staging = stage_batch(normalized, STAGING_FIELD_MAP, dry_run=args.dry_run, source=args.source)
+            if not args.dry_run:
+                drain_outbox()
+            complete += len(pending)
+            staged   += len(new_staging)
+            logger.info("[%s] %s – %s loaded: %d complete, %d new staging", args.source, start, end, len(pending), len(new_staging))
+
+    logger.info(
+        "%s backfill %s – %s done%s: %d complete, %d new staging",
+        args.source, args.start, args.end, " (dry run)" if args.dry_run else "", complete, staged,
+    )
+    return True
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(threadName)s %(name)s: %(message)s"
+    )
+    sys.exit(0 if run_backfill(parse_args()) else 1)
@@ -0,0 +1,118 @@
+# cronjob/checkpoint.py
+"""
+On-disk checkpoints for a pipeline run.
+
+Each run gets an ID and a directory under CHECKPOINT_DIR holding one
+pickle per completed (source, stage) plus a manifest. A rerun picks up the
+newest unfinished run and resumes each source from its last completed
+stage; a finished run's directory is removed.
+"""
+
+import json
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from core.config import CHECKPOINT_DIR, CHECKPOINT_MAX_AGE_HOURS
+
+logger = logging.getLogger(__name__)
+
+STAGES = ("raw", "normalized", "pending", "pushed")
+
+
+class RunCheckpoint:
+    def __init__(self, run_id: str | None, root: str = CHECKPOINT_DIR):
+        # run_id=None → checkpointing disabled (e.g. dry runs)
+        self.run_id = run_id
+        self.dir    = os.path.join(root, run_id) if run_id else None
+        self._manifest = {"run_id": run_id, "started_at": None, "completed": {}}
+
+        if self.dir:
+            os.makedirs(self.dir, exist_ok=True)
+            if os.path.exists(self._manifest_path):
+                with open(self._manifest_path) as f:
+                    self._manifest = json.load(f)
+            else:
+                self._manifest["started_at"] = datetime.now().isoformat()
+                self._write_manifest()
+
+    @classmethod
+    def resume_or_start(
+        cls,
+        run_id: str | None = None,
+        fresh: bool = False,
+        root: str = CHECKPOINT_DIR,
+    ) -> "RunCheckpoint":
+        """Explicit run_id > newest unfinished run (if recent) > new run."""
+        if run_id:
+            return cls(run_id, root)
+
+        if not fresh and os.path.isdir(root):
+            cutoff = datetime.now() - timedelta(hours=CHECKPOINT_MAX_AGE_HOURS)
+            for name in sorted(os.listdir(root), reverse=True):
+                manifest = os.path.join(root, name, "manifest.json")
+                if not os.path.exists(manifest):
+                    continue
+                with open(manifest) as f:
+                    started = datetime.fromisoformat(json.load(f)["started_at"])
+                if started >= cutoff:
+                    logger.info("Resuming unfinished run %s", name)
+                    return cls(name, root)
+                logger.info("Abandoning stale run %s (started %s)", name, started)
+                shutil.rmtree(os.path.join(root, name), ignore_errors=True)
+
+        return cls(datetime.now().strftime("%Y%m%dT%H%M%S"), root)
+
+    @classmethod
+    def disabled(cls) -> "RunCheckpoint":
+        return cls(None)
+
+    # --- manifest ---
+
+    @property
+    def _manifest_path(self) -> str:
+        return os.path.join(self.dir, "manifest.json")
+
+    def _write_manifest(self) -> None:
+        tmp = self._manifest_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(self._manifest, f, indent=2)
+        os.replace(tmp, self._manifest_path)
+
+    def _frame_path(self, source: str, stage: str) -> str:
+        return os.path.join(self.dir, f"{source}.{stage}.pkl")
+
+    # --- stages ---
+
+    def has(self, source: str, stage: str) -> bool:
+        return stage in self._manifest["completed"].get(source, [])
+
+    def last_stage(self, source: str) -> str | None:
+        done = self._manifest["completed"].get(source, [])
+        return max(done, key=STAGES.index) if done else None
+
+    def load(self, source: str, stage: str) -> pd.DataFrame:
+        df = pd.read_pickle(self._frame_path(source, stage))
+        logger.info("[%s] %s: restored %d rows from run %s", source, stage, len(df), self.run_id)
+        return df
+
+    def save(self, source: str, stage: str, df: pd.DataFrame | None = None) -> None:
+        """Persist a stage's output (if any), then mark the stage complete."""
+        if not self.dir or self.has(source, stage):
+            return
+        if df is not None:
+            # write-then-rename so a crash never leaves a half-written frame
+            path = self._frame_path(source, stage)
+            df.to_pickle(path + ".tmp")
+            os.replace(path + ".tmp", path)
+        self._manifest["completed"].setdefault(source, []).append(stage)
+        self._write_manifest()
+
+    def finish(self) -> None:
+        """Whole run succeeded: checkpoints are no longer needed."""
+        if self.dir:
+            shutil.rmtree(self.dir, ignore_errors=True)
+            logger.info("Run %s complete; checkpoints removed", self.run_id)
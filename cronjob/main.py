@@ -1,43 +1,222 @@
 #!/usr/bin/env python3
 import logging
 import os
+from contextlib import ExitStack
 
+from core.archive           import archive_export, load_snapshot, prune_archive
+from core.db.locks          import advisory_lock
 from core.scrapers.crl      import scrape_crl
 from core.scrapers.i3       import scrape_i3
-from core.helpers import scrape_escreen
-from core.normalize.crl     import normalize       as normalize_crl
-from core.normalize.i3screen import normalize_i3screen
-from core.normalize.escreen import normalize_escreen
+from core.helpers           import parse_args, scrape_escreen, should_skip
+from core.normalize.aliases import save_learned_aliases
+from core.normalize         import crl, escreen, i3screen
+from core.normalize.crl     import transform_crl
+from core.normalize.i3screen import crm_code_map, transform_i3screen
+from core.normalize.escreen import ESCREEN_STAGING_FIELDS, crm_reference, load_escreen_export, transform_escreen
+from core.normalize.parallel import parallel_transform
+from core.normalize.load    import STAGING_FIELD_MAP, drain_outbox, stage_batch
+from core.services          import rate_limit
+from core.services.reference import replicate_reference
+from core.services.zoho     import zoho_client
+from cronjob.checkpoint     import RunCheckpoint
+from cronjob.run_index      import RunIndex
+
+logger = logging.getLogger("cronjob")
+
+SOURCES = ("crl", "i3", "escreen")
+
+LABELS = {"crl": "CRL", "i3": "i3Screen", "escreen": "eScreen"}
+
+TRANSFORMS = {
+    "crl":     transform_crl,
+    "i3":      transform_i3screen,
+    "escreen": transform_escreen,
+}
+
+# Raw CCFID columns, for partitioning a parallel transform
+RAW_CCFID_COLUMNS = {
+    "crl":     crl.RAW_CCFID_COLUMNS,
+    "i3":      i3screen.RAW_CCFID_COLUMNS,
+    "escreen": escreen.RAW_CCFID_COLUMNS,
+}
+
+STAGING_FIELDS = {
+    "crl":     STAGING_FIELD_MAP,
+    "i3":      STAGING_FIELD_MAP,
+    "escreen": ESCREEN_STAGING_FIELDS,
+}
+
+
+def scrape(source: str, download_dir: str, browser=None):
+    # `browser`: an already-running Playwright browser to reuse (scheduler)
+    if source == "crl":
+        return scrape_crl(browser=browser)
+    if source == "i3":
+        return scrape_i3(browser=browser)
+    xlsx_path = scrape_escreen(download_dir)
+    return load_escreen_export(xlsx_path, download_dir)
+
+
+def refresh_reference() -> None:
+    """
+    Pull reference-module changes from Zoho, then drop the in-memory copies
+    so lookups and fuzzy matching see them. A failure here is not fatal:
+    the run continues on the tables as they are.
+    """
+    try:
+        changed = replicate_reference()
+    except Exception:
+        logger.exception("Reference replication failed; using existing tables")
+        return
+    if any(changed.values()):
+        zoho_client.sites.refresh()
+        crm_code_map.cache_clear()
+        crm_reference.cache_clear()
+
+
+def normalize_source(source: str, ckpt: RunCheckpoint, args, download_dir: str, browser=None, archive: bool = True):
+    """
+    raw → normalized, skipping any stage the checkpoint already has.
+    archive=False: don't snapshot a fresh scrape (the scheduler keeps one a day).
+    """
+    # 1) Raw export: checkpoint > archived snapshot (--skip-*-scrape) > live scrape
+    if ckpt.has(source, "raw"):
+        raw = ckpt.load(source, "raw")
+    elif should_skip(source, args):
+        logger.info("[%s] Skipping scrape; using latest archived snapshot", source)
+        raw = load_snapshot(source)
+    else:
+        raw = scrape(source, download_dir, browser)
+        if archive:
+            archive_export(source, raw)
+    ckpt.save(source, "raw", raw)
+
+    # 2) Normalized MASTER_COLUMNS frame
+    if ckpt.has(source, "normalized"):
+        normalized = ckpt.load(source, "normalized")
+    else:
+        normalized = parallel_transform(TRANSFORMS[source], raw, RAW_CCFID_COLUMNS[source])
+    ckpt.save(source, "normalized", normalized)
+    if not args.dry_run:
+        save_learned_aliases()
+    return normalized
+
+
+def load_source(source: str, normalized, ckpt: RunCheckpoint, args, index: RunIndex | None = None) -> None:
+    """normalized → pending → pushed; `index` drops CCFIDs another source owns."""
+    # 3) Split, sync sites, stage incompletes & queue completes → pending push set
+    if ckpt.has(source, "pending"):
+        pending = ckpt.load(source, "pending")
+    else:
+        if index is not None:
+            normalized = index.owned(source, normalized)
+        pending, _ = stage_batch(normalized, STAGING_FIELDS[source], dry_run=args.dry_run, source=source)
+    ckpt.save(source, "pending", pending)
+
+    # 4) Push completes to Zoho
+    if args.dry_run:
+        logger.info("[%s] Dry run: %d complete records not pushed", source, len(pending))
+        return
+    if not ckpt.has(source, "pushed"):
+        # The completes are already in the outbox (with any earlier backlog);
+        # whatever Zoho can't take now is retried by the next drain
+        drain_outbox()
+    ckpt.save(source, "pushed")
+
+
+def run_source(source: str, ckpt: RunCheckpoint, args, download_dir: str, browser=None, archive: bool = True) -> None:
+    """
+    raw → normalized → pending → pushed for one source on its own,
+    skipping any stage the checkpoint already has.
+    """
+    if ckpt.has(source, "pushed"):
+        logger.info("[%s] Already completed in run %s", source, ckpt.run_id)
+        return
+    normalized = normalize_source(source, ckpt, args, download_dir, browser, archive)
+    load_source(source, normalized, ckpt, args)
+
+
+def run_pipeline(args=None):
 
-def run_pipeline():
-    
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)s %(name)s: %(message)s"
     )
-
-    logger = logging.getLogger("cronjob")
+    if args is None:
+        args = parse_args()
 
     # --- ensure download dir exists for eScreen ---
     download_dir = os.environ.get("DOWNLOAD_DIR", os.path.abspath("core/downloads"))
     os.makedirs(download_dir, exist_ok=True)
 
-    # 1) CRL
-    logger.info("=== CRL pipeline ===")
-    raw_crl = scrape_crl()
-    complete_crl, staging_crl = normalize_crl(raw_crl)
+    if args.dry_run:
+        ckpt = RunCheckpoint.disabled()
+    else:
+        ckpt = RunCheckpoint.resume_or_start(args.run_id, fresh=args.fresh)
+        logger.info("Run %s", ckpt.run_id)
+        rate_limit.configure(run_id=ckpt.run_id)
+
+    if not args.dry_run:
+        refresh_reference()
+
+    # Each source's lock is held from its normalize through its load, so the
+    # scheduler can't poll it in between. All sources are normalized first,
+    # so the run index can give each CCFID to one source before anything is
+    # staged or pushed
+    failed     = []
+    skipped    = []
+    normalized = {}
+    with ExitStack() as locks:
+        for source in SOURCES:
+            logger.info("=== %s pipeline ===", LABELS[source])
+            try:
+                if not locks.enter_context(advisory_lock(f"pipeline:{source}")):
+                    # The scheduler (or another run) has this source right now and
+                    # will load it itself, so this isn't a failure (as in poll)
+                    logger.info("%s pipeline already running elsewhere; skipping", LABELS[source])
+                    skipped.append(source)
+                    continue
+                if ckpt.has(source, "pushed"):
+                    logger.info("[%s] Already completed in run %s", source, ckpt.run_id)
+                    # Still indexed, so later sources don't redo its CCFIDs
+                    if ckpt.has(source, "normalized"):
+                        normalized[source] = ckpt.load(source, "normalized")
+                    continue
+                normalized[source] = normalize_source(source, ckpt, args, download_dir)
+            except Exception:
+                logger.exception(
+                    "%s pipeline failed (last completed stage: %s)",
+                    LABELS[source], ckpt.last_stage(source) or "none",
+                )
+                failed.append(source)
+
+        index = RunIndex.build(normalized)
+
+        for source, frame in normalized.items():
+            if ckpt.has(source, "pushed"):
+                continue
+            try:
+                load_source(source, frame, ckpt, args, index)
+            except Exception:
+                logger.exception(
+                    "%s pipeline failed (last completed stage: %s)",
+                    LABELS[source], ckpt.last_stage(source) or "none",
+                )
+                failed.append(source)
 
-    # 2) i3Screen
-    logger.info("=== i3Screen pipeline ===")
-    raw_i3 = scrape_i3()
-    complete_i3, staging_i3 = normalize_i3screen(raw_i3)
+    if not args.dry_run:
+        prune_archive()
+        for lane, (calls, credits) in rate_limit.run_usage(ckpt.run_id).items():
+            logger.info("Zoho %s usage for run %s: %d calls, ~%d credits", lane, ckpt.run_id, calls, credits)
 
-    # 3) eScreen
-    logger.info("=== eScreen pipeline ===")
-    xlsx_path = scrape_escreen(download_dir)  
-    complete_es, staging_es = normalize_escreen(xlsx_path, download_dir)
+    if skipped:
+        logger.info("Run %s skipped %s (running elsewhere)", ckpt.run_id, ", ".join(skipped))
+    if failed:
+        logger.error("Run %s incomplete (%s); rerun to resume", ckpt.run_id, ", ".join(failed))
+        raise SystemExit(1)
 
+    ckpt.finish()
     logger.info("=== All pipelines complete ===")
 
 if __name__ == "__main__":
-    run_pipeline()
\ No newline at end of file
+    run_pipeline()
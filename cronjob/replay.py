@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Re-run normalize/load on an archived raw export, without a browser.
+
+    python -m cronjob.replay crl                      # latest CRL snapshot
+    python -m cronjob.replay i3 --date 2025-07-14     # that day's snapshot
+    python -m cronjob.replay escreen --dry-run        # map & split only, no writes
+"""
+import argparse
+import logging
+from datetime import date
+
+from core.archive import SOURCES, load_snapshot
+
+
+def _normalizer(source: str):
+    # Imported lazily: each normalizer loads its CRM reference data on import
+    if source == "crl":
+        from core.normalize.crl import normalize
+        return normalize
+    if source == "i3":
+        from core.normalize.i3screen import normalize_i3screen
+        return normalize_i3screen
+    from core.normalize.escreen import normalize_escreen
+    return normalize_escreen
+
+
+def parse_args(argv=None):
+    p = argparse.ArgumentParser(description="Replay the pipeline from an archived snapshot")
+    p.add_argument("source", choices=SOURCES)
+    p.add_argument("--date", type=date.fromisoformat, help="Snapshot day (YYYY-MM-DD); default latest")
+    p.add_argument("--dry-run", action="store_true", help="Normalize only; no Zoho or DB writes")
+    return p.parse_args(argv)
+
+
+def replay(source: str, on: date | None = None, dry_run: bool = False):
+    logger = logging.getLogger("cronjob.replay")
+
+    raw = load_snapshot(source, on)
+    summary = _normalizer(source)(raw, dry_run=dry_run, lean=True)
+    logger.info(
+        "Replayed %s%s: %d complete (%d pushed), %d new staging",
+        source, " (dry run)" if dry_run else "", summary.complete, summary.pushed, summary.staged,
+    )
+    return summary
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    args = parse_args()
+    replay(args.source, args.date, args.dry_run)
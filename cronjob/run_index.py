@@ -0,0 +1,65 @@
+# cronjob/run_index.py
+"""
+Run-scoped CCFID index shared by all sources.
+
+The same specimen can turn up in more than one export (a CRL lab result
+for a collection ordered through i3Screen, say). Once every source of a
+run is normalized, each CCFID is assigned to one owning source by
+SOURCE_PRIORITY, and every other source drops its copy before the load
+stage, so each CCFID is staged or pushed once per run. The index is
+rebuilt from the normalized frames, so a resumed run gets the same owners.
+Between runs (and for scheduler polls, which load one source at a time)
+the outbox applies the same priority to queued rows (core/db/outbox.py).
+"""
+
+import logging
+
+import pandas as pd
+
+from core.config import SOURCE_PRIORITY
+
+logger = logging.getLogger(__name__)
+
+
+def _key(ccfids: pd.Series) -> pd.Series:
+    """CCFIDs as Zoho stores them (stripped), as split_batch and the outbox match them."""
+    return ccfids.fillna("").astype(str).str.strip()
+
+
+class RunIndex:
+    def __init__(self, owners: pd.Series | None = None):
+        # stripped CCFID → owning source
+        self.owners = owners if owners is not None else pd.Series(dtype=object)
+
+    @classmethod
+    def build(cls, frames: dict[str, pd.DataFrame], priority=SOURCE_PRIORITY) -> "RunIndex":
+        """Owner of each CCFID in `frames`: its highest-priority source."""
+        rank  = {source: i for i, source in enumerate(priority)}
+        parts = [
+            pd.DataFrame({"ccfid": _key(df["CCFID"]), "source": source, "rank": rank.get(source, len(rank))})
+            for source, df in frames.items()
+            if not df.empty
+        ]
+        if not parts:
+            return cls()
+
+        claims = pd.concat(parts, ignore_index=True)
+        claims = claims.loc[claims["ccfid"] != ""]
+        claims = claims.sort_values("rank", kind="stable").drop_duplicates("ccfid")
+        owners = claims.set_index("ccfid")["source"]
+
+        logger.info("Run index: %d CCFIDs across %d sources", len(owners), len(parts))
+        return cls(owners)
+
+    def owned(self, source: str, df: pd.DataFrame) -> pd.DataFrame:
+        """Rows of `source`'s frame whose CCFID no other source owns this run."""
+        if df.empty or self.owners.empty:
+            return df
+        owner = _key(df["CCFID"]).map(self.owners)
+        keep  = owner.isna() | (owner == source)
+        if not keep.all():
+            logger.info(
+                "[%s] %d CCFIDs belong to another source this run; dropped (%s)",
+                source, (~keep).sum(), owner[~keep].value_counts().to_dict(),
+            )
+        return df.loc[keep]
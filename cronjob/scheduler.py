@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Resident scheduler: polls each source on its own interval from one
+long-lived process, instead of a fresh `cronjob.main` per run.
+
+Imports, the DB pool, the Zoho session, the reference caches and a
+Chromium instance all stay warm between polls. Each job runs on its
+interval plus random jitter. A job never overlaps itself: a run that
+overruns just delays the next one, and a Postgres advisory lock per source
+keeps a manual `cronjob.main` run and the scheduler from working on the
+same source at once.
+
+Polls don't checkpoint: each one is small and pushes are upserts, so a
+failed poll is simply redone on the next tick. Nor does every poll archive
+its export: a source's first successful scrape of the day is snapshotted,
+the rest would only repeat it.
+
+    python -m cronjob.scheduler
+"""
+import logging
+import os
+import random
+import signal
+import threading
+import time
+from datetime import date
+
+from core.archive          import list_snapshots, prune_archive
+from core.config           import (
+    SCHEDULE_ARCHIVE_MINUTES,
+    SCHEDULE_CRL_MINUTES,
+    SCHEDULE_ESCREEN_MINUTES,
+    SCHEDULE_I3_MINUTES,
+    SCHEDULE_JITTER_SECONDS,
+    SCHEDULE_OUTBOX_MINUTES,
+    SCHEDULE_REFERENCE_MINUTES,
+)
+from core.db.locks          import advisory_lock
+from core.db.staging        import archive_staging
+from core.helpers           import parse_args
+from core.normalize.load    import drain_outbox
+from core.scrapers.browser  import WarmBrowser
+from core.services          import rate_limit
+from cronjob.checkpoint     import RunCheckpoint
+from cronjob.main           import LABELS, refresh_reference, run_source
+
+logger = logging.getLogger("cronjob.scheduler")
+
+PRUNE_MINUTES = 24 * 60
+
+
+class Job:
+    def __init__(self, name: str, minutes: int, func):
+        self.name     = name
+        self.interval = minutes * 60
+        self.func     = func
+        self.next_run = time.monotonic() + random.uniform(0, SCHEDULE_JITTER_SECONDS)
+        self.runs     = 0
+        self.failures = 0
+
+    def reschedule(self) -> None:
+        # From the end of this run, so an overrun never stacks up runs
+        self.next_run = time.monotonic() + self.interval + random.uniform(0, SCHEDULE_JITTER_SECONDS)
+
+
+class Scheduler:
+    def __init__(self):
+        self.browser      = WarmBrowser()
+        self.args         = parse_args([])
+        self.download_dir = os.environ.get("DOWNLOAD_DIR", os.path.abspath("core/downloads"))
+        self._stop        = threading.Event()
+        os.makedirs(self.download_dir, exist_ok=True)
+        rate_limit.configure(run_id="scheduler")
+
+        self.jobs = [
+            Job("reference", SCHEDULE_REFERENCE_MINUTES, refresh_reference),
+            Job("crl",       SCHEDULE_CRL_MINUTES,       lambda: self.poll("crl")),
+            Job("i3",        SCHEDULE_I3_MINUTES,        lambda: self.poll("i3")),
+            Job("escreen",   SCHEDULE_ESCREEN_MINUTES,   lambda: self.poll("escreen")),
+            Job("outbox",    SCHEDULE_OUTBOX_MINUTES,    drain_outbox),
+            Job("archive",   SCHEDULE_ARCHIVE_MINUTES,   archive_staging),
+            Job("prune",     PRUNE_MINUTES,              prune_archive),
+        ]
+
+    def poll(self, source: str) -> None:
+        with advisory_lock(f"pipeline:{source}") as got:
+            if not got:
+                logger.info("%s is already running elsewhere; skipping this poll", LABELS[source])
+                return
+            browser = self.browser.get() if source in ("crl", "i3") else None
+            # One raw snapshot per source per day, however often it's polled
+            archive = not any(ts.date() == date.today() for ts, _ in list_snapshots(source))
+            run_source(source, RunCheckpoint.disabled(), self.args, self.download_dir, browser, archive)
+
+    def run_job(self, job: Job) -> None:
+        started = time.monotonic()
+        try:
+            job.func()
+        except Exception:
+            job.failures += 1
+            logger.exception("Job %s failed (%d of %d runs)", job.name, job.failures, job.runs + 1)
+        finally:
+            job.runs += 1
+            job.reschedule()
+        logger.info(
+            "Job %s finished in %.1fs; next in %.0fs",
+            job.name, time.monotonic() - started, job.next_run - time.monotonic(),
+        )
+
+    def stop(self, *_) -> None:
+        logger.info("Stopping after the current job...")
+        self._stop.set()
+
+    def run_forever(self) -> None:
+        signal.signal(signal.SIGTERM, self.stop)
+        signal.signal(signal.SIGINT,  self.stop)
+        logger.info(
+            "Scheduler up: %s",
+            ", ".join(f"{j.name} every {j.interval // 60}m" for j in self.jobs),
+        )
+        try:
+            while not self._stop.is_set():
+                job  = min(self.jobs, key=lambda j: j.next_run)
+                wait = job.next_run - time.monotonic()
+                if wait > 0:
+                    # Wakes early on stop()
+                    self._stop.wait(wait)
+                    continue
+                self.run_job(job)
+        finally:
+            self.browser.close()
+            logger.info("Scheduler stopped")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s"
+    )
+    Scheduler().run_forever()
@@ -0,0 +1,33 @@
+# gunicorn.conf.py
+"""
+Gunicorn settings for the web container:
+
+    gunicorn -c gunicorn.conf.py webapp.wsgi:app
+
+The app is imported once in the master (preload_app) and every worker is
+forked from it, so a new or recycled worker serves as soon as it forks.
+The web app imports nothing heavy at boot (pandas and the Zoho/normalizer
+stack load on a worker's first send); core/scripts/bench_web_startup.py
+measures that. Each worker drops the DB pool it inherited, since a pooled
+connection must never be shared across processes, and workers are
+recycled after max_requests (jittered so they don't all restart at once).
+
+Every open worklist tab holds one thread for its /worklist/stream, up to
+LIVE_MAX_STREAMS per worker, so WEB_THREADS must leave room above that for
+ordinary requests, sends and exports: size WEB_CONCURRENCY x
+LIVE_MAX_STREAMS for the tabs you expect to be open.
+"""
+import os
+
+bind                = os.getenv("WEB_BIND", "0.0.0.0:5000")
+worker_class        = "gthread"
+workers             = int(os.getenv("WEB_CONCURRENCY", "2"))
+threads             = int(os.getenv("WEB_THREADS", "16"))
+preload_app         = True
+max_requests        = int(os.getenv("WEB_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.getenv("WEB_MAX_REQUESTS_JITTER", "100"))
+
+
+def post_fork(server, worker):
+    from core.db.session import dispose_after_fork
+    dispose_after_fork()
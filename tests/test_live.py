@@ -0,0 +1,64 @@
+"""WorklistBroker._replay: resuming a stream from its Last-Event-ID."""
+from collections import deque
+import queue
+
+import pytest
+
+from webapp.live import WorklistBroker
+
+
+@pytest.fixture
+def broker():
+    b = WorklistBroker()
+    b._epoch  = "ep1"
+    b._recent = deque(maxlen=3)
+    for n in range(1, 6):
+        b.publish("upsert", {"ccfid": f"C{n}"})
+    # seq 5; events 3..5 kept
+    return b
+
+
+def replay(broker, last_event_id):
+    q = queue.Queue()
+    broker._replay(q, last_event_id)
+    return list(q.queue)
+
+
+def test_replays_what_was_missed(broker):
+    assert replay(broker, "ep1:3") == [
+        ("ep1:4", "upsert", {"ccfid": "C4"}),
+        ("ep1:5", "upsert", {"ccfid": "C5"}),
+    ]
+
+
+def test_oldest_kept_event_still_resumes(broker):
+    # Missed 3..5, all still kept
+    assert [i for i, _, _ in replay(broker, "ep1:2")] == ["ep1:3", "ep1:4", "ep1:5"]
+
+
+def test_up_to_date_gets_nothing(broker):
+    assert replay(broker, "ep1:5") == []
+
+
+@pytest.mark.parametrize("last_event_id", [
+    "ep1:1",        # event 2 is gone
+    "ep0:5",        # an earlier listener connection
+    "ep1:x",
+    "ep1",
+    "garbage",
+])
+def test_reload_when_events_cant_be_replayed(broker, last_event_id):
+    assert replay(broker, last_event_id) == [(None, "reload", {})]
+
+
+def test_reload_before_any_listener():
+    # No epoch yet, so no ID can be resumed
+    assert replay(WorklistBroker(), "None:0") == [(None, "reload", {})]
+
+
+def test_new_epoch_after_reconnect_reloads(broker):
+    broker._epoch = "ep2"
+    broker._seq   = 0
+    broker._recent.clear()
+    assert replay(broker, "ep1:5") == [(None, "reload", {})]
+    assert replay(broker, "ep2:0") == []
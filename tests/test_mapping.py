@@ -0,0 +1,102 @@
+"""
+map_values/map_dates/complete_mask against the row-wise .apply and
+is_complete they replaced, on mixed-type columns with NaN, None, blanks
+and categoricals.
+"""
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.helpers import complete_mask, is_complete
+from core.normalize.common import (
+    MASTER_COLUMNS, map_dates, map_reason, map_regulation, map_result,
+    map_values, parse_name, safe_date_parse, to_zoho_date,
+)
+
+MIXED = [
+    "Negative", " negative ", "", "   ", None, np.nan, 1, 1.0, True, "1",
+    "DOT", "dot", 0, False, "Negative", None, "03/04/2025", "2025-03-04",
+]
+
+COLUMNS = {
+    "object":      pd.Series(MIXED, dtype=object),
+    "strings":     pd.Series(["DOT", "", np.nan, "yes", "DOT", None], dtype=object),
+    "categorical": pd.Series(["DOT", None, "yes", "", "DOT"], dtype="category"),
+    "float":       pd.Series([1.0, np.nan, 1.0, 2.5]),
+    "int":         pd.Series([3, 1, 3]),
+    "empty":       pd.Series([], dtype=object),
+}
+
+
+def describe(val):
+    """Tells apart values that compare equal (1, 1.0, True; None, NaN)."""
+    return type(val).__name__, repr(val)
+
+
+def old_apply(series, func):
+    # Categoricals went through .astype(object) first (categorical .apply skips NaN)
+    return series.astype(object).apply(func)
+
+
+@pytest.mark.parametrize("kind", COLUMNS)
+@pytest.mark.parametrize("func", [describe, map_reason, map_result, map_regulation, parse_name])
+def test_map_values_matches_apply(kind, func):
+    series = COLUMNS[kind]
+    if func is parse_name and kind in ("object", "int", "float"):
+        pytest.skip("parse_name only takes strings")
+
+    new = map_values(series, func)
+
+    assert new.dtype == object
+    assert new.index.equals(series.index)
+    assert new.tolist() == old_apply(series, func).tolist()
+
+
+@pytest.mark.parametrize("kind", ["object", "strings", "categorical"])
+def test_map_dates_matches_apply(kind):
+    series = COLUMNS[kind]
+    old = series.astype(object).apply(safe_date_parse).apply(to_zoho_date)
+    assert map_dates(series).tolist() == old.tolist()
+
+
+def test_map_values_keeps_index_and_name():
+    series = pd.Series(["a", None, "a"], index=[10, 5, 7], name="Result")
+    new = map_values(series, describe)
+    assert new.index.tolist() == [10, 5, 7]
+    assert new.name == "Result"
+
+
+def test_complete_mask_matches_is_complete():
+    rng  = np.random.default_rng(0)
+    # The normalizers always fill Test_Type/Test_Result/Regulation with
+    # strings (is_complete can't take NaN there); the rest can be anything
+    pool = {
+        "Test_Type":   ["POCT Urine Test", "Alcohol Breath Test", "Lab Urine Test", ""],
+        "Test_Result": ["Positive", "Positive-Dilute", "Negative", " "],
+        "Regulation":  ["DOT", "Non-DOT", ""],
+        "Code":        ["A1310", "B200", "", None],
+    }
+    filler = ["x", "", " ", "None", "nan", None, np.nan, 0]
+    rows = []
+    for _ in range(400):
+        row = {c: filler[rng.integers(len(filler))] for c in MASTER_COLUMNS}
+        for c, values in pool.items():
+            row[c] = values[rng.integers(len(values))]
+        rows.append(row)
+    # Plus rows that have everything, which is where the skip rules matter
+    for _ in range(100):
+        row = {c: "x" for c in MASTER_COLUMNS}
+        for c, values in pool.items():
+            row[c] = values[rng.integers(len(values))]
+        for c in ("Location", "Laboratory", "BAT_Value", "Positive_For", "Regulation_Body"):
+            if c in row and rng.random() < 0.5:
+                row[c] = ""
+        rows.append(row)
+    frame = pd.DataFrame(rows, columns=MASTER_COLUMNS)
+    frame["Test_Result"] = frame["Test_Result"].astype("category")
+
+    old = frame.astype(object).apply(is_complete, axis=1)
+    new = complete_mask(frame)
+
+    assert new.tolist() == old.tolist()
+    assert 0 < new.sum() < len(frame)
@@ -0,0 +1,32 @@
+"""zoho_outbox: the table create_all builds accepts the enqueue INSERT."""
+import re
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateTable
+
+from core.db.models import ZohoOutbox
+from core.db.outbox import _ENQUEUE
+
+
+def table_columns() -> dict[str, str]:
+    """{column: its line of the CREATE TABLE} as create_all would emit it."""
+    ddl = str(CreateTable(ZohoOutbox.__table__).compile(dialect=postgresql.dialect()))
+    lines = (line.strip().rstrip(",") for line in ddl.splitlines())
+    return {line.split()[0]: line for line in lines if line and not line.startswith(("CREATE", "PRIMARY", ")"))}
+
+
+def test_enqueue_leaves_out_only_nullable_or_defaulted_columns():
+    inserted = re.search(r"INSERT INTO zoho_outbox \(([^)]*)\)", str(_ENQUEUE)).group(1)
+    inserted = {c.strip() for c in inserted.split(",")}
+
+    columns = table_columns()
+    assert inserted <= set(columns)
+    for name, line in columns.items():
+        if name not in inserted and "NOT NULL" in line:
+            assert "DEFAULT" in line, f"{name} is NOT NULL with no default: {line}"
+
+
+def test_counters_default_to_zero_in_the_database():
+    columns = table_columns()
+    for name in ("attempts", "rejections"):
+        assert "DEFAULT 0" in columns[name]
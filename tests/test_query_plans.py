@@ -0,0 +1,82 @@
+"""
+Query-plan regression test for the worklist queries.
+
+EXPLAINs each hot query against the database in DB_* (core.config) with
+sequential scans discouraged and fails if worklist_staging isn't read
+through the expected partial index, e.g. because a query's filter no
+longer matches the index predicate or a migration didn't run. Small tables
+would be seq-scanned anyway, so this checks that the index *can* serve the
+query, not the plan a given table size happens to get. Skipped when the
+database isn't reachable.
+
+    python -m pytest tests/test_query_plans.py
+"""
+import json
+from datetime import date, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.dialects import postgresql
+
+from core.config import DB_HOST
+
+if not DB_HOST:
+    # core.db.session can't even build its engine without DB_*
+    pytest.skip("no database configured (DB_HOST)", allow_module_level=True)
+
+from core.db.session import SessionLocal, engine      # noqa: E402
+from core.db.staging import unreviewed_items          # noqa: E402
+from webapp.export   import export_query              # noqa: E402
+
+UNREVIEWED_INDEXES = {"ix_worklist_staging_unreviewed", "ix_worklist_staging_unreviewed_collection_date"}
+
+
+def queries(db):
+    """name → (statement, index names that may serve worklist_staging)"""
+    today = date.today()
+    return {
+        "worklist page": (
+            unreviewed_items(db).statement,
+            {"ix_worklist_staging_unreviewed"},
+        ),
+        "unreviewed export, last 30 days": (
+            export_query("unreviewed", date_from=today - timedelta(days=30), date_to=today),
+            UNREVIEWED_INDEXES,
+        ),
+    }
+
+
+def _scans(node, found):
+    """Collect (node type, relation, index) for every scan in a JSON plan."""
+    if "Relation Name" in node:
+        found.append((node["Node Type"], node["Relation Name"], node.get("Index Name")))
+    for child in node.get("Plans", []):
+        _scans(child, found)
+    return found
+
+
+@pytest.fixture(scope="module")
+def db():
+    try:
+        with engine.connect():
+            pass
+    except Exception as exc:
+        pytest.skip(f"database not reachable: {exc.__class__.__name__}")
+    with SessionLocal() as db:
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        yield db
+        db.rollback()
+
+
+@pytest.mark.parametrize("name", ["worklist page", "unreviewed export, last 30 days"])
+def test_worklist_staging_read_through_partial_index(db, name):
+    stmt, allowed = queries(db)[name]
+    sql  = stmt.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+    plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    scans = [s for s in _scans(plan[0]["Plan"], []) if s[1] == "worklist_staging"]
+    assert scans, f"{name}: worklist_staging not in the plan"
+    bad = [s for s in scans if s[2] not in allowed]
+    assert not bad, f"{name}: worklist_staging read via {bad}; expected one of {sorted(allowed)}"
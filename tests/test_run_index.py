@@ -0,0 +1,59 @@
+"""RunIndex: which source owns a CCFID that several exports carry."""
+import pandas as pd
+
+from cronjob.run_index import RunIndex
+
+PRIORITY = ["crl", "i3", "escreen"]
+
+
+def frame(*ccfids):
+    return pd.DataFrame({"CCFID": list(ccfids), "Name": [f"row {c}" for c in ccfids]})
+
+
+def test_highest_priority_source_owns_each_ccfid():
+    index = RunIndex.build({
+        "escreen": frame("A", "B", "C"),
+        "i3":      frame("B", "C", "D"),
+        "crl":     frame("C"),
+    }, priority=PRIORITY)
+
+    assert index.owners.to_dict() == {"C": "crl", "B": "i3", "D": "i3", "A": "escreen"}
+    assert index.owned("escreen", frame("A", "B", "C"))["CCFID"].tolist() == ["A"]
+    assert index.owned("i3", frame("B", "C", "D"))["CCFID"].tolist() == ["B", "D"]
+    assert index.owned("crl", frame("C"))["CCFID"].tolist() == ["C"]
+
+
+def test_whitespace_variants_are_one_ccfid():
+    index = RunIndex.build({"i3": frame("123"), "crl": frame("123 ", " 456")}, priority=PRIORITY)
+
+    assert index.owners.to_dict() == {"123": "crl", "456": "crl"}
+    assert index.owned("i3", frame("123", " 123"))["CCFID"].tolist() == []
+    assert index.owned("crl", frame("123 "))["CCFID"].tolist() == ["123 "]
+
+
+def test_unlisted_source_ranks_last():
+    index = RunIndex.build({"manual": frame("A", "B"), "escreen": frame("B")}, priority=PRIORITY)
+    assert index.owners.to_dict() == {"B": "escreen", "A": "manual"}
+
+
+def test_blank_ccfids_are_never_claimed():
+    index = RunIndex.build({"crl": frame("", None, " "), "i3": frame("", "E")}, priority=PRIORITY)
+
+    assert index.owners.to_dict() == {"E": "i3"}
+    # Blank rows stay with their own source (the load stage deals with them)
+    assert len(index.owned("i3", frame("", "E"))) == 2
+
+
+def test_rows_keep_their_index_and_columns():
+    df    = frame("A", "B").set_axis([7, 3])
+    index = RunIndex.build({"crl": frame("B"), "i3": df}, priority=PRIORITY)
+
+    owned = index.owned("i3", df)
+    assert owned.index.tolist() == [7]
+    assert list(owned.columns) == ["CCFID", "Name"]
+
+
+def test_empty_index_keeps_everything():
+    df = frame("A")
+    assert RunIndex.build({"crl": frame()}, priority=PRIORITY).owned("crl", df) is df
+    assert RunIndex().owned("i3", df) is df
@@ -0,0 +1,67 @@
+"""read_export: header detection and column types, on both CSV readers."""
+import pandas as pd
+import pytest
+
+from core.normalize import schemas
+from core.normalize.schemas import CRL_SCHEMA, ESCREEN_SCHEMA, I3_SCHEMA, read_export
+
+
+@pytest.fixture(params=["arrow", "pandas"])
+def engine(request, monkeypatch):
+    if request.param == "pandas":
+        def no_arrow(*args, **kwargs):
+            raise ImportError("pyarrow disabled for this test")
+        monkeypatch.setattr(schemas, "_read_arrow", no_arrow)
+    else:
+        pytest.importorskip("pyarrow")
+    return request.param
+
+
+def write(tmp_path, text: str) -> str:
+    path = tmp_path / "export.csv"
+    path.write_text(text)
+    return str(path)
+
+
+def test_header_below_blank_lines(tmp_path, engine):
+    path = write(tmp_path, (
+        "eScreen Results\n"
+        "\n"
+        ",,\n"
+        "Run on 2025-03-04,,\n"
+        "\n"
+        "Donor Name,COC,Result\n"
+        '"Doe, John",E1,Negative\n'
+        "\n"
+        '"Roe, Jane",E2,Positive\n'
+    ))
+    # Row index as csv.reader (and find_escreen_header_row) counts it
+    df = read_export(path, ESCREEN_SCHEMA, header=5)
+
+    assert list(df.columns) == ["Donor Name", "COC", "Result"]
+    assert df["COC"].tolist() == ["E1", "E2"]
+    assert df["Result"].astype(object).tolist() == ["Negative", "Positive"]
+
+
+def test_id_columns_stay_text(tmp_path, engine):
+    crl = read_export(write(tmp_path, (
+        "Reference ID,Company Code,Site ID,MRO Result\n"
+        "0012345,00123,00042,Negative\n"
+        "5551,,,\n"
+    )), CRL_SCHEMA)
+
+    assert crl["Reference ID"].tolist() == ["0012345", "5551"]
+    assert crl["Company Code"].iloc[0] == "00123"
+    assert crl["Site ID"].iloc[0] == "00042"
+    assert pd.isna(crl["Company Code"].iloc[1]) and pd.isna(crl["Site ID"].iloc[1])
+    assert isinstance(crl["MRO Result"].dtype, pd.CategoricalDtype)
+
+    i3 = read_export(write(tmp_path, (
+        "CCF / Test Number,Org ID\n"
+        "0099,77\n"
+        ",78\n"
+    )), I3_SCHEMA)
+
+    assert i3["CCF / Test Number"].iloc[0] == "0099"
+    assert pd.isna(i3["CCF / Test Number"].iloc[1])
+    assert i3["Org ID"].tolist() == [77, 78]
@@ -0,0 +1,81 @@
+"""batch_update_staging: the statement and parameters it builds, and what it rejects."""
+from datetime import date
+from types import SimpleNamespace
+
+import pytest
+
+from core.db.staging import EDITABLE_FIELDS, batch_update_staging
+
+
+class FakeConn:
+    """Records the one execute() and returns `rows` as RETURNING results."""
+    def __init__(self, rows=()):
+        self.rows  = rows
+        self.calls = []
+
+    def execute(self, stmt, params):
+        self.calls.append((str(stmt), params))
+        return [SimpleNamespace(_mapping=r) for r in self.rows]
+
+
+def test_rows_patch_different_fields():
+    conn = FakeConn(rows=[{"ccfid": "A", "last_name": "Doe"}])
+
+    out = batch_update_staging(conn, [
+        {"ccfid": "A", "last_name": "  Doe ", "collection_date": "2025-07-14T00:00:00"},
+        {"ccfid": "B", "positive_for": ["THC", "COC"]},
+    ])
+
+    assert out == [{"ccfid": "A", "last_name": "Doe"}]
+    [(sql, params)] = conn.calls
+    # Fields in first-seen order: v0 last_name, v1 collection_date, v2 positive_for
+    assert params == {
+        "c0": "A",
+        "v0_0": "Doe", "s0_0": True,
+        "v0_1": date(2025, 7, 14), "s0_1": True,
+        "v0_2": None, "s0_2": False,
+        "c1": "B",
+        "v1_0": None, "s1_0": False,
+        "v1_1": None, "s1_1": False,
+        "v1_2": "THC;COC", "s1_2": True,
+    }
+    assert "last_name = CASE WHEN v.s0 THEN v.v0 ELSE t.last_name END" in sql
+    assert "CAST(:v0_1 AS date)" in sql
+    assert "AS v(ccfid, v0, s0, v1, s1, v2, s2)" in sql
+    assert "RETURNING t.*" in sql
+
+
+def test_blank_values_clear_the_field():
+    conn = FakeConn()
+    batch_update_staging(conn, [{"ccfid": "A", "location": "   ", "mro_received": ""}])
+    params = conn.calls[0][1]
+    assert params["v0_0"] is None and params["s0_0"] is True
+    assert params["v0_1"] is None and params["s0_1"] is True
+
+
+def test_every_editable_field_is_accepted():
+    conn  = FakeConn()
+    patch = {"ccfid": "A", **{f: "2025-01-02" for f in EDITABLE_FIELDS}}
+    batch_update_staging(conn, [patch])
+    assert len(conn.calls) == 1
+
+
+@pytest.mark.parametrize("patches, message", [
+    ([{"last_name": "Doe"}],                              "needs a ccfid"),
+    ([{"ccfid": "A", "reviewed": True}],                  "'reviewed' is not an editable field"),
+    ([{"ccfid": "A", "CCFID": "B"}],                      "'CCFID' is not an editable field"),
+    ([{"ccfid": "A"}],                                    "don't change any fields"),
+    ([{"ccfid": "A", "panel": "x"}, {"ccfid": "A", "panel": "y"}], "patched more than once"),
+    ([{"ccfid": "A", "collection_date": "14/07/2025"}],   "A: bad collection_date"),
+])
+def test_bad_patches_raise_before_executing(patches, message):
+    conn = FakeConn()
+    with pytest.raises(ValueError, match=message):
+        batch_update_staging(conn, patches)
+    assert conn.calls == []
+
+
+def test_no_patches_no_query():
+    conn = FakeConn()
+    assert batch_update_staging(conn, []) == []
+    assert conn.calls == []
@@ -0,0 +1,49 @@
+"""ZohoClient: per-record result classification and send_frame's outcome keys."""
+import pandas as pd
+import pytest
+
+from core.services import zoho
+from core.services.zoho import ZohoClient
+
+
+@pytest.mark.parametrize("result, kind", [
+    ({"status": "success", "code": "SUCCESS", "action": "insert"}, "created"),
+    ({"status": "success", "code": "SUCCESS", "action": "update"}, "updated"),
+    # Plain inserts (no upsert) don't say which
+    ({"status": "success", "code": "SUCCESS"},                      "created"),
+    ({"status": "error", "code": "DUPLICATE_DATA"},                 "duplicate"),
+    ({"status": "error", "code": "INVALID_DATA"},                   "failed"),
+    ({"status": "error", "code": "MANDATORY_NOT_FOUND"},            "failed"),
+    ({},                                                            "failed"),
+])
+def test_classify(result, kind):
+    assert ZohoClient._classify(result) == kind
+
+
+class _Response:
+    def __init__(self, data):
+        self._data = data
+
+    def json(self):
+        return {"data": self._data}
+
+
+def test_send_frame_reports_callers_keys(monkeypatch):
+    """Outcomes carry the key as given; uploaded_ccfid gets Zoho's stripped Name."""
+    client   = ZohoClient()
+    recorded = []
+    monkeypatch.setattr(client, "_build_payload",
+                        lambda f: ZohoClient._attach_lookup_ids(f, {}, {}, {}, {}))
+    monkeypatch.setattr(client, "_record_uploaded", recorded.extend)
+    monkeypatch.setattr(client, "_request", lambda *a, **kw: _Response([
+        {"status": "success", "action": "insert"},
+        {"status": "error", "code": "INVALID_DATA"},
+    ]))
+    monkeypatch.setattr(zoho.rate_limit, "record_credits", lambda n: 1)
+
+    outcome = client.send_frame(pd.DataFrame({"CCFID": [" 123 ", "456"]}), mode="insert")
+
+    assert outcome["created"] == [" 123 "]
+    assert outcome["failed"]  == ["456"]
+    assert outcome["kinds"]   == ["created", "failed"]
+    assert recorded == ["123"]
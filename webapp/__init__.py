@@ -10,6 +10,10 @@ def create_app(config_object="core.config"):
 
     app.secret_key = os.environ.get("SECRET_KEY", "dev-secret–change-me")
 
+    # Reviewer sends go ahead of cron/backfill traffic in the Zoho rate limiter
+    from core.services import rate_limit
+    rate_limit.configure(lane="interactive", run_id="web")
+
     # Example: register a simple blueprint
     from webapp.routes import bp
     app.register_blueprint(bp)
@@ -0,0 +1,172 @@
+# webapp/export.py
+"""
+Streaming worklist exports for auditors.
+
+Rows come off a server-side cursor (stream_results) a batch at a time and are
+written straight into the response, so memory stays flat and the first bytes
+go out before the query has finished, however many rows match. XLSX is
+written as a minimal SpreadsheetML package streamed through zipfile, rather
+than built in memory by a spreadsheet library.
+"""
+
+import csv
+import io
+import re
+import zipfile
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+from sqlalchemy import inspect, select, union_all
+
+from core.db.models  import UploadedCCFID, WorklistArchive, WorklistStaging
+from core.db.session import engine
+
+BATCH_ROWS = 2000
+
+COLUMNS = [c.name for c in WorklistStaging.__table__.columns]
+
+# Control characters XML 1.0 doesn't allow (they do turn up in scraped names)
+_XML_ILLEGAL = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def export_query(status: str = "unreviewed", company_code: str | None = None,
+                 date_from: date | None = None, date_to: date | None = None):
+    """
+    Staging rows to export. `status` is "unreviewed" (what the worklist
+    shows: not reviewed and not yet uploaded), "reviewed" or "all"; the
+    latter two include rows already moved to worklist_archive.
+    """
+    if status not in ("unreviewed", "reviewed", "all"):
+        raise ValueError(f"status must be unreviewed, reviewed or all, not {status!r}")
+
+    def rows_from(t):
+        stmt = select(*[t.c[c] for c in COLUMNS])
+        if status == "unreviewed":
+            # `= false`, matching the partial indexes' NOT reviewed
+            stmt = stmt.where(t.c.reviewed == False).where(
+                t.c.ccfid.notin_(select(UploadedCCFID.ccfid))
+            )
+        elif status == "reviewed":
+            stmt = stmt.where(t.c.reviewed.is_(True))
+        if company_code:
+            stmt = stmt.where(t.c.company_code == company_code)
+        if date_from:
+            stmt = stmt.where(t.c.collection_date >= date_from)
+        if date_to:
+            stmt = stmt.where(t.c.collection_date <= date_to)
+        return stmt
+
+    stmt = rows_from(WorklistStaging.__table__)
+    if status != "unreviewed" and inspect(engine).has_table(WorklistArchive.__tablename__):
+        return union_all(stmt, rows_from(WorklistArchive.__table__)).order_by("ccfid")
+    return stmt.order_by("ccfid")
+
+
+def _batches(stmt):
+    """Yield lists of row tuples from a server-side (named) cursor."""
+    with engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=BATCH_ROWS).execute(stmt)
+        while batch := result.fetchmany(BATCH_ROWS):
+            yield batch
+
+
+def _text(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, (date, datetime)):
+        return v.isoformat()
+    return str(v)
+
+
+def stream_csv(stmt):
+    buf    = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(COLUMNS)
+    # Header first, before the query runs, so the download starts at once
+    yield buf.getvalue()
+    for batch in _batches(stmt):
+        buf.seek(0)
+        buf.truncate()
+        writer.writerows([_text(v) for v in row] for row in batch)
+        yield buf.getvalue()
+
+
+# --- XLSX ---
+
+_CONTENT_TYPES = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">
+<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>
+<Default Extension="xml" ContentType="application/xml"/>
+<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>
+<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>
+</Types>"""
+
+_ROOT_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>
+</Relationships>"""
+
+_WORKBOOK = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">
+<sheets><sheet name="Worklist" sheetId="1" r:id="rId1"/></sheets>
+</workbook>"""
+
+_WORKBOOK_RELS = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">
+<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" Target="worksheets/sheet1.xml"/>
+</Relationships>"""
+
+_SHEET_HEAD = """<?xml version="1.0" encoding="UTF-8" standalone="yes"?>
+<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>"""
+
+_SHEET_TAIL = "</sheetData></worksheet>"
+
+
+class _Chunks:
+    """Write-only sink zipfile streams into; the generator drains it."""
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data: bytes) -> int:
+        self.parts.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def _xlsx_row(values) -> str:
+    cells = []
+    for v in values:
+        if v is None:
+            cells.append("<c/>")
+        elif isinstance(v, bool):
+            cells.append(f'<c t="b"><v>{int(v)}</v></c>')
+        elif isinstance(v, (int, float)):
+            cells.append(f"<c><v>{v}</v></c>")
+        else:
+            s = escape(_XML_ILLEGAL.sub("", _text(v)))
+            cells.append(f'<c t="inlineStr"><is><t xml:space="preserve">{s}</t></is></c>')
+    return f"<row>{''.join(cells)}</row>"
+
+
+def stream_xlsx(stmt):
+    sink = _Chunks()
+    # A non-seekable sink makes zipfile write data descriptors instead of seeking back
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("[Content_Types].xml", _CONTENT_TYPES)
+        zf.writestr("_rels/.rels", _ROOT_RELS)
+        zf.writestr("xl/workbook.xml", _WORKBOOK)
+        zf.writestr("xl/_rels/workbook.xml.rels", _WORKBOOK_RELS)
+        with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write((_SHEET_HEAD + _xlsx_row(COLUMNS)).encode())
+            yield sink.drain()
+            for batch in _batches(stmt):
+                sheet.write("".join(_xlsx_row(row) for row in batch).encode())
+                yield sink.drain()
+            sheet.write(_SHEET_TAIL.encode())
+    yield sink.drain()
@@ -0,0 +1,199 @@
+# webapp/live.py
+"""
+Live worklist updates.
+
+A trigger on worklist_staging (migration 0006) sends NOTIFY worklist_changes with the CCFID
+of every inserted, updated or deleted row, whoever wrote it (reviewers, the
+cron pipeline, manual SQL). Each web process runs one listener thread:
+it coalesces a burst of notifications, re-reads the affected rows in one
+query, renders each with the row partial once, and fans the result out to
+every open /worklist/stream (Server-Sent Events) subscriber.
+
+A stream holds a web thread, so a process serves at most LIVE_MAX_STREAMS
+at once and ends each after LIVE_STREAM_SECONDS. Events carry IDs and the
+broker keeps the recent ones, so a browser that reconnects (with
+Last-Event-ID) is replayed what it missed, or told to reload if that's
+gone. The listener stays up for LINGER_SECONDS after the last subscriber
+leaves, so a reconnecting page finds it still running.
+"""
+
+import json
+import logging
+import queue
+import select
+import threading
+import time
+import uuid
+from collections import deque
+
+import psycopg2
+from flask import render_template
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+from core.config     import DATABASE_URL, LIVE_MAX_STREAMS
+from core.db.models  import UploadedCCFID, WorklistStaging
+from core.db.session import SessionLocal
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "worklist_changes"
+
+# How long to keep collecting a burst (e.g. a 500-row bulk update) before fanning out
+COALESCE_SECONDS = 0.25
+SUBSCRIBER_BACKLOG = 500
+# Events kept for replay to reconnecting streams
+REPLAY_EVENTS = 1000
+LINGER_SECONDS = 30
+
+
+class StreamsFull(Exception):
+    """This process already serves LIVE_MAX_STREAMS streams."""
+
+
+class WorklistBroker:
+    def __init__(self):
+        self._subs   = set()
+        self._lock   = threading.Lock()
+        self._thread = None
+        self.app     = None
+        # Event IDs are "<listener epoch>:<seq>"; a new listener connection
+        # may have missed notifications, so older IDs can't be resumed
+        self._epoch  = None
+        self._seq    = 0
+        self._recent = deque(maxlen=REPLAY_EVENTS)
+
+    # --- subscribers ---
+
+    def subscribe(self, app, last_event_id: str | None = None) -> queue.Queue:
+        """
+        New subscriber queue of (id, event, data). With `last_event_id`,
+        events since then are queued first (or a reload, if they're gone).
+        Raises StreamsFull at LIVE_MAX_STREAMS.
+        """
+        q = queue.Queue(maxsize=SUBSCRIBER_BACKLOG)
+        with self._lock:
+            if len(self._subs) >= LIVE_MAX_STREAMS:
+                raise StreamsFull()
+            if last_event_id:
+                self._replay(q, last_event_id)
+            self._subs.add(q)
+            if self._thread is None or not self._thread.is_alive():
+                self.app     = app
+                self._thread = threading.Thread(target=self._run, name="worklist-listener", daemon=True)
+                self._thread.start()
+        return q
+
+    def _replay(self, q: queue.Queue, last_event_id: str) -> None:
+        # Called with the lock held
+        epoch, _, seq = last_event_id.partition(":")
+        missed = None
+        if epoch == self._epoch and seq.isdigit():
+            seq = int(seq)
+            if seq == self._seq:
+                missed = []
+            elif self._recent and self._recent[0][0] <= seq + 1:
+                missed = [e for e in self._recent if e[0] > seq]
+        if missed is None:
+            q.put_nowait((None, "reload", {}))
+            return
+        for n, event, data in missed[-SUBSCRIBER_BACKLOG:]:
+            q.put_nowait((f"{self._epoch}:{n}", event, data))
+
+    def unsubscribe(self, q: queue.Queue) -> None:
+        with self._lock:
+            self._subs.discard(q)
+
+    def publish(self, event: str, data: dict) -> None:
+        with self._lock:
+            self._seq += 1
+            self._recent.append((self._seq, event, data))
+            event_id = f"{self._epoch}:{self._seq}"
+            subs     = list(self._subs)
+        for q in subs:
+            try:
+                q.put_nowait((event_id, event, data))
+            except queue.Full:
+                # Too far behind to patch row by row: tell that page to reload
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait((None, "reload", {}))
+
+    # --- listener ---
+
+    def _changes(self, ccfids: set[str]) -> list[tuple[str, dict]]:
+        """Re-read changed rows → upsert (rendered row) or remove events."""
+        with SessionLocal() as db:
+            rows = (
+                db.query(WorklistStaging)
+                  .filter(WorklistStaging.ccfid.in_(ccfids))
+                  .filter_by(reviewed=False)
+                  .filter(~WorklistStaging.ccfid.in_(
+                      db.query(UploadedCCFID.ccfid).filter(UploadedCCFID.ccfid.in_(ccfids))
+                  ))
+                  .all()
+            )
+            events = []
+            with self.app.test_request_context():
+                for it in rows:
+                    events.append(("upsert", {
+                        "ccfid": it.ccfid,
+                        "html":  render_template("_worklist_row.html", it=it),
+                    }))
+        visible = {it.ccfid for it in rows}
+        events += [("remove", {"ccfid": c}) for c in sorted(ccfids - visible)]
+        return events
+
+    def _listen(self) -> None:
+        conn = psycopg2.connect(DATABASE_URL)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        try:
+            conn.cursor().execute(f"LISTEN {CHANNEL}")
+            with self._lock:
+                self._epoch = uuid.uuid4().hex[:8]
+                self._seq   = 0
+                self._recent.clear()
+            logger.info("Listening for worklist changes")
+            idle_since = None
+            while True:
+                with self._lock:
+                    if self._subs:
+                        idle_since = None
+                    elif idle_since is None:
+                        idle_since = time.monotonic()
+                    elif time.monotonic() - idle_since > LINGER_SECONDS:
+                        # Decided under the lock, so a subscribe() from here
+                        # on starts a fresh listener instead of relying on us
+                        self._thread = None
+                        return
+                if select.select([conn], [], [], 5) == ([], [], []):
+                    continue
+                conn.poll()
+                time.sleep(COALESCE_SECONDS)
+                conn.poll()
+                ccfids = {n.payload for n in conn.notifies}
+                conn.notifies.clear()
+                if ccfids:
+                    for event, data in self._changes(ccfids):
+                        self.publish(event, data)
+        finally:
+            conn.close()
+
+    def _run(self) -> None:
+        backoff = 1
+        while True:
+            try:
+                self._listen()
+                return      # last subscriber left
+            except Exception:
+                logger.exception("Worklist listener failed; retrying in %ds", backoff)
+                self.publish("reload", {})
+                time.sleep(backoff)
+                backoff = min(backoff * 2, 60)
+
+
+broker = WorklistBroker()
+
+
+def sse(event: str, data: dict, event_id: str | None = None) -> str:
+    head = f"id: {event_id}\n" if event_id else ""
+    return f"{head}event: {event}\ndata: {json.dumps(data)}\n\n"
@@ -1,24 +1,56 @@
 import datetime
 import logging
+import queue
+import time
 
-import pandas as pd
 from flask import (
-    Blueprint, flash, redirect,
-    render_template, request, url_for, jsonify
+    Blueprint, Response, current_app, flash, redirect,
+    render_template, request, stream_with_context, url_for, jsonify
 )
 from sqlalchemy import text
 
+from core.config       import LIVE_STREAM_SECONDS
 from core.db.models    import (
     CollectionSite, Company,
     Laboratory, WorklistStaging,
-    UploadedCCFID, Panel
+    Panel
 )
 from core.db.session   import SessionLocal
-from core.services.zoho import zoho_client
+from core.db.staging   import batch_update_staging, unreviewed_items
+from webapp.export      import export_query, stream_csv, stream_xlsx
+from webapp.live        import StreamsFull, broker, sse
 
 logger = logging.getLogger(__name__)
 bp = Blueprint("web", __name__)
 
+BATCH_EDIT_MAX_ROWS = 1000
+
+
+def zoho():
+    # Imported on first use, not at boot: the Zoho client brings in pandas
+    # and the normalizer helpers, which most requests never need
+    from core.services.zoho import zoho_client
+    return zoho_client
+
+
+def learn_company_aliases(rows) -> None:
+    """
+    Remember reviewers' company → code corrections for the eScreen company
+    matcher. `rows` are staging row dicts; only eScreen rows count, keyed
+    on the Company value as exported (what the matcher looks up), not the
+    possibly edited company_name.
+    """
+    from core.normalize.aliases import save_aliases
+    pairs = [(r["raw_company"], r["company_code"]) for r in rows if r["source"] == "escreen"]
+    if not pairs:
+        return
+    try:
+        n = save_aliases(pairs)
+        if n:
+            logger.info("Learned %d company aliases from review", n)
+    except Exception:
+        logger.exception("Could not save company aliases")
+
 
 @bp.route("/")
 def index():
@@ -29,17 +61,8 @@ def index():
 def worklist():
     """Show all unreviewed staging items, excluding any already uploaded."""
     with SessionLocal() as db:
-        # 1) Already-uploaded CCFIDs
-        uploaded = [u.ccfid for u in db.query(UploadedCCFID).all()]
-
-        # 2) Fetch staging rows
-        items = (
-            db.query(WorklistStaging)
-              .filter_by(reviewed=False)
-              .filter(~WorklistStaging.ccfid.in_(uploaded))
-              .order_by(WorklistStaging.ccfid)
-              .all()
-        )
+        # 1-2) Unreviewed staging rows, minus already-uploaded CCFIDs
+        items = unreviewed_items(db).all()
 
         # 3) Collection-site names + IDs for autocomplete
         rows = (
@@ -102,29 +125,116 @@ def worklist():
         regulation_body_opts=regulation_body_opts,
         positive_for_opts=positive_for_opts,
         laboratory_opts=laboratory_opts,
+        batch_edit_max_rows=BATCH_EDIT_MAX_ROWS,
     )
 
 
-@bp.route("/worklist/bulk_update", methods=["POST"])
-def worklist_bulk_update():
-    """Mass-update one field on all selected records."""
-    data   = request.get_json() or {}
-    ccfids = data.get("ccfids", [])
-    field  = data.get("field")
-    value  = data.get("value") or None
+@bp.route("/worklist/export")
+def worklist_export():
+    """
+    Stream staging rows as CSV or XLSX: ?format=csv|xlsx
+    &status=unreviewed|reviewed|all &company_code= &from=YYYY-MM-DD &to=YYYY-MM-DD
+    """
+    fmt = request.args.get("format", "csv")
+    if fmt not in ("csv", "xlsx"):
+        return jsonify({"error": "format must be csv or xlsx"}), 400
+    try:
+        stmt = export_query(
+            status       = request.args.get("status", "unreviewed"),
+            company_code = request.args.get("company_code") or None,
+            date_from    = datetime.date.fromisoformat(request.args["from"]) if request.args.get("from") else None,
+            date_to      = datetime.date.fromisoformat(request.args["to"])   if request.args.get("to")   else None,
+        )
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    filename = f"worklist_{datetime.date.today():%Y-%m-%d}.{fmt}"
+    if fmt == "csv":
+        body, mimetype = stream_csv(stmt), "text/csv"
+    else:
+        body, mimetype = stream_xlsx(stmt), "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    return Response(
+        body,
+        mimetype=mimetype,
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"',
+            "X-Accel-Buffering":   "no",
+        },
+    )
+
 
-    if not field or not ccfids:
-        return jsonify({"error": "field and ccfids required"}), 400
+@bp.route("/worklist/stream")
+def worklist_stream():
+    """
+    Server-Sent Events: row-level worklist changes (see webapp/live.py).
+    Each stream holds a web thread, so streams are capped per process and
+    closed after LIVE_STREAM_SECONDS; the browser reconnects on its own.
+    """
+    app = current_app._get_current_object()
+    try:
+        q = broker.subscribe(app, request.headers.get("Last-Event-ID"))
+    except StreamsFull:
+        # Not an error status: EventSource gives up for good on those
+        return Response("retry: 60000\n\n", mimetype="text/event-stream",
+                        headers={"Cache-Control": "no-cache"})
+
+    def events():
+        deadline = time.monotonic() + LIVE_STREAM_SECONDS
+        try:
+            yield "retry: 5000\n\n"
+            while True:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    # Free the thread; the browser resumes from its last event ID
+                    yield "retry: 1000\n\n"
+                    return
+                try:
+                    event_id, event, data = q.get(timeout=min(15, left))
+                except queue.Empty:
+                    # Keeps proxies from closing an idle stream
+                    yield ": keepalive\n\n"
+                    continue
+                yield sse(event, data, event_id)
+        finally:
+            broker.unsubscribe(q)
+
+    return Response(
+        stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@bp.route("/worklist/batch_edit", methods=["POST"])
+def worklist_batch_edit():
+    """
+    Apply per-row edits in one statement and one transaction:
+    {"rows": [{"ccfid": "...", "<field>": value, ...}, ...]}.
+    Returns the rows as saved.
+    """
+    data    = request.get_json() or {}
+    patches = data.get("rows") or []
+    if not patches:
+        return jsonify({"error": "rows required"}), 400
+    # Stays well under Postgres' 65535 bind parameters with every field patched
+    if len(patches) > BATCH_EDIT_MAX_ROWS:
+        return jsonify({"error": f"at most {BATCH_EDIT_MAX_ROWS} rows per request"}), 400
 
     with SessionLocal() as db:
-        (
-            db.query(WorklistStaging)
-              .filter(WorklistStaging.ccfid.in_(ccfids))
-              .update({field: value}, synchronize_session=False)
-        )
+        try:
+            rows = batch_update_staging(db, patches)
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
         db.commit()
 
-    return jsonify({"status": "ok", "updated": len(ccfids)})
+    recoded = {p["ccfid"] for p in patches if "company_code" in p}
+    learn_company_aliases(r for r in rows if r["ccfid"] in recoded)
+    for r in rows:
+        for k, v in r.items():
+            if isinstance(v, (datetime.date, datetime.datetime)):
+                r[k] = v.isoformat()
+    missing = sorted({p["ccfid"] for p in patches} - {r["ccfid"] for r in rows})
+    return jsonify({"status": "ok", "updated": len(rows), "missing": missing, "rows": rows})
 
 
 @bp.route("/worklist/bulk_send", methods=["POST"])
@@ -168,7 +278,7 @@ def worklist_bulk_send():
                 "Positive_For":    item.positive_for or None,
             })
 
-    successes = zoho_client.push_records(records)
+    successes = zoho().push_records(records)
     sent, total = len(successes), len(records)
 
     # mark reviewed
@@ -180,11 +290,7 @@ def worklist_bulk_send():
                 rec.reviewed_at = datetime.datetime.utcnow()
         db.commit()
 
-    if sent:
-        flash(f"Successfully sent {sent}/{total} records to CRM.", "success")
-    if sent < total:
-        flash(f"{total - sent} records failed to send.", "error")
-
+    # The page reports the result itself (it no longer reloads), so no flash()
     return jsonify({"status": "ok", "sent": sent, "total": total})
 
 
@@ -199,6 +305,8 @@ def worklist_detail(ccfid):
                 flash(f"Record {ccfid} not found.", "error")
                 return redirect(url_for("web.worklist"))
 
+            old_code = item.company_code
+
             # 1) Positive_For is multi-select → semicolon-separated
             pf_list = request.form.getlist("positive_for")    # e.g. ["Marijuana","Fentanyl"]
             item.positive_for = ";".join(pf_list) if pf_list else None
@@ -224,20 +332,16 @@ def worklist_detail(ccfid):
                         setattr(item, field, raw or None)
             db.commit()
 
+            # 1.5) a corrected company code teaches the eScreen company matcher
+            if item.company_code and item.company_code != old_code:
+                learn_company_aliases([{
+                    "source": item.source, "raw_company": item.raw_company, "company_code": item.company_code,
+                }])
+
             # 2) sync new collection site if needed
             if item.collection_site:
-                existing = {
-                    sid for (sid,) in db.query(CollectionSite.Collection_Site_ID).all()
-                }
-                site_df = pd.DataFrame([{
-                    "Collection_Site":    item.collection_site,
-                    "Collection_Site_ID": item.collection_site_id
-                }])
-                full_map = zoho_client.sync_collection_sites(site_df)
-                logger.info(
-                    "Created %d new collection sites",
-                    len(set(full_map) - existing)
-                )
+                created = zoho().sync_collection_site(item.collection_site, item.collection_site_id)
+                logger.info("Created %d new collection sites", len(created))
 
             # 3) build lookup maps
             company_map = {
@@ -282,7 +386,7 @@ def worklist_detail(ccfid):
                 "Name":              str(item.ccfid),
             }
 
-            accepted = zoho_client.push_records([record])
+            accepted = zoho().push_records([record])
             if ccfid in accepted:
                 item.reviewed    = True
                 item.reviewed_at = datetime.datetime.utcnow()
@@ -10,25 +10,25 @@ document.addEventListener("DOMContentLoaded", () => {
   const bulkApply  = document.getElementById("bulk-apply");
   const bulkSend   = document.getElementById("bulk-send");
 
+  const tbody      = table ? table.tBodies[0] : null;
+  const emptyMsg   = document.getElementById("worklist-empty");
+  const bulkStatus = document.getElementById("bulk-status");
+
   // 1) Highlight visible missing (cols 1–6)
-  if (table) {
-    Array.from(table.tBodies[0].rows).forEach(row => {
-      for (let i = 1; i <= 6; i++) {
-        const td = row.cells[i];
-        if (td && !td.innerText.trim()) td.classList.add("missing");
-      }
-    });
+  function highlightMissing(row) {
+    for (let i = 1; i <= 6; i++) {
+      const td = row.cells[i];
+      if (td && !td.innerText.trim()) td.classList.add("missing");
+    }
   }
 
-  // 2) Search/filter
-  if (input && table) {
-    const rows = Array.from(table.tBodies[0].rows);
-    input.addEventListener("input", () => {
-      const q = input.value.toLowerCase();
-      rows.forEach(r => {
-        r.style.display = r.innerText.toLowerCase().includes(q) ? "" : "none";
-      });
-    });
+  // 2) Search/filter (live rows come and go, so re-read them each time)
+  function applyFilter(row) {
+    const q = input ? input.value.toLowerCase() : "";
+    row.style.display = row.innerText.toLowerCase().includes(q) ? "" : "none";
+  }
+  if (input && tbody) {
+    input.addEventListener("input", () => Array.from(tbody.rows).forEach(applyFilter));
   }
 
   // 3) Select-all
@@ -86,33 +86,28 @@ document.addEventListener("DOMContentLoaded", () => {
       if (!ccfids.length) return alert("No rows selected");
       if (!field)       return alert("Select a field");
 
-      if (field === "collection_site") {
-        let r = await fetch("/worklist/bulk_update", {
-          method:"POST", headers:{"Content-Type":"application/json"},
-          body:JSON.stringify({ ccfids, field, value })
-        });
-        if (!r.ok) return alert("Failed to update site name");
-        r = await fetch("/worklist/bulk_update", {
+      // A site change patches name and ID together
+      const rows = ccfids.map(ccfid => field === "collection_site"
+        ? { ccfid, collection_site: value, collection_site_id: bulkSiteId.value }
+        : { ccfid, [field]: value });
+
+      // batch_edit takes at most batchEditMaxRows rows per request
+      const size = window.batchEditMaxRows || 1000;
+      let updated = 0;
+      for (let i = 0; i < rows.length; i += size) {
+        const r = await fetch("/worklist/batch_edit", {
           method:"POST", headers:{"Content-Type":"application/json"},
-          body:JSON.stringify({
-            ccfids,
-            field:"collection_site_id",
-            value:bulkSiteId.value
-          })
+          body:JSON.stringify({ rows: rows.slice(i, i + size) })
         });
-        if (!r.ok) return alert("Failed to update site ID");
-        return location.reload();
+        if (!r.ok) {
+          const e = await r.json().catch(()=>null);
+          alert((e?.error||"Bulk update failed") + (updated ? ` (${updated} records were updated)` : ""));
+          if (updated) refreshAfterBulk(`Updated ${updated} of ${rows.length} records.`);
+          return;
+        }
+        updated += (await r.json()).updated;
       }
-
-      const r = await fetch("/worklist/bulk_update", {
-        method:"POST", headers:{"Content-Type":"application/json"},
-        body:JSON.stringify({ ccfids, field, value })
-      });
-      if (!r.ok) {
-        const e = await r.json().catch(()=>null);
-        return alert(e?.error||"Bulk update failed");
-      }
-      location.reload();
+      refreshAfterBulk(`Updated ${updated} records.`);
     });
   }
 
@@ -126,50 +121,109 @@ document.addEventListener("DOMContentLoaded", () => {
         body:JSON.stringify({ ccfids })
       });
       if (!r.ok) return alert("Bulk send failed");
-      location.reload();
+      const { sent, total } = await r.json();
+      refreshAfterBulk(
+        `Sent ${sent}/${total} records to CRM.` + (sent < total ? ` ${total - sent} failed.` : "")
+      );
     });
   }
 
   // ——— Needs Attention (all fields + rules) ———
-  if (table) {
-    const rules = {
-      location:        row => row.dataset.companyCode === "A1310",
-      laboratory:      row => !/POCT|Alcohol/i.test(row.dataset.testType),
-      batValue:        row => /Alcohol Breath Test/i.test(row.dataset.testType),
-      regulationBody:  row => row.dataset.regulation === "DOT",
-      positiveFor:     row => /^Positive/.test(row.dataset.testResult)
-    };
-    const labels = {
-      primaryId:        "Primary ID",
-      companyName:      "Company",
-      companyCode:      "Company Code",
-      firstName:        "First",
-      lastName:         "Last",
-      collectionDate:   "Collection Date",
-      mroReceived:      "Result Date",
-      collectionSite:   "Site",
-      laboratory:       "Laboratory",
-      panel:            "Panel",
-      location:         "Location",
-      testReason:       "Reason",
-      testType:         "Test Type",
-      testResult:       "Result",
-      regulation:       "Regulation",
-      regulationBody:   "Regulation Body",
-      batValue:         "BAT Value",
-      positiveFor:      "Positive For"
-    };
-
-    Array.from(table.tBodies[0].rows).forEach(row => {
-      const missing = [];
-      Object.entries(labels).forEach(([key,label]) => {
-        const val = row.dataset[key] || "";
-        // if there’s a rule and it returns false, skip this field
-        if (rules[key] && !rules[key](row)) return;
-        if (!val || val === "None") missing.push(label);
-      });
-      const cell = row.querySelector(".needs-attention");
-      if (cell) cell.innerText = missing.join(", ");
+  const rules = {
+    location:        row => row.dataset.companyCode === "A1310",
+    laboratory:      row => !/POCT|Alcohol/i.test(row.dataset.testType),
+    batValue:        row => /Alcohol Breath Test/i.test(row.dataset.testType),
+    regulationBody:  row => row.dataset.regulation === "DOT",
+    positiveFor:     row => /^Positive/.test(row.dataset.testResult)
+  };
+  const labels = {
+    primaryId:        "Primary ID",
+    companyName:      "Company",
+    companyCode:      "Company Code",
+    firstName:        "First",
+    lastName:         "Last",
+    collectionDate:   "Collection Date",
+    mroReceived:      "Result Date",
+    collectionSite:   "Site",
+    laboratory:       "Laboratory",
+    panel:            "Panel",
+    location:         "Location",
+    testReason:       "Reason",
+    testType:         "Test Type",
+    testResult:       "Result",
+    regulation:       "Regulation",
+    regulationBody:   "Regulation Body",
+    batValue:         "BAT Value",
+    positiveFor:      "Positive For"
+  };
+
+  function markNeedsAttention(row) {
+    const missing = [];
+    Object.entries(labels).forEach(([key,label]) => {
+      const val = row.dataset[key] || "";
+      // if there’s a rule and it returns false, skip this field
+      if (rules[key] && !rules[key](row)) return;
+      if (!val || val === "None") missing.push(label);
+    });
+    const cell = row.querySelector(".needs-attention");
+    if (cell) cell.innerText = missing.join(", ");
+  }
+
+  function decorateRow(row) {
+    highlightMissing(row);
+    markNeedsAttention(row);
+    applyFilter(row);
+  }
+
+  if (tbody) Array.from(tbody.rows).forEach(decorateRow);
+
+  // ——— Live updates: patch only the rows that changed ———
+  function findRow(ccfid) {
+    return Array.from(tbody.rows).find(r => r.dataset.ccfid === ccfid);
+  }
+  function updateEmpty() {
+    if (emptyMsg) emptyMsg.hidden = tbody.rows.length > 0;
+  }
+
+  let stream = null;
+  if (tbody && window.EventSource) {
+    stream = new EventSource("/worklist/stream");
+
+    stream.addEventListener("upsert", e => {
+      const { ccfid, html } = JSON.parse(e.data);
+      const tpl = document.createElement("template");
+      tpl.innerHTML = html.trim();
+      const row = tpl.content.firstElementChild;
+
+      const old = findRow(ccfid);
+      if (old) {
+        // keep the reviewer's selection
+        row.querySelector(".row-checkbox").checked = old.querySelector(".row-checkbox").checked;
+        old.replaceWith(row);
+      } else {
+        const next = Array.from(tbody.rows).find(r => r.dataset.ccfid > ccfid);
+        tbody.insertBefore(row, next || null);
+      }
+      decorateRow(row);
+      updateEmpty();
+    });
+
+    stream.addEventListener("remove", e => {
+      const row = findRow(JSON.parse(e.data).ccfid);
+      if (row) row.remove();
+      updateEmpty();
     });
+
+    // The server fell too far behind (or lost its listener): start fresh
+    stream.addEventListener("reload", () => location.reload());
+  }
+
+  // Without a live stream, reload to see the result of a bulk action
+  function refreshAfterBulk(message) {
+    if (stream && stream.readyState === EventSource.OPEN) {
+      if (bulkStatus) bulkStatus.innerText = message;
+    } else {
+      location.reload();
+    }
   }
 });